@@ -0,0 +1,84 @@
+import api from "./axios";
+import { supabase } from "../supabaseClient";
+
+// ==========================================
+// Live unread counts (Server-Sent Events)
+// ==========================================
+// EventSource can't send our Bearer token, so we read the SSE stream with
+// fetch() and parse the frames ourselves. The server closes the stream on
+// purpose (immediately when it runs sync workers, see
+// NOTIFICATION_STREAM_SECONDS) and its `retry:` frame says when to come back.
+// Polls send the last ETag back; 304 means the counts didn't change.
+
+const RETRY_DELAY_MS = 3000;
+const MAX_RETRY_DELAY_MS = 60000;
+
+const parseFrame = (frame) => {
+  let event = "message";
+  let data = "";
+  let retry = null;
+  for (const line of frame.split("\n")) {
+    if (line.startsWith("event:")) event = line.slice(6).trim();
+    else if (line.startsWith("data:")) data += line.slice(5).trim();
+    else if (line.startsWith("retry:")) retry = parseInt(line.slice(6).trim(), 10);
+  }
+  if (Number.isFinite(retry)) return { event: "retry", data: retry };
+  return data ? { event, data: JSON.parse(data) } : null;
+};
+
+export const streamUnreadCounts = async (onCounts, signal) => {
+  let retryDelay = RETRY_DELAY_MS;
+  let reconnectDelay = RETRY_DELAY_MS; // server-provided (`retry:`)
+  let etag = null;
+
+  while (!signal.aborted) {
+    try {
+      const { data } = await supabase.auth.getSession();
+      const token = data?.session?.access_token;
+      if (!token) return;
+
+      const headers = { Authorization: `Bearer ${token}` };
+      if (etag) headers["If-None-Match"] = etag;
+      const response = await fetch(`${api.defaults.baseURL || ""}/api/notifications/stream`, {
+        headers,
+        cache: "no-store",
+        signal,
+      });
+      if (response.status === 304) {
+        retryDelay = RETRY_DELAY_MS;
+        await new Promise((resolve) => setTimeout(resolve, reconnectDelay));
+        continue;
+      }
+      if (!response.ok || !response.body) throw new Error(`Stream failed: ${response.status}`);
+
+      retryDelay = RETRY_DELAY_MS;
+      etag = response.headers.get("ETag");
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+          const frame = parseFrame(buffer.slice(0, boundary));
+          buffer = buffer.slice(boundary + 2);
+          if (frame?.event === "unread") onCounts(frame.data);
+          else if (frame?.event === "retry") reconnectDelay = frame.data;
+        }
+      }
+      // Clean close: come back when the server asked us to
+      await new Promise((resolve) => setTimeout(resolve, reconnectDelay));
+      continue;
+    } catch (error) {
+      if (signal.aborted) return;
+      console.error("Unread stream error:", error);
+      retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY_MS);
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, retryDelay));
+  }
+};
@@ -9,6 +9,11 @@ export const createTeam = (data) => api.post("/api/teams/create", data);
 export const updateTeam = (teamId, data) => api.put(`/api/teams/${teamId}`, data); 
 
 export const getPublicTeams = () => api.get("/api/teams/");
+// Paged browser: { teams, next_cursor, has_more }
+export const getPublicTeamsPage = ({ cursor, isHiring, skill } = {}) =>
+  api.get("/api/teams/page", {
+    params: { cursor, is_hiring: isHiring ? 1 : undefined, skill: skill || undefined },
+  });
 export const getMyTeams = () => api.get("/api/teams/my");
 export const getTeamDetails = (id) => api.get(`/api/teams/${id}`);
 export const joinRequest = (data) => api.post("/api/teams/join-request", data);
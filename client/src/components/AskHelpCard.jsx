@@ -37,6 +37,7 @@ const customSelectStyles = {
 
 const AskHelpCard = ({ user, isOwner, onRefresh }) => {
   const [isOpen, setIsOpen] = useState(false);
+  const [duplicates, setDuplicates] = useState([]); // 🧬 similar open requests returned on create
   const queryClient = useQueryClient(); // 🚀 React Query Client
   
   const activeRequest = user?.active_help_request;
@@ -52,7 +53,8 @@ const AskHelpCard = ({ user, isOwner, onRefresh }) => {
   // 🚀 REACT QUERY MUTATION
   const createHelpMutation = useMutation({
     mutationFn: (formData) => helpService.createRequest(formData),
-    onSuccess: () => {
+    onSuccess: (data) => {
+      setDuplicates(data?.possible_duplicates || []);
       setIsOpen(false);
       setForm({ title: "", description: "", github_link: "", tags: [], image: null });
       // Instantly refresh the profile query to show the new active request
@@ -113,6 +115,21 @@ const AskHelpCard = ({ user, isOwner, onRefresh }) => {
             </span>
         </div>
 
+        {isOwner && duplicates.length > 0 && (
+          <div className="mb-4 rounded-xl border border-amber-200 bg-amber-50 p-3">
+            <p className="text-[11px] font-bold text-amber-800 mb-1.5">Similar open requests — maybe already being solved:</p>
+            <ul className="space-y-1">
+              {duplicates.map(dup => (
+                <li key={dup.id}>
+                  <Link to={dup.url} className="text-xs font-semibold text-indigo-600 hover:underline line-clamp-1">
+                    {dup.title}
+                  </Link>
+                </li>
+              ))}
+            </ul>
+          </div>
+        )}
+
         {activeRequest.image_url && (
            <div className="mb-4 rounded-xl overflow-hidden h-36 bg-slate-100 border border-slate-200 relative group-hover:border-indigo-300 transition-colors shadow-inner">
              <img src={activeRequest.image_url} alt="Problem" className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-700" />
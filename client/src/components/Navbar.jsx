@@ -19,9 +19,9 @@ import {
 } from "lucide-react";
 import { useAuth } from "../contexts/AuthContext";
 import SearchBar from "./SearchBar";
-import api from "../api/axios";
+import { streamUnreadCounts } from "../api/notificationStream";
 
-const ENABLE_NOTIFICATIONS = false;
+const ENABLE_NOTIFICATIONS = true;
 
 // 🟢 SMART INITIALS HELPERS
 const hasValidProfilePic = (url) => {
@@ -50,22 +50,17 @@ const Navbar = () => {
     return false;
   };
 
-  const fetchUnreadCount = async () => {
-    try {
-      const response = await api.get("/api/notifications/unread_count");
-      setUnreadCount(response.data.unread_count);
-    } catch (error) {
-      console.error("Error fetching notification count:", error);
-    }
-  };
-
+  // 🔴 Live unread counts pushed by the server (no more 30s polling)
   useEffect(() => {
     if (!ENABLE_NOTIFICATIONS) return;
     if (!currentUser) return;
 
-    fetchUnreadCount();
-    const interval = setInterval(fetchUnreadCount, 30000);
-    return () => clearInterval(interval);
+    const controller = new AbortController();
+    streamUnreadCounts(
+      (counts) => setUnreadCount(counts.notifications),
+      controller.signal
+    );
+    return () => controller.abort();
   }, [currentUser]);
 
   useEffect(() => {
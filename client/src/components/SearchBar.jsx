@@ -1,17 +1,31 @@
 import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { Search } from "lucide-react";
+import { useDebounce } from "../hooks/useDebounce";
+import { useSuggestQuery } from "../hooks/useSearch";
 
 const SearchBar = () => {
   const [searchTerm, setSearchTerm] = useState("");
+  const [showSuggestions, setShowSuggestions] = useState(false);
   const navigate = useNavigate();
 
+  // 🟢 Suggestions come from the in-memory index: a short debounce is enough
+  const debouncedTerm = useDebounce(searchTerm.trim(), 80);
+  const { data: suggestions = [] } = useSuggestQuery(debouncedTerm);
+
+  const openProfile = (userId) => {
+    navigate(`/profile/${userId}`);
+    setSearchTerm("");
+    setShowSuggestions(false);
+  };
+
   const handleSearchSubmit = (e) => {
     e.preventDefault();
     if (searchTerm.trim()) {
       // Navigate to the search page with the query
       navigate(`/search?q=${encodeURIComponent(searchTerm.trim())}`);
       setSearchTerm(""); // Clear the search bar after submit
+      setShowSuggestions(false);
     }
   };
 
@@ -21,7 +35,13 @@ const SearchBar = () => {
         <input
           type="text"
           value={searchTerm}
-          onChange={(e) => setSearchTerm(e.target.value)}
+          onChange={(e) => {
+            setSearchTerm(e.target.value);
+            setShowSuggestions(true);
+          }}
+          onFocus={() => setShowSuggestions(true)}
+          // Delay so a click on a suggestion lands before the list closes
+          onBlur={() => setTimeout(() => setShowSuggestions(false), 150)}
           placeholder="Search Acadlinker..."
           className="w-full h-10 px-4 pr-10 bg-gray-800 text-white rounded-lg focus:outline-none focus:ring-2 focus:ring-indigo-500"
         />
@@ -32,6 +52,26 @@ const SearchBar = () => {
         >
           <Search className="w-5 h-5" />
         </button>
+
+        {showSuggestions && searchTerm.trim() && suggestions.length > 0 && (
+          <ul className="absolute z-50 mt-1 w-full bg-white rounded-lg shadow-lg border border-slate-100 overflow-hidden">
+            {suggestions.map((user) => (
+              <li key={user.id}>
+                <button
+                  type="button"
+                  onMouseDown={(e) => e.preventDefault()}
+                  onClick={() => openProfile(user.id)}
+                  className="w-full text-left px-4 py-2 text-sm text-slate-800 hover:bg-indigo-50"
+                >
+                  <span className="font-semibold">{user.full_name}</span>
+                  {user.username && (
+                    <span className="ml-2 text-slate-400">@{user.username}</span>
+                  )}
+                </button>
+              </li>
+            ))}
+          </ul>
+        )}
       </div>
     </form>
   );
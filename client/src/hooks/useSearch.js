@@ -13,4 +13,19 @@ export const useSearchQuery = (query) => {
     staleTime: 5 * 60 * 1000, 
     refetchOnWindowFocus: false,
   });
-};
\ No newline at end of file
+};
+// Typeahead: served from the server's in-memory prefix index, so a short
+// debounce is enough
+export const useSuggestQuery = (prefix) => {
+  return useQuery({
+    queryKey: ['search-suggest', prefix],
+    queryFn: async () => {
+      const res = await api.get(`/api/search/suggest?q=${encodeURIComponent(prefix)}`);
+      return res.data;
+    },
+    enabled: !!prefix && prefix.trim().length > 0,
+    staleTime: 60 * 1000,
+    refetchOnWindowFocus: false,
+    placeholderData: (previous) => previous,
+  });
+};
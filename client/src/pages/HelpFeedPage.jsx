@@ -31,12 +31,15 @@ const HelpFeedPage = () => {
   const [requests, setRequests] = useState([]);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState("");
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchFeed = async () => {
       try {
-        const data = await helpService.getFeed();
-        setRequests(data);
+        const data = await helpService.getFeedPage();
+        setRequests(data.requests);
+        setNextCursor(data.next_cursor);
       } catch (err) {
         console.error("Failed to load help feed", err);
       } finally {
@@ -46,6 +49,21 @@ const HelpFeedPage = () => {
     fetchFeed();
   }, []);
 
+  // 🟢 Keyset paging: append the next page after the last one shown
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const data = await helpService.getFeedPage({ cursor: nextCursor });
+      setRequests(prev => [...prev, ...data.requests]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      console.error("Failed to load more requests", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // 🟢 SMART SEARCH: Safely checks title and tags
   const filteredRequests = requests.filter(req => {
     const searchLower = filter.toLowerCase();
@@ -224,6 +242,19 @@ const HelpFeedPage = () => {
           })}
         </div>
 
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-6 py-2.5 rounded-xl bg-white border border-slate-200 text-sm font-bold text-indigo-600 hover:bg-indigo-50 transition-colors disabled:opacity-60 flex items-center gap-2"
+            >
+              {loadingMore && <Loader2 size={16} className="animate-spin" />}
+              Load more
+            </button>
+          </div>
+        )}
+
       </div>
     </div>
   );
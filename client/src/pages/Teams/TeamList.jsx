@@ -7,7 +7,7 @@ import {
   X,
   Filter
 } from "lucide-react";
-import { getPublicTeams } from "../../api/teamApi";
+import { getPublicTeamsPage } from "../../api/teamApi";
 import TeamCard from "../../components/Teams/TeamCard";
 
 // 🟢 SKELETON LOADER
@@ -36,13 +36,16 @@ const TeamList = () => {
   const [loading, setLoading] = useState(true);
   const [searchQuery, setSearchQuery] = useState("");
   const [showHiringOnly, setShowHiringOnly] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
-  // Fetch data
+  // Fetch first page (hiring filter applied on the server)
   useEffect(() => {
     setLoading(true);
-    getPublicTeams()
+    getPublicTeamsPage({ isHiring: showHiringOnly })
       .then(res => {
-        setTeams(res.data || []);
+        setTeams(res.data?.teams || []);
+        setNextCursor(res.data?.next_cursor ?? null);
       })
       .catch(err => {
         console.error("Failed to load teams", err);
@@ -50,7 +53,24 @@ const TeamList = () => {
       .finally(() => {
         setLoading(false);
       });
-  }, []);
+  }, [showHiringOnly]);
+
+  // 🟢 Keyset paging: append the next page
+  const loadMore = () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    getPublicTeamsPage({ cursor: nextCursor, isHiring: showHiringOnly })
+      .then(res => {
+        setTeams(prev => [...prev, ...(res.data?.teams || [])]);
+        setNextCursor(res.data?.next_cursor ?? null);
+      })
+      .catch(err => {
+        console.error("Failed to load more teams", err);
+      })
+      .finally(() => {
+        setLoadingMore(false);
+      });
+  };
 
   // Memoized filter
   const filteredTeams = useMemo(() => {
@@ -200,6 +220,18 @@ const TeamList = () => {
             ))}
           </div>
         )}
+
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-5 py-2 bg-white border border-slate-200 text-slate-700 rounded-lg text-sm font-bold hover:bg-slate-100 transition disabled:opacity-60"
+            >
+              {loadingMore ? "Loading..." : "Load more teams"}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
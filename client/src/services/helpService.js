@@ -2,8 +2,19 @@ import api from "../api/axios";
 
 export const helpService = {
   // 1. Get the Help Feed (Rescue Radar)
-  getFeed: async () => {
-    const response = await api.get("/api/help/feed");
+  // forMe: only requests whose tags match my skills
+  getFeed: async ({ forMe = false } = {}) => {
+    const response = await api.get("/api/help/feed", {
+      params: forMe ? { for_me: 1 } : undefined,
+    });
+    return response.data;
+  },
+
+  // 1b. One page of the feed: { requests, next_cursor, has_more }
+  getFeedPage: async ({ cursor, tag, status } = {}) => {
+    const response = await api.get("/api/help/feed/page", {
+      params: { cursor, tag, status },
+    });
     return response.data;
   },
 
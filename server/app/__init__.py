@@ -24,7 +24,8 @@ def create_app():
         app,
         origins=[frontend_url, "http://localhost:5173"],
         supports_credentials=True,
-        allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Accept"],
+        allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Accept", "If-None-Match"],
+        expose_headers=["ETag"],  # unread-count polls (304 when unchanged)
         methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
     )
 
@@ -49,6 +50,30 @@ def create_app():
     from app.admin import init_admin
     init_admin(app, db)
 
+    # Bounded background job runner (ML updates, index warm-ups)
+    from app.services import job_runner
+    job_runner.init_app(app)
+
+    # Shared thread pool for fan-out I/O inside a request (search, uploads)
+    from app.utils import io_pool
+    io_pool.init_app(app)
+
+    # Short-TTL search result cache
+    from app.services import search_cache
+    search_cache.init_app(app)
+
+    # Versioned profile cache
+    from app.services import profile_cache
+    profile_cache.init_app(app)
+
+    # Near-duplicate help request index (loaded in the background per worker)
+    from app.services import duplicate_index
+    duplicate_index.init_app(app)
+
+    # CLI batch jobs (flask recommend ...)
+    from app.cli import register_cli
+    register_cli(app)
+
     # --- 🛠️ FIX 3: GLOBAL CORS HEADER OVERRIDE ---
     # This must be INSIDE create_app
     @app.after_request
@@ -67,7 +92,7 @@ def register_blueprints(app):
     from app.routes.search_routes import search_bp
     from app.routes.suggestion_routes import suggestions_bp
     from app.routes.main_routes import main_bp
-    # from app.routes.notification_routes import notifications_bp 
+    from app.routes.notification_routes import notifications_bp
     from app.routes.help_routes import help_bp
     from app.routes.team_routes import team_bp
     from app.routes.task_routes import task_bp
@@ -83,4 +108,4 @@ def register_blueprints(app):
     app.register_blueprint(search_bp)
     app.register_blueprint(suggestions_bp)
     app.register_blueprint(main_bp)
-    # app.register_blueprint(notifications_bp)
\ No newline at end of file
+    app.register_blueprint(notifications_bp)
\ No newline at end of file
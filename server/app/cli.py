@@ -0,0 +1,120 @@
+import click
+from flask.cli import AppGroup
+
+# -------------------------------------------------
+# Offline jobs (run from cron / Render jobs, never inside a request)
+#   flask recommend refit
+#   flask recommend mutual
+#   flask recommend rebuild
+#   flask recommend ann-bench
+#   flask recommend write-bench
+#   flask recommend evaluate
+#   flask counters reconcile
+#   flask skills relink-teams
+# -------------------------------------------------
+recommend_cli = AppGroup("recommend", help="Batch jobs for friend recommendations.")
+counters_cli = AppGroup("counters", help="Maintenance of denormalized counters.")
+skills_cli = AppGroup("skills", help="Maintenance of the skill vocabulary links.")
+
+
+@recommend_cli.command("refit")
+def recommend_refit():
+    """Refit the TF-IDF vocabulary and rewrite the user matrix on disk."""
+    from app.services.recommendation_model import fit_model
+
+    fit_model(log=click.echo)
+
+
+@recommend_cli.command("mutual")
+@click.option("--memory-mb", default=256, show_default=True,
+              help="Upper bound for one block of the sparse A·A product.")
+def recommend_mutual(memory_mb):
+    """Blend mutual-friend counts into UserRecommendation for every user."""
+    from app.services.social_graph_service import rebuild_social_recommendations
+
+    stats = rebuild_social_recommendations(memory_mb=memory_mb, log=click.echo)
+    click.echo(
+        f"✅ Mutual friends: {stats['users']} users, {stats['rows']} rows "
+        f"in {stats['seconds']:.1f}s"
+    )
+
+
+@recommend_cli.command("rebuild")
+@click.option("--processes", type=int, default=None,
+              help="Worker processes (default: CPU count - 1).")
+@click.option("--memory-mb", default=256, show_default=True,
+              help="Per-process budget for one dense block of similarities.")
+def recommend_rebuild(processes, memory_mb):
+    """Refit and recompute skill + mutual recommendations for every user."""
+    from app.services.recommendation_rebuild import rebuild_all
+
+    stats = rebuild_all(processes=processes, memory_mb=memory_mb, log=click.echo)
+    rate = stats["users"] / stats["seconds"] if stats["seconds"] else 0.0
+    click.echo(
+        f"✅ Rebuild: {stats['users']} users, {stats['rows']} rows "
+        f"in {stats['seconds']:.1f}s ({rate:.0f} users/s)"
+    )
+
+
+@recommend_cli.command("ann-bench")
+@click.option("--sample", default=200, show_default=True, help="Number of query users.")
+@click.option("-k", "--k", "k", default=10, show_default=True)
+@click.option("--tables", type=int, default=None, help="Benchmark a temporary index with this many tables.")
+@click.option("--bits", type=int, default=None, help="Bits per table for the temporary index.")
+def recommend_ann_bench(sample, k, tables, bits):
+    """Recall@k and latency of the LSH index versus an exact scan."""
+    from app.services.ann_index import benchmark
+    from app.services.recommendation_model import get_model
+
+    model = get_model()
+    if model is None:
+        click.echo("⚠️ No recommender build yet, run 'flask recommend refit' first")
+        return
+    benchmark(model, sample=sample, k=k, tables=tables, bits=bits, log=click.echo)
+
+
+@recommend_cli.command("write-bench")
+@click.option("--users", default=1000, show_default=True)
+@click.option("--per-user", default=10, show_default=True)
+def recommend_write_bench(users, per_user):
+    """Rows/sec of ORM inserts versus the bulk upsert (rolled back)."""
+    from app.services.recommendation_writer import benchmark
+
+    benchmark(users=users, per_user=per_user, log=click.echo)
+
+
+@recommend_cli.command("evaluate")
+@click.option("--hide", default=0.2, show_default=True,
+              help="Fraction of friendships hidden as ground truth.")
+@click.option("-k", "--k", "k", default=10, show_default=True)
+@click.option("--sample", default=500, show_default=True, help="Users to evaluate.")
+@click.option("--seed", default=42, show_default=True)
+def recommend_evaluate(hide, k, sample, seed):
+    """Offline precision/recall@k, build time, latency and memory of each scorer."""
+    from app.services.recommendation_eval import evaluate
+
+    evaluate(hide_fraction=hide, k=k, sample=sample, seed=seed, log=click.echo)
+
+
+@counters_cli.command("reconcile")
+@click.option("--dry-run", is_flag=True, help="Only report users whose counters drifted.")
+def counters_reconcile(dry_run):
+    """Recompute User.friend_count / post_count from friendships and posts."""
+    from app.services.counter_service import reconcile
+
+    reconcile(dry_run=dry_run, log=click.echo)
+
+
+@skills_cli.command("relink-teams")
+@click.option("--dry-run", is_flag=True, help="Only report teams whose skill links drifted.")
+def skills_relink_teams(dry_run):
+    """Re-run the team_skill backfill (e.g. after adding skill aliases)."""
+    from app.services.skill_service import relink_all_teams
+
+    relink_all_teams(dry_run=dry_run, log=click.echo)
+
+
+def register_cli(app):
+    app.cli.add_command(recommend_cli)
+    app.cli.add_command(counters_cli)
+    app.cli.add_command(skills_cli)
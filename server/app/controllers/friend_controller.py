@@ -3,6 +3,10 @@ from app.extensions import db
 from app.models.user import User
 from app.models.friend_request import FriendRequest
 from app.services.notification_service import notify
+from app.services import friend_graph, skill_service
+from app.services.friend_request_service import pending_requests, pending_count
+from app.services.user_search import search_users
+from app.services.search_cache import cached_search, exclude_viewer
 
 # ---------------------------------------------------
 # SEND REQUEST (With Reverse Check)
@@ -18,7 +22,7 @@ def send_friend_request(user_id):
         return jsonify({"message": "You can't send a request to yourself."}), 400
 
     # 1. Check if already friends
-    if current_user.friends.filter_by(id=target_user.id).count() > 0:
+    if friend_graph.are_friends_now(current_user.id, target_user.id):
         return jsonify({"message": "You are already friends."}), 400
 
     # 2. Check if YOU already sent a request (Pending or Rejected)
@@ -70,28 +74,31 @@ def send_friend_request(user_id):
 # GET REQUESTS
 # ---------------------------------------------------
 def get_friend_requests():
-    # Use g.user_id directly
-    pending_requests = FriendRequest.query.filter_by(
-        receiver_id=g.user_id,
-        status='pending'
-    ).all()
+    # One joined query: sender fields come with each request (no N+1)
+    return jsonify(pending_requests(g.user_id)), 200
 
-    data = []
-    for req in pending_requests:
-        # Manually fetch sender to avoid 'AttributeError'
-        sender = User.query.get(req.sender_id)
-        
-        # Only add to list if sender still exists in database
-        if sender:
-            data.append({
-                "id": req.id,
-                "sender_id": sender.id,
-                "sender_name": sender.full_name,
-                "sender_profile": getattr(sender, "profile_pic", None),
-                "status": req.status
-            })
 
-    return jsonify(data), 200
+# ---------------------------------------------------
+# INBOX (Paged, newest first)
+# ---------------------------------------------------
+INBOX_PAGE_SIZE = 20
+INBOX_MAX_PAGE_SIZE = 50
+
+def get_friend_request_inbox():
+    limit = max(1, min(request.args.get('limit', INBOX_PAGE_SIZE, type=int), INBOX_MAX_PAGE_SIZE))
+    cursor = request.args.get('cursor', type=int)  # id of the last request already shown
+
+    # Fetch one extra row to know whether another page exists
+    items = pending_requests(g.user_id, limit=limit + 1, before_id=cursor)
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    return jsonify({
+        "requests": items,
+        "next_cursor": items[-1]["id"] if has_more else None,
+        "has_more": has_more,
+        "total_pending": pending_count(g.user_id)
+    }), 200
 
 
 # ---------------------------------------------------
@@ -117,14 +124,10 @@ def accept_friend_request(req_id):
         # Update Status
         req.status = 'accepted'
         
-        # SAFELY Append Friends (Prevent Infinite Loop)
-        if current_user.friends.filter_by(id=sender_user.id).count() == 0:
-            current_user.friends.append(sender_user)
-        
-        if sender_user.friends.filter_by(id=current_user.id).count() == 0:
-            sender_user.friends.append(current_user)
-        
+        # One row per pair; safe to call even if they are already friends
+        graph_version = friend_graph.add_friendship(current_user.id, sender_user.id)
         db.session.commit()
+        friend_graph.link(current_user.id, sender_user.id, graph_version)
 
         try:
             notify(
@@ -174,12 +177,12 @@ def remove_friend(user_id):
     if not friend:
         return jsonify({"message": "Friend not found."}), 404
 
-    if current_user.friends.filter_by(id=friend.id).count() == 0:
+    if not friend_graph.are_friends_now(current_user.id, friend.id):
         return jsonify({"message": "Not in your friends list."}), 400
 
-    current_user.friends.remove(friend)
-    friend.friends.remove(current_user)
+    graph_version = friend_graph.remove_friendship(current_user.id, friend.id)
     db.session.commit()
+    friend_graph.unlink(current_user.id, friend.id, graph_version)
 
     return jsonify({
         "message": "Friend removed successfully.",
@@ -213,19 +216,39 @@ def list_friends():
 # ---------------------------------------------------
 # SEARCH FRIENDS
 # ---------------------------------------------------
+FRIEND_SEARCH_LIMIT = 20
+
 def search_friends():
     query = request.args.get('q', '').strip()
 
     if not query:
         return jsonify([]), 200
 
-    results = User.query.filter(
-        User.id != g.user_id,
-        (User.full_name.ilike(f'%{query}%')) |
-        (User.skills.ilike(f'%{query}%'))
-    ).limit(20).all()
-
-    users = [
+    # Shared across users (short TTL); the viewer is dropped afterwards
+    users = cached_search("friends", query, lambda: _find_people(query, FRIEND_SEARCH_LIMIT + 1))
+    return jsonify(exclude_viewer(users, g.user_id, FRIEND_SEARCH_LIMIT)), 200
+
+
+def _find_people(query, limit):
+    # 1. Exact skill / alias ("reactjs" -> react): indexed join on user_skill
+    results = []
+    skill_id = skill_service.find_skill_id(query)
+    if skill_id is not None:
+        results = (
+            User.query.filter(User.id.in_(skill_service.users_with_skill(skill_id)))
+            .order_by(User.full_name, User.id)
+            .limit(limit)
+            .all()
+        )
+
+    # 2. Fill up with name matches
+    if len(results) < limit:
+        seen = {u.id for u in results}
+        by_name = search_users(query, fields=("full_name",), limit=limit)
+        results.extend(u for u in by_name if u.id not in seen)
+        results = results[:limit]
+
+    return [
         {
             "id": u.id,
             "name": u.full_name,
@@ -234,6 +257,4 @@ def search_friends():
             "profile_image": getattr(u, "profile_pic", None)
         }
         for u in results
-    ]
-
-    return jsonify(users), 200
\ No newline at end of file
+    ]
\ No newline at end of file
@@ -3,12 +3,17 @@ import secrets
 import cloudinary.uploader
 from flask import jsonify, request, g, current_app, url_for
 from datetime import datetime, timedelta
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload
 
 from app.extensions import db
 from app.models.user import User
 from app.models.help_request import HelpRequest
 from app.models.solution import Solution
+from app.models.skill import help_request_tags
 from app.services.notification_service import notify
+from app.services import skill_service, profile_cache, help_match_service, leaderboard, duplicate_index
+from app.utils.upload_util import upload_many
 
 # -------------------------------------------------
 # Helpers
@@ -47,9 +52,10 @@ def _serialize_user_simple(user):
         "reputation": getattr(user, "reputation_points", 0)
     }
 
-def _serialize_help_request(req):
+def _serialize_help_request(req, author=None):
     """
     Standardized Request Object (Handles Local vs Cloudinary URLs)
+    Pass `author` when it was already loaded (joined) to skip the lookup.
     """
     image_url = None
     if req.image_url:
@@ -58,7 +64,8 @@ def _serialize_help_request(req):
         else:
             image_url = url_for("static", filename=f"uploads/{req.image_url}", _external=True)
 
-    author = User.query.get(req.user_id)
+    if author is None:
+        author = req.author  # joinedload-ed by the feed / details queries
 
     return {
         "id": req.id,
@@ -108,7 +115,8 @@ def create_help_request():
     file = request.files["image"]
     allowed = {"png", "jpg", "jpeg", "webp"}
     if "." in file.filename and file.filename.rsplit(".", 1)[1].lower() in allowed:
-        image_filename = _save_help_file(file)
+        # Releases the DB connection while the upload runs
+        image_filename = upload_many({"image": (_save_help_file, file)})["image"]
     else:
         return jsonify({"message": "Invalid image format (png, jpg, jpeg, webp only)."}), 400
 
@@ -126,47 +134,139 @@ def create_help_request():
     user.last_help_request_at = datetime.utcnow()
 
     db.session.add(new_req)
+    db.session.flush()  # need the id for the tag links
+    skill_service.set_request_tags(new_req, tags)
+    help_match_service.index_request(new_req)  # route it to matching experts
+    profile_cache.bump(user.id)  # profile shows the active request
+    duplicates_version = duplicate_index.bump()
     db.session.commit()
 
+    # 🧬 Near-duplicates among open requests (in-memory MinHash index)
+    signature = duplicate_index.signature(title, description, tags)
+    duplicate_index.add_request(new_req.id, new_req.title, signature, duplicates_version)
+    duplicates = duplicate_index.find_duplicates(signature, exclude_id=new_req.id)
+
     return jsonify({
         "message": "Help Request Posted!", 
-        "request": _serialize_help_request(new_req)
+        "request": _serialize_help_request(new_req),
+        "possible_duplicates": [
+            {"id": dup_id, "title": dup_title, "similarity": similarity, "url": f"/help/{dup_id}"}
+            for dup_id, dup_title, similarity in duplicates
+        ]
     }), 201
 
 
 # ----------------------------------------------------------------
 # 2. GET FEED (The "Rescue Radar")
 # ----------------------------------------------------------------
+FEED_PAGE_SIZE = 20
+FEED_MAX_PAGE_SIZE = 50
+FEED_STATUSES = {'open', 'solved', 'closed'}
+
+
+def _encode_cursor(req):
+    return f"{req.created_at.isoformat()}_{req.id}"
+
+
+def _decode_cursor(cursor):
+    """'<created_at iso>_<id>' -> (datetime, id); None if malformed."""
+    created_at, _, req_id = (cursor or "").rpartition("_")
+    try:
+        return datetime.fromisoformat(created_at), int(req_id)
+    except ValueError:
+        return None
+
+
+def _feed_page(limit, after=None):
+    """
+    One page of the feed, newest first, with authors joined in.
+    Filters: ?status= (default open, or 'all') and ?tag= (aliases resolve).
+    Returns (requests, has_more), or None for an unknown tag.
+    """
+    query = HelpRequest.query.options(joinedload(HelpRequest.author)) \
+        .filter(HelpRequest.user_id != g.user_id)
+
+    status = request.args.get('status', 'open').strip().lower()
+    if status in FEED_STATUSES:
+        query = query.filter(HelpRequest.status == status)
+
+    # Optional ?tag=react: indexed join on help_request_tag
+    tag = request.args.get('tag', '').strip()
+    if tag:
+        skill_id = skill_service.find_skill_id(tag)
+        if skill_id is None:
+            return None
+        query = query.join(
+            help_request_tags, help_request_tags.c.help_request_id == HelpRequest.id
+        ).filter(help_request_tags.c.skill_id == skill_id)
+
+    # Keyset: strictly after the last (created_at, id) already shown
+    if after:
+        query = query.filter(tuple_(HelpRequest.created_at, HelpRequest.id) < after)
+
+    # Fetch one extra row to know whether another page exists
+    requests = query.order_by(HelpRequest.created_at.desc(), HelpRequest.id.desc()) \
+        .limit(limit + 1).all()
+    return requests[:limit], len(requests) > limit
+
+
 def get_help_feed():
-    # Logic: Get requests that are OPEN and NOT created by me
-    query = HelpRequest.query.filter(
-        HelpRequest.status == 'open',
-        HelpRequest.user_id != g.user_id
-    )
+    # ?for_me=1: precomputed matches for my skills, authors joined in
+    if request.args.get('for_me') in ('1', 'true'):
+        matches = help_match_service.feed_for(g.user_id)
+        return jsonify([_serialize_help_request(req, author) for req, author in matches]), 200
 
-    requests = query.order_by(HelpRequest.created_at.desc()).limit(20).all()
+    # First page only (list response, kept for existing clients)
+    page = _feed_page(FEED_PAGE_SIZE)
+    if page is None:
+        return jsonify([]), 200
 
     # Use serializer for consistent data structure
-    data = [_serialize_help_request(req) for req in requests]
+    data = [_serialize_help_request(req) for req in page[0]]
 
     return jsonify(data), 200
 
 
+def get_help_feed_page():
+    # /api/help/feed/page?limit=20&cursor=<next_cursor>&tag=react&status=open
+    limit = min(request.args.get('limit', FEED_PAGE_SIZE, type=int), FEED_MAX_PAGE_SIZE)
+    cursor = request.args.get('cursor')
+    after = None
+    if cursor:
+        after = _decode_cursor(cursor)
+        if after is None:
+            return jsonify({"message": "Invalid cursor"}), 400
+
+    page = _feed_page(max(limit, 1), after)
+    if page is None:
+        return jsonify({"requests": [], "next_cursor": None, "has_more": False}), 200
+    requests, has_more = page
+
+    return jsonify({
+        "requests": [_serialize_help_request(req) for req in requests],
+        "next_cursor": _encode_cursor(requests[-1]) if has_more else None,
+        "has_more": has_more
+    }), 200
+
+
 # ----------------------------------------------------------------
 # 3. GET SINGLE REQUEST DETAILS
 # ----------------------------------------------------------------
 def get_request_details(request_id):
-    req = HelpRequest.query.get_or_404(request_id)
+    # Two queries total: request + author, solutions + solvers
+    req = HelpRequest.query.options(joinedload(HelpRequest.author)) \
+        .filter(HelpRequest.id == request_id).first_or_404()
     
     # Get Solutions
-    solutions = Solution.query.filter_by(request_id=req.id).order_by(Solution.is_accepted.desc()).all()
+    solutions = Solution.query.options(joinedload(Solution.solver)) \
+        .filter_by(request_id=req.id) \
+        .order_by(Solution.is_accepted.desc(), Solution.created_at).all()
     
     solutions_data = []
     for sol in solutions:
-        solver = User.query.get(sol.solver_id)
         solutions_data.append({
             "id": sol.id,
-            "solver": _serialize_user_simple(solver),
+            "solver": _serialize_user_simple(sol.solver),
             "content": sol.content,
             "is_accepted": sol.is_accepted,
             "created_at": sol.created_at.isoformat()
@@ -238,11 +338,19 @@ def accept_solution(solution_id):
     # 2. Update Request
     req.status = 'solved'
     
-    # 3. Give Points to Solver
+    # 3. Give Points to Solver (atomic increment + event for the leaderboard)
     solver = User.query.get(sol.solver_id)
-    solver.reputation_points = (solver.reputation_points or 0) + 10
-    
+    award = leaderboard.award(solver.id, 10, "solution_accepted", help_request_id=req.id)
+
+    # No longer needs rescuing
+    help_match_service.unindex_request(req.id)
+    duplicates_version = duplicate_index.bump()
+
+    # Asker's active request is gone, solver's reputation changed
+    profile_cache.bump(req.user_id, solver.id)
     db.session.commit()
+    leaderboard.apply(award)
+    duplicate_index.remove_request(req.id, duplicates_version)
     
     # Notify Solver
     try:
@@ -250,4 +358,47 @@ def accept_solution(solution_id):
     except:
         pass
 
-    return jsonify({"message": "Solution accepted! Points awarded."}), 200
\ No newline at end of file
+    return jsonify({"message": "Solution accepted! Points awarded."}), 200
+
+
+# ----------------------------------------------------------------
+# 6. LEADERBOARD
+# ----------------------------------------------------------------
+LEADERBOARD_PAGE_SIZE = 20
+LEADERBOARD_MAX_PAGE_SIZE = 100
+
+def get_leaderboard():
+    # /api/help/leaderboard?window=all|week&skill=react&limit=20&offset=0
+    window = request.args.get('window', leaderboard.WINDOW_ALL).strip().lower()
+    if window not in leaderboard.WINDOWS:
+        return jsonify({"message": f"window must be one of {', '.join(leaderboard.WINDOWS)}"}), 400
+
+    limit = max(1, min(request.args.get('limit', LEADERBOARD_PAGE_SIZE, type=int), LEADERBOARD_MAX_PAGE_SIZE))
+    offset = max(0, request.args.get('offset', 0, type=int))
+
+    skill_id = None
+    skill = request.args.get('skill', '').strip()
+    if skill:
+        skill_id = skill_service.find_skill_id(skill)
+        if skill_id is None:
+            return jsonify({
+                "window": window, "skill": skill, "total": 0, "leaders": [],
+                "me": {"rank": None, "points": 0}
+            }), 200
+
+    board = leaderboard.standings(g.user_id, window=window, skill_id=skill_id, offset=offset, limit=limit)
+
+    # One query for the cards on this page
+    ids = [user_id for _, user_id, _ in board["leaders"]]
+    users = {u.id: u for u in User.query.filter(User.id.in_(ids)).all()} if ids else {}
+
+    return jsonify({
+        "window": window,
+        "skill": skill or None,
+        "total": board["total"],
+        "leaders": [
+            {"rank": rank, "points": points, "user": _serialize_user_simple(users.get(user_id))}
+            for rank, user_id, points in board["leaders"]
+        ],
+        "me": board["me"]
+    }), 200
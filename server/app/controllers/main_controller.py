@@ -1,4 +1,6 @@
 from flask import jsonify
+from app.services.job_runner import background_jobs
+from app.services import search_cache
 
 def get_api_status():
     """
@@ -12,5 +14,9 @@ def get_api_status():
             "/api/posts/*",
             "/api/messages/*",
             "/api/notifications/*"
-        ]
+        ],
+        # Queue depth + job durations of this worker's background runner
+        "background_jobs": background_jobs.stats(),
+        # Hit / miss / single-flight counts of this worker's search cache
+        "search_cache": search_cache.search_cache.stats()
     }), 200
\ No newline at end of file
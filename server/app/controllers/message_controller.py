@@ -4,6 +4,8 @@ from app.models.user import User
 from app.models.message import Message
 from app.services.message_file_service import save_message_file
 from app.utils.message_serializer import serialize_message
+from app.services.event_service import publish, mark_unread_changed
+from app.services import friend_graph
 from datetime import datetime
 
 # -----------------------------------
@@ -81,7 +83,7 @@ def get_chat_history(user_id):
     if not friend:
         return jsonify({"error": "User not found"}), 404
 
-    if not current_user.friends.filter_by(id=friend.id).first():
+    if not friend_graph.are_friends_now(current_user.id, friend.id):
         return jsonify({"error": "You can only chat with your friends."}), 403
 
     # 🟢 NEW: Mark all unread messages from this friend as READ
@@ -94,7 +96,9 @@ def get_chat_history(user_id):
     if unread_messages:
         for msg in unread_messages:
             msg.is_read = True
+        mark_unread_changed(current_user.id)
         db.session.commit()
+        publish(current_user.id, "read")
 
     page = request.args.get('page', 1, type=int)
     limit = request.args.get('limit', 20, type=int)
@@ -128,7 +132,7 @@ def send_message(user_id):
     if not friend:
         return jsonify({"error": "User not found"}), 404
 
-    if not current_user.friends.filter_by(id=friend.id).first():
+    if not friend_graph.are_friends_now(current_user.id, friend.id):
         return jsonify({"error": "You can only chat with your friends."}), 403
 
     content = request.form.get("content")
@@ -162,8 +166,12 @@ def send_message(user_id):
     )
 
     db.session.add(message)
+    mark_unread_changed(friend.id)
     db.session.commit()
 
+    # 🔔 Push the new unread DM count to the receiver's open streams
+    publish(friend.id, "message", {"sender_id": current_user.id})
+
     return jsonify(serialize_message(message)), 201
 
 
@@ -181,7 +189,15 @@ def delete_message(message_id):
     if message.sender_id != current_user_id:
         return jsonify({"error": "Unauthorized to delete this message"}), 403
         
+    receiver_id = message.receiver_id
+    was_unread = not message.is_read
+
     db.session.delete(message)
+    if was_unread:
+        mark_unread_changed(receiver_id)
     db.session.commit()
+
+    if was_unread:
+        publish(receiver_id, "read")
     
     return jsonify({"success": "Message unsent successfully"}), 200
\ No newline at end of file
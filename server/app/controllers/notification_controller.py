@@ -1,6 +1,29 @@
-from flask import jsonify, g
+import json
+import queue
+import time
+from flask import jsonify, g, request, Response, stream_with_context, current_app
 from app.extensions import db
 from app.models.notification import Notification
+from app.models.message import Message
+from app.services.event_service import (
+    subscribe, unsubscribe, publish, mark_unread_changed, unread_marker
+)
+
+# Push stream tuning
+STREAM_KEEPALIVE_SECONDS = 25   # comment ping so proxies keep the socket open
+STREAM_MARKER_CHECK_SECONDS = 5 # re-read the unread marker (events from other workers)
+STREAM_MAX_SECONDS = 600        # client reconnects; frees the worker slot
+STREAM_RECONNECT_MS = 1000      # after a long-lived stream closes normally
+
+
+def _unread_counts(user_id):
+    notifications = Notification.query.filter_by(user_id=user_id, is_read=False).count()
+    messages = Message.query.filter_by(receiver_id=user_id, is_read=False).count()
+    return {"notifications": notifications, "messages": messages}
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 def get_notifications():
     user_id = g.user_id
@@ -24,12 +47,15 @@ def get_notifications():
     ]
 
     # Mark as read immediately
-    Notification.query.filter_by(
+    marked = Notification.query.filter_by(
         user_id=user_id,
         is_read=False
     ).update({"is_read": True})
 
+    if marked:
+        mark_unread_changed(user_id)
     db.session.commit()
+    publish(user_id, "read")
     return jsonify(data), 200
 
 
@@ -49,7 +75,9 @@ def mark_as_read(notification_id):
         return jsonify({"error": "Unauthorized"}), 403
 
     notif.is_read = True
+    mark_unread_changed(g.user_id)
     db.session.commit()
+    publish(g.user_id, "read")
     return jsonify({"message": "Read"}), 200
 
 
@@ -60,5 +88,82 @@ def delete_notification(notification_id):
         return jsonify({"error": "Unauthorized"}), 403
 
     db.session.delete(notif)
+    mark_unread_changed(g.user_id)
     db.session.commit()
-    return jsonify({"message": "Deleted"}), 200
\ No newline at end of file
+    publish(g.user_id, "read")
+    return jsonify({"message": "Deleted"}), 200
+
+
+def stream_unread_counts():
+    """
+    Server-Sent Events stream of unread notification + DM counts.
+    Counts are only re-queried when the user's unread marker moved (see
+    event_service), so an idle tab costs one primary-key lookup per check.
+
+    Holding the stream open needs threaded / async workers (see
+    NOTIFICATION_STREAM_SECONDS in config). With the default of 0 this is a
+    plain poll: one snapshot with the marker as ETag, then a `retry:` hint.
+    A poll whose If-None-Match still matches gets an empty 304.
+    """
+    user_id = g.user_id
+    hold_seconds = min(current_app.config.get("NOTIFICATION_STREAM_SECONDS", 0), STREAM_MAX_SECONDS)
+
+    if hold_seconds <= 0:
+        # Marker first: a write landing during the counts changes it again
+        etag = f'"{unread_marker(user_id)}"'
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+        poll_ms = current_app.config.get("NOTIFICATION_POLL_SECONDS", 30) * 1000
+        snapshot = f"retry: {poll_ms}\n\n" + _sse("unread", _unread_counts(user_id))
+        return Response(snapshot, mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "ETag": etag})
+
+    def generate():
+        channel = subscribe(user_id)
+        try:
+            yield f"retry: {STREAM_RECONNECT_MS}\n\n"
+            last_marker = unread_marker(user_id)
+            last_counts = _unread_counts(user_id)
+            yield _sse("unread", last_counts)
+            # Don't hold a pooled connection while we sit idle on the queue
+            db.session.close()
+
+            started = time.monotonic()
+            last_ping = started
+            while time.monotonic() - started < hold_seconds:
+                try:
+                    channel.get(timeout=STREAM_MARKER_CHECK_SECONDS)
+                    # Coalesce bursts (e.g. 10 messages) into a single recount
+                    while True:
+                        channel.get_nowait()
+                except queue.Empty:
+                    pass
+
+                # Events published on other workers only show up here
+                marker = unread_marker(user_id)
+                if marker == last_marker:
+                    db.session.close()
+                    if time.monotonic() - last_ping >= STREAM_KEEPALIVE_SECONDS:
+                        last_ping = time.monotonic()
+                        yield ": keepalive\n\n"
+                    continue
+
+                last_marker = marker
+                counts = _unread_counts(user_id)
+                db.session.close()
+                if counts != last_counts:
+                    last_counts = counts
+                    last_ping = time.monotonic()
+                    yield _sse("unread", counts)
+        finally:
+            unsubscribe(user_id, channel)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # disable proxy buffering (nginx/Render)
+        }
+    )
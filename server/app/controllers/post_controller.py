@@ -10,6 +10,7 @@ from app.models.post import Post
 from app.models.user import User
 from app.models.like import Like
 from app.models.saved_post import SavedPost
+from app.services import friend_graph, skill_service, counter_service
 
 # -------------------------------------------------
 # MAANG OPTIMIZATION: Advanced Serializer
@@ -103,6 +104,7 @@ def create_new_post():
     )
 
     db.session.add(post)
+    counter_service.adjust_post_count(g.user_id, 1)
     db.session.commit()
     db.session.refresh(post)
     
@@ -145,13 +147,13 @@ def get_home_feed_posts():
     per_page = 20
 
     # 1. FRIEND POSTS
-    friend_ids = [f.id for f in current_user.friends] + [current_user.id]
+    friend_ids = list(friend_graph.friend_ids(current_user.id)) + [current_user.id]
     q1 = db.session.query(Post.id).filter(Post.user_id.in_(friend_ids))
 
     # 2. SKILL POSTS
     q2 = None
-    if current_user.skills:
-        skills = [s.strip() for s in current_user.skills.split(',') if s.strip()]
+    skills = skill_service.user_skill_names(current_user.id)
+    if skills:
         skill_filters = [
             or_(Post.title.ilike(f"%{s}%"), Post.description.ilike(f"%{s}%"))
             for s in skills
@@ -281,5 +283,6 @@ def delete_post(post_id):
         return jsonify({"error": "Unauthorized to delete this post"}), 403
 
     db.session.delete(post)
+    counter_service.adjust_post_count(post.user_id, -1)
     db.session.commit()
     return jsonify({"message": "Post deleted successfully"}), 200
\ No newline at end of file
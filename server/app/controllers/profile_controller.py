@@ -8,9 +8,11 @@ from app.controllers.post_controller import _serialize_post
 from app.extensions import db
 from app.models.user import User
 from app.models.post import Post
-from app.models.friend_request import FriendRequest
 from app.models.help_request import HelpRequest
 from app.services.ml_service import trigger_ml_update_for_user 
+from app.services import typeahead_index, skill_service, profile_cache, help_match_service
+from app.services.friend_request_service import get_relationship_status
+from app.utils.upload_util import upload_many
 
 # -------------------------------------------------
 # Helpers (Private)
@@ -30,18 +32,8 @@ def _upload_image(file_storage, folder):
             return None
     return None
 
-def _serialize_user(target_user, current_user_id):
-    """
-    Serialize User object with privacy & friendship logic
-    """
-    
-    # 🟢 SAFE COUNTING: 
-    # Because friends is lazy='dynamic', we MUST use .count()
-    friend_count = target_user.friends.count()
-    
-    # Because posts isn't a direct relationship in the User model, we query the Post table directly
-    post_count = Post.query.filter_by(user_id=target_user.id).count()
-
+def _public_profile(target_user):
+    """Viewer-independent part of a profile (cached per profile_version)."""
     user_data = {
         "id": target_user.id,
         "full_name": target_user.full_name,
@@ -56,8 +48,9 @@ def _serialize_user(target_user, current_user_id):
         "created_at": target_user.created_at.isoformat(),
         "role": getattr(target_user, 'role', 'User'),
         "reputation_points": getattr(target_user, 'reputation_points', 0),  
-        "friend_count": friend_count,
-        "post_count": post_count
+        # 🟢 Stored counters (see counter_service), no COUNT per view
+        "friend_count": target_user.friend_count,
+        "post_count": target_user.post_count
     }
 
     # Check for Active Help Request & Send FULL Details
@@ -83,42 +76,26 @@ def _serialize_user(target_user, current_user_id):
     else:
         user_data["active_help_request"] = None
 
-    # Friendship status logic
-    is_friend = False
-    if current_user_id:
-        is_friend = (
-            db.session.query(User)
-            .filter(
-                User.id == current_user_id,
-                User.friends.any(id=target_user.id)
-            )
-            .first() is not None
-        )
+    return user_data
 
-    request_sent = False
-    if current_user_id:
-        request_sent = (
-            FriendRequest.query.filter_by(
-                sender_id=current_user_id,
-                receiver_id=target_user.id,
-                status="pending"
-            ).first() is not None
-        )
 
-    request_received = False
-    if current_user_id:
-        request_received = (
-            FriendRequest.query.filter_by(
-                sender_id=target_user.id,
-                receiver_id=current_user_id,
-                status="pending"
-            ).first() is not None
-        )
+def _serialize_user(target_user, current_user_id, relationship=None):
+    """
+    Serialize User object with privacy & friendship logic.
+    `relationship` is the result of get_relationship_status (computed here if omitted).
+    """
+    # 🟢 Shared cache entry: copy before adding viewer-specific keys
+    user_data = dict(profile_cache.get_profile(target_user, _public_profile))
+
+    # Friendship status logic (friend + sent + received in ONE query)
+    if relationship is None:
+        relationship = get_relationship_status(current_user_id, target_user.id)
+    is_friend = relationship["is_friend"]
 
     user_data.update({
         "is_friend": is_friend,
-        "request_sent": request_sent,
-        "request_received": request_received
+        "request_sent": relationship["request_sent"],
+        "request_received": relationship["request_received"]
     })
 
     # Privacy: hide sensitive info for non-friends (unless it's your own profile)
@@ -135,16 +112,11 @@ def get_user_profile(user_id):
     if not target_user:
         return jsonify({"message": "User not found"}), 404
 
-    # Check for specific received request ID
-    received_request = FriendRequest.query.filter_by(
-        sender_id=target_user.id,
-        receiver_id=g.user_id,
-        status="pending"
-    ).first()
+    relationship = get_relationship_status(g.user_id, target_user.id)
 
-    user_data = _serialize_user(target_user, g.user_id)
-    if received_request:
-        user_data["request_id"] = received_request.id
+    user_data = _serialize_user(target_user, g.user_id, relationship)
+    if relationship["request_id"]:
+        user_data["request_id"] = relationship["request_id"]
 
     return jsonify(user_data), 200
 
@@ -183,8 +155,22 @@ def update_user_profile():
     if not current_user:
         return jsonify({"message": "User not found"}), 404
 
+    # What typeahead suggestions show. Compared by value below: the skill
+    # queries autoflush, which clears attribute history before commit.
+    typeahead_card = (current_user.full_name, current_user.profile_pic)
+
     data = request.form
 
+    # 2. Uploads first, in parallel and outside the DB transaction
+    profile_pic = request.files.get("profile_pic")
+    cover_photo = request.files.get("cover_photo")
+    uploads = {}
+    if isinstance(profile_pic, FileStorage):
+        uploads["profile_pic"] = (_upload_image, profile_pic, "profile_pics")
+    if isinstance(cover_photo, FileStorage):
+        uploads["cover_photo"] = (_upload_image, cover_photo, "cover_photos")
+    uploaded = upload_many(uploads)
+
     # 3. EXPLICIT UPDATE LOGIC
 
     # Handle removing the DP from the frontend
@@ -204,28 +190,35 @@ def update_user_profile():
         current_user.description = data["description"]
         
     if "skills" in data:
-        current_user.skills = data["skills"]
+        skill_service.set_user_skills(current_user, data["skills"])
+        help_match_service.reindex_user(current_user.id)
         
     if "education" in data:
         current_user.education = data["education"]
 
     # 4. Handle Images
-    profile_pic = request.files.get("profile_pic")
-    cover_photo = request.files.get("cover_photo")
-
-    if profile_pic and isinstance(profile_pic, FileStorage) and profile_pic.filename:
-        url = _upload_image(profile_pic, "profile_pics")
-        if url: current_user.profile_pic = url
+    if uploaded.get("profile_pic"):
+        current_user.profile_pic = uploaded["profile_pic"]
 
-    if cover_photo and isinstance(cover_photo, FileStorage) and cover_photo.filename:
-        url = _upload_image(cover_photo, "cover_photos")
-        if url: current_user.cover_photo = url
+    if uploaded.get("cover_photo"):
+        current_user.cover_photo = uploaded["cover_photo"]
 
     try:
+        # Invalidate the cached profile (all workers)
+        profile_cache.bump(current_user.id)
+
+        # Name / picture shown in typeahead suggestions changed?
+        typeahead_version = None
+        if (current_user.full_name, current_user.profile_pic) != typeahead_card:
+            typeahead_version = typeahead_index.bump()
+
         # 5. Commit and Refresh
         db.session.commit()
         db.session.refresh(current_user) 
 
+        if typeahead_version is not None:
+            typeahead_index.add_user(current_user, typeahead_version)
+
         # 🚀 FIRE AND FORGET THE ML ENGINE
         # This runs silently in the background. The user gets their response instantly.
         trigger_ml_update_for_user(current_user.id)
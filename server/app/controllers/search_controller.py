@@ -1,6 +1,10 @@
 from flask import jsonify, request, g
-from sqlalchemy import or_
-from app.models.user import User
+from app.services.user_search import search_users
+from app.services.search_cache import cached_search, exclude_viewer
+from app.services import typeahead_index
+from app.services.federated_search import search_all, SECTIONS, DEFAULT_LIMIT
+
+SEARCH_LIMIT = 25  # <-- CRITICAL: Caps RAM usage on Render
 
 def perform_search():
     # 1. Strip whitespace
@@ -10,30 +14,68 @@ def perform_search():
     if not search_term:
         return jsonify([]), 200
 
-    search_query = f"%{search_term}%"
-
     try:
-        # 3. MAANG FIX: Always LIMIT your search queries. 
-        # Supabase free tier will timeout on full table scans eventually.
-        users = User.query.filter(
-            User.id != g.user_id,
-            or_(
-                User.full_name.ilike(search_query),
-                User.email.ilike(search_query)
-            )
-        ).limit(25).all() # <-- CRITICAL: Caps RAM usage on Render
-
-        return jsonify([
-            {
-                "id": user.id,
-                "full_name": user.full_name,
-                "email": user.email,
-                "profile_pic_url": getattr(user, 'profile_pic', None),
-                "location": getattr(user, 'location', None)
-            }
-            for user in users
-        ]), 200
+        # 3. MAANG FIX: Always LIMIT your search queries.
+        # Ranked by relevance through the trigram / FTS5 index (see user_search)
+        # Cached for everyone; the viewer is dropped afterwards (hence +1)
+        def load():
+            users = search_users(search_term, fields=("full_name", "email"), limit=SEARCH_LIMIT + 1)
+            return [
+                {
+                    "id": user.id,
+                    "full_name": user.full_name,
+                    "email": user.email,
+                    "profile_pic_url": getattr(user, 'profile_pic', None),
+                    "location": getattr(user, 'location', None)
+                }
+                for user in users
+            ]
+
+        rows = cached_search("users", search_term, load)
+        return jsonify(exclude_viewer(rows, g.user_id, SEARCH_LIMIT)), 200
 
     except Exception as e:
         print("Search error:", e)
-        return jsonify({"error": "Search failed"}), 500
\ No newline at end of file
+        return jsonify({"error": "Search failed"}), 500
+
+def suggest_users():
+    # Typeahead: answered from the in-memory prefix index, no DB query
+    prefix = request.args.get("q", "").strip()
+    if not prefix:
+        return jsonify([]), 200
+
+    matches = typeahead_index.suggest(prefix, exclude_id=g.user_id)
+    return jsonify([
+        {
+            "id": user_id,
+            "full_name": full_name,
+            "username": username,
+            "profile_pic_url": profile_pic
+        }
+        for user_id, full_name, username, profile_pic in matches
+    ]), 200
+
+
+def perform_federated_search():
+    # /api/search/all?q=&types=users,posts&limit=5&users_cursor=5
+    search_term = request.args.get("q", "").strip()
+    if not search_term:
+        return jsonify({"query": "", "sections": {}, "top": []}), 200
+
+    requested = request.args.get("types")
+    sections = [t for t in requested.split(",") if t in SECTIONS] if requested else list(SECTIONS)
+    if not sections:
+        return jsonify({"error": f"types must be one of: {', '.join(SECTIONS)}"}), 400
+
+    cursors = {}
+    for name in sections:
+        cursor = request.args.get(f"{name}_cursor")
+        if cursor:
+            if not cursor.isdigit():
+                return jsonify({"error": f"Invalid {name}_cursor"}), 400
+            cursors[name] = int(cursor)
+
+    limit = request.args.get("limit", DEFAULT_LIMIT, type=int)
+
+    results = search_all(search_term, g.user_id, sections=sections, cursors=cursors, limit=limit)
+    return jsonify({"query": search_term, **results}), 200
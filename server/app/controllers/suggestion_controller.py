@@ -1,8 +1,8 @@
 from flask import jsonify, g
-from sqlalchemy.sql.expression import func
 from app.extensions import db
 from app.models.user import User
 from app.models.recommendation import UserRecommendation
+from app.services import friend_graph, suggestion_pool
 
 def get_user_suggestions():
     current_user = User.query.get(g.user_id)
@@ -12,7 +12,7 @@ def get_user_suggestions():
     # 1. 🚀 INSTANT O(1) LOOKUP FROM THE PRE-COMPUTED ML DATABASE
     # We join the User table to get the profile details instantly
     ml_recommendations = (
-        db.session.query(User)
+        db.session.query(User, UserRecommendation.mutual_count)
         .join(UserRecommendation, UserRecommendation.recommended_user_id == User.id)
         .filter(UserRecommendation.user_id == g.user_id)
         .order_by(UserRecommendation.score.desc())
@@ -20,25 +20,10 @@ def get_user_suggestions():
         .all()
     )
 
-    suggestions = list(ml_recommendations)
+    suggestions = [u for u, _ in ml_recommendations]
+    mutual_counts = {u.id: (mutual or 0) for u, mutual in ml_recommendations}
 
-    # 2. 🛟 THE FALLBACK (Failsafe UX)
-    # If the background ML hasn't finished, or they have no skills, fill with trending users
-    if len(suggestions) < 5:
-        needed = 5 - len(suggestions)
-        
-        friend_ids = [f.id for f in current_user.friends]
-        exclude_ids = friend_ids + [current_user.id] + [u.id for u in suggestions]
-        
-        fallback_users = (
-            User.query.filter(User.id.notin_(exclude_ids))
-            .order_by(func.random()) # Fast random grab
-            .limit(needed)
-            .all()
-        )
-        suggestions.extend(fallback_users)
-
-    # 3. Format Output
+    # 2. Format Output
     response = [
         {
             "id": u.id,
@@ -46,11 +31,23 @@ def get_user_suggestions():
             "email": u.email,
             "skills": u.skills,
             "location": u.location,
-            "profile_image": getattr(u, "profile_pic", None)
+            "profile_image": getattr(u, "profile_pic", None),
+            "mutual_count": mutual_counts.get(u.id, 0)
         }
         for u in suggestions
     ]
 
+    # 3. 🛟 THE FALLBACK (Failsafe UX)
+    # If the background ML hasn't finished, or they have no skills, fill with
+    # trending users sampled from the in-memory pool (no table scan)
+    if len(response) < 5:
+        exclude_ids = friend_graph.friend_ids(current_user.id) | {current_user.id} | set(mutual_counts)
+        for entry in suggestion_pool.sample_fallbacks(5 - len(response), exclude_ids):
+            response.append({
+                **entry,
+                "mutual_count": friend_graph.mutual_count(current_user.id, entry["id"])
+            })
+
     return jsonify({
         "status": "success",
         "count": len(response),
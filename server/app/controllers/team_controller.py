@@ -1,10 +1,13 @@
 from flask import jsonify, request, g
+from sqlalchemy import func, select
 from app.extensions import db
 from app.models.team import Team, TeamMember, TeamInvite, JoinRequest, TeamMessage
 from app.models.user import User
 from app.models.task import Task # Ensure Task is imported
 # 🟢 Import our new centralized upload utility
-from app.utils.upload_util import upload_file
+from app.utils.upload_util import upload_file, upload_many
+from app.services import skill_service
+from app.utils.ttl_cache import LoadingCache
 
 def get_team_chat(team_id):
     # Check membership
@@ -64,8 +67,16 @@ def send_team_message(team_id):
 # -------------------------------------------------
 # Helpers (Private)
 # -------------------------------------------------
-def _serialize_team(team):
+def _member_count():
+    """Correlated COUNT(*) of a team's members (uses the (team_id, user_id) index)."""
+    return select(func.count(TeamMember.id)) \
+        .where(TeamMember.team_id == Team.id) \
+        .correlate(Team).scalar_subquery().label('member_count')
+
+def _serialize_team(team, member_count=None):
     """Format team object for JSON response"""
+    if member_count is None:
+        member_count = TeamMember.query.filter_by(team_id=team.id).count()
     return {
         'id': team.id,
         'name': team.name,
@@ -75,11 +86,22 @@ def _serialize_team(team):
         'hiring_requirements': team.hiring_requirements,
         'creator_id': team.creator_id,
         'created_at': team.created_at.isoformat(),
-        'member_count': len(team.members),
+        'member_count': member_count,
         'profile_pic': team.profile_pic,
         'github_repo': team.github_repo
     }
 
+def _image_uploads():
+    """Upload jobs (see upload_many) for the team images in this request."""
+    allowed_extensions = {"png", "jpg", "jpeg", "webp"}
+    uploads = {}
+    file = request.files.get("profile_pic")
+    if file and file.filename:
+        if "." in file.filename and file.filename.rsplit(".", 1)[1].lower() in allowed_extensions:
+            # Pass a custom folder name to keep Cloudinary organized!
+            uploads["profile_pic"] = (upload_file, file, "acadlinker/teams")
+    return uploads
+
 def _get_membership(team_id, user_id):
     """Check if user is a member of the team"""
     return TeamMember.query.filter_by(team_id=team_id, user_id=user_id).first()
@@ -95,14 +117,9 @@ def create_new_team():
         return jsonify({'error': 'Team name is required'}), 400
 
     try:
-        # 🟢 NEW: Handle Image Upload
-        profile_pic_url = None
-        if "profile_pic" in request.files and request.files["profile_pic"].filename:
-            file = request.files["profile_pic"]
-            allowed_extensions = {"png", "jpg", "jpeg", "webp"}
-            if "." in file.filename and file.filename.rsplit(".", 1)[1].lower() in allowed_extensions:
-                # Pass a custom folder name to keep Cloudinary organized!
-                profile_pic_url = upload_file(file, folder_name="acadlinker/teams")
+        # 🟢 NEW: Handle Image Upload (before the DB transaction)
+        uploaded = upload_many(_image_uploads())
+        profile_pic_url = uploaded.get("profile_pic")
 
         # Handle boolean conversion (FormData sends strings 'true'/'false')
         is_hiring_str = request.form.get('is_hiring', 'false').lower()
@@ -119,12 +136,15 @@ def create_new_team():
             github_repo=request.form.get('github_repo')
         )
         db.session.add(new_team)
+        db.session.flush()
+        skill_service.set_team_skills(new_team)  # skill filter of the team browser
         db.session.commit()
 
         # Add Creator as 'leader'
         leader = TeamMember(team_id=new_team.id, user_id=g.user_id, role='leader')
         db.session.add(leader)
         db.session.commit()
+        _public_first_pages.clear()
 
         return jsonify({'message': 'Team created successfully!', 'team': _serialize_team(new_team)}), 201
     except Exception as e:
@@ -139,6 +159,9 @@ def edit_team(team_id):
     if not membership or membership.role != 'leader':
         return jsonify({'error': 'Unauthorized'}), 403
         
+    # 🟢 Upload before touching the team row (no connection held meanwhile)
+    uploaded = upload_many(_image_uploads())
+
     # 🟢 CHANGED: Using request.form
     data = request.form
     
@@ -151,31 +174,108 @@ def edit_team(team_id):
     if 'is_hiring' in data: 
         team.is_hiring = data['is_hiring'].lower() == 'true'
 
+    if 'hiring_requirements' in data or 'description' in data:
+        skill_service.set_team_skills(team)
+
     # 🟢 NEW: Handle Image Update
-    if "profile_pic" in request.files and request.files["profile_pic"].filename:
-        file = request.files["profile_pic"]
-        allowed_extensions = {"png", "jpg", "jpeg", "webp"}
-        if "." in file.filename and file.filename.rsplit(".", 1)[1].lower() in allowed_extensions:
-            new_pic_url = upload_file(file, folder_name="acadlinker/teams")
-            if new_pic_url:
-                team.profile_pic = new_pic_url
+    if uploaded.get("profile_pic"):
+        team.profile_pic = uploaded["profile_pic"]
     
     db.session.commit()
+    _public_first_pages.clear()
     return jsonify({'message': 'Team updated', 'team': _serialize_team(team)}), 200
 
+# -------------------------------------------------
+# Public Team Browser (keyset paged, newest first)
+# -------------------------------------------------
+TEAM_PAGE_SIZE = 20
+TEAM_MAX_PAGE_SIZE = 50
+# First pages are the hot path (every visit to /teams). Shared by all users,
+# cleared on local create / edit / membership changes (member counts); other
+# workers catch up within the TTL.
+TEAM_LIST_CACHE_SECONDS = 30
+_public_first_pages = LoadingCache("teams", maxsize=256, ttl=TEAM_LIST_CACHE_SECONDS)
+
+def _public_teams_query(is_hiring=None, skill=None):
+    """
+    Public teams with member counts in the same query, newest first.
+    skill: teams linked to that skill (or one of its aliases) through
+    team_skill. None if the skill is unknown (no team can match).
+    """
+    query = db.session.query(Team, _member_count()).filter(Team.privacy == 'public')
+
+    if is_hiring is not None:
+        query = query.filter(Team.is_hiring == is_hiring)
+
+    if skill:
+        skill_id = skill_service.find_skill_id(skill)
+        if skill_id is None:
+            return None
+        query = query.filter(Team.id.in_(skill_service.teams_with_skill(skill_id)))
+
+    return query.order_by(Team.id.desc())
+
+def _public_teams_page(limit, before_id=None, is_hiring=None, skill=None):
+    """One keyset page: {"teams": [...], "next_cursor", "has_more"}."""
+    query = _public_teams_query(is_hiring, skill)
+    if query is None:
+        return {"teams": [], "next_cursor": None, "has_more": False}
+
+    # Keyset: ids below the last one already shown
+    if before_id:
+        query = query.filter(Team.id < before_id)
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "teams": [_serialize_team(team, member_count) for team, member_count in rows],
+        "next_cursor": rows[-1][0].id if has_more else None,
+        "has_more": has_more
+    }
+
+def _listing_args():
+    limit = min(request.args.get('limit', TEAM_PAGE_SIZE, type=int), TEAM_MAX_PAGE_SIZE)
+    hiring = request.args.get('is_hiring', '').lower()
+    is_hiring = True if hiring in ('1', 'true') else False if hiring in ('0', 'false') else None
+    skill = skill_service.canonical(request.args.get('skill', ''))
+    return max(limit, 1), is_hiring, skill or None
+
+def _public_teams(before_id):
+    limit, is_hiring, skill = _listing_args()
+    if before_id:
+        return _public_teams_page(limit, before_id, is_hiring, skill)
+    return _public_first_pages.get_or_load(
+        (limit, is_hiring, skill),
+        lambda: _public_teams_page(limit, None, is_hiring, skill)
+    )
+
+def _all_public_teams():
+    query = _public_teams_query()
+    return [_serialize_team(team, member_count) for team, member_count in query.all()]
+
 def get_public_teams():
-    # Fetch all public teams
-    teams = Team.query.filter_by(privacy='public').all()
-    return jsonify([_serialize_team(t) for t in teams]), 200
+    # Every public team as a plain list (kept for existing clients; new code
+    # should use /page). Same single aggregated query, cached like first pages.
+    return jsonify(_public_first_pages.get_or_load("all", _all_public_teams)), 200
+
+def get_public_teams_page():
+    # /api/teams/page?cursor=<next_cursor>&limit=20&is_hiring=1&skill=react
+    cursor = request.args.get('cursor', type=int)
+    return jsonify(_public_teams(cursor)), 200
 
 def get_my_teams():
-    # Fetch teams where current user is a member
-    memberships = TeamMember.query.filter_by(user_id=g.user_id).all()
+    # Fetch teams where current user is a member (member counts in the same query)
+    rows = db.session.query(TeamMember.role, Team, _member_count()) \
+        .join(Team, Team.id == TeamMember.team_id) \
+        .filter(TeamMember.user_id == g.user_id).all()
     
     output = []
-    for m in memberships:
-        team_data = _serialize_team(m.team)
-        team_data['my_role'] = m.role  # Add user's specific role
+    for role, team, member_count in rows:
+        team_data = _serialize_team(team, member_count)
+        team_data['my_role'] = role  # Add user's specific role
         output.append(team_data)
         
     return jsonify(output), 200
@@ -351,6 +451,8 @@ def respond_to_join_request():
         req.status = 'rejected'
 
     db.session.commit()
+    if action == 'accept':
+        _public_first_pages.clear()  # member count changed
     return jsonify({'message': f'Request {action}ed'}), 200
 
 def get_my_invites():
@@ -398,6 +500,8 @@ def respond_to_invite():
         invite.status = 'rejected'
 
     db.session.commit()
+    if action == 'accept':
+        _public_first_pages.clear()  # member count changed
     return jsonify({'message': f'Invite {action}ed'}), 200
 
 # app/controllers/team_controller.py
@@ -422,6 +526,7 @@ def remove_team_member(team_id, user_id):
     try:
         db.session.delete(member_to_remove)
         db.session.commit()
+        _public_first_pages.clear()  # member count changed
         return jsonify({'message': 'Member removed successfully'}), 200
     except Exception as e:
         db.session.rollback()
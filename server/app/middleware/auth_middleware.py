@@ -4,6 +4,7 @@ from jose import jwt
 import os
 from app.extensions import db
 from app.models.user import User
+from app.services import typeahead_index
 from app.utils.jwt_utils import get_public_key   # ✅ import here
 
 def token_required(f):
@@ -54,7 +55,9 @@ def token_required(f):
                     full_name=g.user_email.split('@')[0]
                 )
                 db.session.add(user)
+                typeahead_version = typeahead_index.bump()
                 db.session.commit()
+                typeahead_index.add_user(user, typeahead_version)
 
         except Exception as e:
             print("❌ JWT ERROR:", str(e))
@@ -17,4 +17,8 @@ from .recommendation import UserRecommendation
 from .team import Team, TeamMember, TeamInvite, JoinRequest, TeamMessage
 from .task import Task
 
-from .associations import friendships
\ No newline at end of file
+from .associations import friendships
+from .cache_version import CacheVersion
+from .skill import Skill, SkillAlias, user_skills, help_request_tags
+from .help_match import help_matches
+from .reputation_event import ReputationEvent
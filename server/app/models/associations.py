@@ -1,9 +1,26 @@
+from sqlalchemy import select, union_all
 from app.extensions import db
 
 # User ↔ User (friends)
+# 🟢 Stored ONCE per unordered pair: user_id is always the smaller id.
 friendships = db.Table(
     'friendships',
     # Changed from db.Integer to db.String(36) to match Supabase UUIDs
     db.Column('user_id', db.String(36), db.ForeignKey('user.id'), primary_key=True),
-    db.Column('friend_id', db.String(36), db.ForeignKey('user.id'), primary_key=True)
-)
\ No newline at end of file
+    db.Column('friend_id', db.String(36), db.ForeignKey('user.id'), primary_key=True),
+    db.CheckConstraint('user_id < friend_id', name='ck_friendships_ordered_pair'),
+    # PK covers lookups by user_id; this covers the other half of the pair
+    db.Index('ix_friendships_friend_id', 'friend_id')
+)
+
+# Read-only "view" with both directions of every pair, so relationships can
+# keep joining on (user_id -> friend_id). Each branch uses one of the indexes.
+friend_pairs = union_all(
+    select(friendships.c.user_id.label('user_id'), friendships.c.friend_id.label('friend_id')),
+    select(friendships.c.friend_id.label('user_id'), friendships.c.user_id.label('friend_id'))
+).subquery('friend_pairs')
+
+
+def ordered_pair(user_id, other_id):
+    """(low, high) key under which a friendship is stored."""
+    return (user_id, other_id) if user_id < other_id else (other_id, user_id)
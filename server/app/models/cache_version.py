@@ -0,0 +1,15 @@
+from app.extensions import db
+
+class CacheVersion(db.Model):
+    """
+    Tiny shared counter table. In-process caches (friend graph, search
+    indexes...) compare their local version with this row to know when
+    another worker changed the underlying data.
+    """
+    __tablename__ = 'cache_version'
+
+    key = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CacheVersion {self.key}={self.version}>"
@@ -6,3 +6,11 @@ class FriendRequest(db.Model):
     sender_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
     receiver_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
     status = db.Column(db.String(10), default='pending')
+
+
+    __table_args__ = (
+        # Inbox: "my pending requests"
+        db.Index('ix_friend_request_receiver_status', 'receiver_id', 'status'),
+        # Relationship status between two given users
+        db.Index('ix_friend_request_pair_status', 'sender_id', 'receiver_id', 'status'),
+    )
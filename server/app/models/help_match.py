@@ -0,0 +1,17 @@
+from app.extensions import db
+
+# Precomputed "who can answer this?" index: one row per (open help request,
+# user whose skills overlap its tags). Maintained by
+# app.services.help_match_service; read by /api/help/feed?for_me=1.
+help_matches = db.Table(
+    'help_match',
+    db.Column('user_id', db.String(36), db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('help_request_id', db.Integer, db.ForeignKey('help_request.id', ondelete='CASCADE'), primary_key=True),
+    # Number of the request's tags the user has
+    db.Column('score', db.Integer, nullable=False),
+    # Copy of help_request.created_at so the feed is ordered by this index alone
+    db.Column('created_at', db.DateTime, nullable=False),
+    db.Index('ix_help_match_user_rank', 'user_id', 'score', 'created_at'),
+    # Dropping a request's matches on solve
+    db.Index('ix_help_match_help_request_id', 'help_request_id')
+)
@@ -12,7 +12,8 @@ class HelpRequest(db.Model):
     github_link = db.Column(db.String(500), nullable=False)
     image_url = db.Column(db.String(500), nullable=True) # Optional screenshot
     
-    # Tags are crucial for matching (stored as "python,react,sql")
+    # Tags are crucial for matching (stored as "python,react,sql" for display;
+    # normalized links live in help_request_tag)
     tags = db.Column(db.String(200), nullable=False)
     
     # Status: 'open', 'solved', 'closed'
@@ -20,6 +21,15 @@ class HelpRequest(db.Model):
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Feed: keyset pages over (created_at, id) within a status
+        db.Index('ix_help_request_status_created', 'status', 'created_at', 'id'),
+        # "Does this user have an open request?"
+        db.Index('ix_help_request_user_status', 'user_id', 'status'),
+    )
+
+    tag_set = db.relationship('Skill', secondary='help_request_tag', lazy=True, viewonly=True)
+
     # Relationship to solutions
     solutions = db.relationship('Solution', backref='request', lazy=True, cascade="all, delete-orphan")
 
@@ -7,8 +7,11 @@ class UserRecommendation(db.Model):
     user_id = db.Column(db.String(36), db.ForeignKey('user.id', ondelete='CASCADE'), index=True, nullable=False)
     # The suggested user
     recommended_user_id = db.Column(db.String(36), db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
-    # The ML similarity score
+    # The blended ranking score (skill similarity + mutual friends)
     score = db.Column(db.Float, nullable=False)
+    # Components of the blend (skill_score is NULL for pure friends-of-friends picks)
+    skill_score = db.Column(db.Float, nullable=True)
+    mutual_count = db.Column(db.Integer, default=0)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Prevent duplicate recommendations
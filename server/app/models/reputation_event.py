@@ -0,0 +1,27 @@
+from datetime import datetime
+from app.extensions import db
+
+class ReputationEvent(db.Model):
+    """
+    One award of reputation points (append-only). User.reputation_points is
+    the running total; these rows let us rank by time window or by skill.
+    """
+    __tablename__ = 'reputation_event'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    points = db.Column(db.Integer, nullable=False)
+    reason = db.Column(db.String(30), nullable=False)
+    # Request the points were earned on (tags -> per-skill rankings)
+    help_request_id = db.Column(db.Integer, db.ForeignKey('help_request.id', ondelete='SET NULL'), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Weekly board: events since a date
+        db.Index('ix_reputation_event_created_at', 'created_at'),
+        # Per-skill board: events on requests with a tag
+        db.Index('ix_reputation_event_help_request_id', 'help_request_id'),
+    )
+
+    def __repr__(self):
+        return f"<ReputationEvent {self.user_id} +{self.points}>"
@@ -0,0 +1,54 @@
+from app.extensions import db
+
+# Shared vocabulary for user skills, help-request tags and the skills a team
+# mentions, so "who can answer this request?" / "teams hiring for react" are
+# indexed id joins instead of string matches.
+
+user_skills = db.Table(
+    'user_skill',
+    db.Column('user_id', db.String(36), db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id', ondelete='CASCADE'), primary_key=True),
+    # PK covers "skills of a user"; this covers "users with a skill"
+    db.Index('ix_user_skill_skill_id', 'skill_id')
+)
+
+help_request_tags = db.Table(
+    'help_request_tag',
+    db.Column('help_request_id', db.Integer, db.ForeignKey('help_request.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_help_request_tag_skill_id', 'skill_id')
+)
+
+# Known skills mentioned in a team's hiring requirements / description
+team_skills = db.Table(
+    'team_skill',
+    db.Column('team_id', db.Integer, db.ForeignKey('team.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_team_skill_skill_id', 'skill_id')
+)
+
+
+class Skill(db.Model):
+    __tablename__ = 'skill'
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Canonical lowercase form ("react", "node.js", "machine learning")
+    name = db.Column(db.String(50), unique=True, nullable=False)
+    # How it is shown back to users (first spelling we saw)
+    display_name = db.Column(db.String(50), nullable=False)
+
+    aliases = db.relationship('SkillAlias', backref='skill', lazy=True, cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<Skill {self.name}>"
+
+
+class SkillAlias(db.Model):
+    """Alternative spellings that resolve to one skill ("reactjs" -> "react")."""
+    __tablename__ = 'skill_alias'
+
+    alias = db.Column(db.String(50), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<SkillAlias {self.alias}>"
@@ -16,5 +16,10 @@ class Solution(db.Model):
     is_accepted = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Details page: solutions of a request, accepted first
+        db.Index('ix_solution_request_accepted', 'request_id', 'is_accepted'),
+    )
+
     def __repr__(self):
         return f'<Solution {self.id} for Request {self.request_id}>'
\ No newline at end of file
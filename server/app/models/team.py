@@ -31,6 +31,11 @@ class Team(db.Model):
     invites = db.relationship('TeamInvite', backref='team', cascade="all, delete-orphan")
     join_requests = db.relationship('JoinRequest', backref='team', cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Public team browser: newest public teams, keyset on id
+        db.Index('ix_team_privacy_id', 'privacy', 'id'),
+    )
+
     def __repr__(self):
         return f"<Team {self.name}>"
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 from app.extensions import db
-from app.models.associations import friendships
+from app.models.associations import friend_pairs
 
 class User(db.Model):
     # Supabase Auth IDs are UUID strings, not Integers
@@ -15,14 +15,24 @@ class User(db.Model):
     cover_photo = db.Column(db.String(500), default='cover.jpg')
     location = db.Column(db.String(100))
     description = db.Column(db.Text)
+    # Comma list as typed by the user (display); the normalized links live
+    # in user_skill (see app.services.skill_service)
     skills = db.Column(db.String(255))
     education = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Denormalized counters shown on every profile. Kept in step by
+    # app.services.counter_service inside the writing transaction;
+    # `flask counters reconcile` repairs any drift.
+    friend_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    post_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Bumped whenever the public profile changes (see app.services.profile_cache)
+    profile_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
     # ---------------------------------------------------------
     # 🆕 NEW FIELDS FOR DEV-RESCUE (HELP FEATURE)
     # ---------------------------------------------------------
-    reputation_points = db.Column(db.Integer, default=0)
+    reputation_points = db.Column(db.Integer, default=0, index=True)  # leaderboard
     last_help_request_at = db.Column(db.DateTime, nullable=True)
 
     # 🆕 Relationships
@@ -31,15 +41,19 @@ class User(db.Model):
     solutions = db.relationship('Solution', backref='solver', lazy=True)
     # ---------------------------------------------------------
 
+    # Read-only: friendships are written through app.services.friend_graph
+    # (add_friendship / remove_friendship), one row per pair.
     friends = db.relationship(
         'User',
-        secondary=friendships,
-        primaryjoin=(friendships.c.user_id == id),
-        secondaryjoin=(friendships.c.friend_id == id),
-        backref=db.backref('friend_of', lazy='dynamic'),
+        secondary=friend_pairs,
+        primaryjoin=(friend_pairs.c.user_id == id),
+        secondaryjoin=(friend_pairs.c.friend_id == id),
+        viewonly=True,
         lazy='dynamic'
     )
 
+    skill_set = db.relationship('Skill', secondary='user_skill', lazy=True, viewonly=True)
+
     # 🆕 Teams Relationship
     # accessing user.teams_membership will give list of TeamMember objects
     teams_membership = db.relationship('TeamMember', backref='user', lazy=True)
@@ -6,6 +6,7 @@ from app.middleware.auth_middleware import token_required
 from app.controllers.friend_controller import (
     send_friend_request,
     get_friend_requests,
+    get_friend_request_inbox,
     accept_friend_request,
     reject_friend_request,
     remove_friend,
@@ -35,6 +36,13 @@ def requests():
     return get_friend_requests()
 
 
+# Paged inbox: ?limit=20&cursor=<last request id>
+@friends_bp.route("/requests/inbox", methods=["GET"])
+@token_required
+def inbox():
+    return get_friend_request_inbox()
+
+
 # Request IDs are still Integers (from your model), so <int:req_id> is correct
 @friends_bp.route("/accept/<int:req_id>", methods=["POST"])
 @token_required
@@ -3,9 +3,11 @@ from app.middleware.auth_middleware import token_required
 from app.controllers.help_controller import (
     create_help_request,
     get_help_feed,
+    get_help_feed_page,
     get_request_details,
     post_solution,
-    accept_solution
+    accept_solution,
+    get_leaderboard
 )
 
 # ✅ URL Prefix defined here
@@ -24,9 +26,15 @@ def create():
 @help_bp.route('/feed', methods=['GET'])
 @token_required
 def feed():
-    """Get the feed of open help requests"""
+    """Get the feed of open help requests (?for_me=1: matched to my skills)"""
     return get_help_feed()
 
+@help_bp.route('/feed/page', methods=['GET'])
+@token_required
+def feed_page():
+    """Cursor-paged feed (?cursor=&limit=&tag=&status=)"""
+    return get_help_feed_page()
+
 @help_bp.route('/<int:request_id>', methods=['GET'])
 @token_required
 def details(request_id):
@@ -43,4 +51,10 @@ def solve(request_id):
 @token_required
 def accept(solution_id):
     """Accept a solution"""
-    return accept_solution(solution_id)
\ No newline at end of file
+    return accept_solution(solution_id)
+
+@help_bp.route('/leaderboard', methods=['GET'])
+@token_required
+def leaderboard():
+    """Reputation rankings (?window=all|week&skill=&limit=&offset=) with my rank"""
+    return get_leaderboard()
@@ -7,7 +7,8 @@ from app.controllers.notification_controller import (
     get_notifications,
     get_unread_count,
     mark_as_read,
-    delete_notification
+    delete_notification,
+    stream_unread_counts
 )
 
 notifications_bp = Blueprint(
@@ -26,6 +27,12 @@ def notifications():
 def unread_count():
     return get_unread_count()
 
+# 🔴 Live unread counts (replaces client-side polling of /unread_count)
+@notifications_bp.route("/stream", methods=["GET"])
+@token_required
+def stream():
+    return stream_unread_counts()
+
 @notifications_bp.route("/mark_read/<int:notification_id>", methods=["PATCH"])
 @token_required   # <--- USE THIS
 def mark_read(notification_id):
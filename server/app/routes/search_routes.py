@@ -1,7 +1,7 @@
 from flask import Blueprint
 # 1. ADD: Import the token middleware
 from app.middleware.auth_middleware import token_required
-from app.controllers.search_controller import perform_search
+from app.controllers.search_controller import perform_search, suggest_users, perform_federated_search
 
 search_bp = Blueprint("search", __name__, url_prefix='/api')
 
@@ -9,4 +9,17 @@ search_bp = Blueprint("search", __name__, url_prefix='/api')
 @search_bp.route("/search", methods=["GET"])
 @token_required  # <--- CRITICAL: This sets g.user_id for the controller
 def search_users():
-    return perform_search()
\ No newline at end of file
+    return perform_search()
+
+# Route becomes: /api/search/suggest?q=
+@search_bp.route("/search/suggest", methods=["GET"])
+@token_required
+def suggest():
+    return suggest_users()
+
+
+# Route becomes: /api/search/all?q=  (users, posts, teams, help requests)
+@search_bp.route("/search/all", methods=["GET"])
+@token_required
+def search_everything():
+    return perform_federated_search()
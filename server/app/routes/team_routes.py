@@ -3,6 +3,7 @@ from app.middleware.auth_middleware import token_required
 from app.controllers.team_controller import (
     create_new_team,
     get_public_teams,
+    get_public_teams_page,
     get_my_teams,
     get_team_details,
     remove_team_member,
@@ -45,6 +46,11 @@ def create():
 def get_all():
     return get_public_teams()
 
+@team_bp.route('/page', methods=['GET'])
+@token_required
+def get_page():
+    return get_public_teams_page()
+
 @team_bp.route('/my', methods=['GET'])
 @token_required
 def get_mine():
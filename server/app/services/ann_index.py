@@ -0,0 +1,190 @@
+import os
+import copy
+import time
+import numpy as np
+
+# -------------------------------------------------
+# Approximate nearest neighbours (random-projection LSH)
+# -------------------------------------------------
+# Rows of the TF-IDF matrix are L2-normalised, so cosine similarity is the
+# angle between vectors. Each of TABLES hash tables draws BITS random
+# hyperplanes; a user's code in that table is the sign pattern of its
+# projections. Users pointing the same way land in the same bucket.
+#
+# Stored next to the model build (memory-mapped like the matrix):
+#   lsh_planes.npy  terms × (TABLES·BITS) float32
+#   lsh_codes.npy   TABLES × users uint32, each row sorted
+#   lsh_order.npy   TABLES × users int32, matrix row for each sorted code
+#
+# A query hashes the vector, looks up its bucket plus the PROBES buckets
+# one bit-flip away on its least certain bits (multi-probe), then scores
+# only those candidates exactly.
+
+TABLES = 8
+TARGET_BUCKET_SIZE = 16      # picks BITS so buckets hold ~this many users
+MIN_BITS, MAX_BITS = 4, 24
+PROBES = 4
+MIN_USERS = 2000             # below this an exact scan is already fast (RECOMMENDER_ANN_MIN_USERS)
+BUILD_BLOCK_ROWS = 50000
+SEED = 42
+
+FILES = ("lsh_planes.npy", "lsh_codes.npy", "lsh_order.npy")
+
+
+def _bits_for(n):
+    return int(np.clip(np.log2(max(n, 1) / TARGET_BUCKET_SIZE), MIN_BITS, MAX_BITS))
+
+
+class LSHIndex:
+    def __init__(self, planes, codes, order):
+        self.planes = planes
+        self.codes = codes
+        self.order = order
+        self.tables = codes.shape[0]
+        self.bits = planes.shape[1] // self.tables
+        self._weights = (1 << np.arange(self.bits, dtype=np.uint32)).astype(np.uint32)
+
+    # ---------------------------------------------
+    # Build / persist
+    # ---------------------------------------------
+    @classmethod
+    def build(cls, matrix, tables=TABLES, bits=None, seed=SEED):
+        n, terms = matrix.shape
+        bits = bits or _bits_for(n)
+        rng = np.random.default_rng(seed)
+        planes = rng.standard_normal((terms, tables * bits), dtype=np.float32)
+
+        codes = _hash(matrix, planes, tables, bits)
+        order = np.argsort(codes, axis=1, kind="stable").astype(np.int32)
+        codes = np.take_along_axis(codes, order, axis=1)
+        return cls(planes, codes, order)
+
+    def save(self, directory):
+        for name, array in zip(FILES, (self.planes, self.codes, self.order)):
+            np.save(os.path.join(directory, name), array)
+
+    @classmethod
+    def load(cls, directory):
+        """Memory-map a saved index, or None if the build has no index."""
+        paths = [os.path.join(directory, name) for name in FILES]
+        if not all(os.path.exists(p) for p in paths):
+            return None
+        return cls(*(np.load(p, mmap_mode="r") for p in paths))
+
+    # ---------------------------------------------
+    # Query
+    # ---------------------------------------------
+    def hash(self, matrix):
+        """TABLES × rows codes of `matrix` (e.g. rows re-vectorised after the build)."""
+        return _hash(matrix, self.planes, self.tables, self.bits)
+
+    def probe_keys(self, vector, probes=PROBES):
+        """TABLES × (1 + probes) bucket codes a query for `vector` looks at."""
+        projections = np.asarray(vector @ self.planes).reshape(self.tables, self.bits)
+        base = (projections > 0) @ self._weights
+
+        # Flip the bits whose projection was closest to the hyperplane
+        probes = min(probes, self.bits)
+        uncertain = np.argsort(np.abs(projections), axis=1)[:, :probes]
+        flips = self._weights[uncertain]
+        return np.concatenate([base[:, None], base[:, None] ^ flips], axis=1).astype(np.uint32)
+
+    def matches(self, codes, keys):
+        """Boolean mask over the columns of `codes`: in any probed bucket of `keys`."""
+        hit = np.zeros(codes.shape[1], dtype=bool)
+        for t in range(self.tables):
+            hit |= np.isin(codes[t], keys[t])
+        return hit
+
+    def candidates(self, vector, probes=PROBES, keys=None):
+        """Matrix rows sharing (or nearly sharing) a bucket with `vector`."""
+        if keys is None:
+            keys = self.probe_keys(vector, probes)
+
+        found = []
+        for t in range(self.tables):
+            codes = self.codes[t]
+            for key in keys[t]:
+                lo = np.searchsorted(codes, key, side="left")
+                hi = np.searchsorted(codes, key, side="right")
+                if hi > lo:
+                    found.append(self.order[t][lo:hi])
+
+        if not found:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(found))
+
+
+def _hash(matrix, planes, tables, bits):
+    n = matrix.shape[0]
+    weights = (1 << np.arange(bits, dtype=np.uint32)).astype(np.uint32)
+    codes = np.empty((tables, n), dtype=np.uint32)
+    for start in range(0, n, BUILD_BLOCK_ROWS):
+        end = min(n, start + BUILD_BLOCK_ROWS)
+        signs = np.asarray(matrix[start:end] @ planes) > 0
+        codes[:, start:end] = (signs.reshape(end - start, tables, bits) @ weights).T
+    return codes
+
+
+# -------------------------------------------------
+# Benchmark (flask recommend ann-bench)
+# -------------------------------------------------
+def benchmark(model, sample=200, k=10, seed=SEED, tables=None, bits=None, log=print):
+    """
+    Recall@k and latency of the LSH index against an exact scan. Builds a
+    throw-away index when the build has none (small datasets) or when
+    tables / bits are given, so any dataset can be measured.
+    """
+    if model.index is None or tables or bits:
+        started = time.perf_counter()
+        index = LSHIndex.build(model.matrix, tables=tables or TABLES, bits=bits, seed=seed)
+        log(f"🧭 ANN: temporary index {index.tables}×{index.bits} bits "
+            f"in {time.perf_counter() - started:.2f}s (not saved)")
+        model = copy.copy(model)
+        model.index = index
+
+    rng = np.random.default_rng(seed)
+    non_empty = np.flatnonzero(np.diff(model.matrix.indptr))
+    rows = rng.choice(non_empty, size=min(sample, len(non_empty)), replace=False)
+
+    recalls, exact_ms, approx_ms, candidates = [], [], [], []
+    for row in rows:
+        vector = model.matrix[row]
+        exclude = [str(model.user_ids[row])]
+
+        started = time.perf_counter()
+        exact = model.top_k(vector, k, exclude, exact=True)
+        exact_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        approx = model.top_k(vector, k, exclude)
+        approx_ms.append((time.perf_counter() - started) * 1000)
+
+        candidates.append(len(model.index.candidates(vector)))
+        if exact:
+            # Ties at the k-th score make ids ambiguous; compare scores instead
+            cutoff = exact[-1][1]
+            hits = sum(1 for _, score in approx if score >= cutoff - 1e-6)
+            recalls.append(min(hits, len(exact)) / len(exact))
+
+    stats = {
+        "users": model.size,
+        "queries": len(rows),
+        "tables": model.index.tables,
+        "bits": model.index.bits,
+        "recall": float(np.mean(recalls)) if recalls else 0.0,
+        "avg_candidates": float(np.mean(candidates)) if candidates else 0.0,
+        "exact_ms_p50": float(np.percentile(exact_ms, 50)) if exact_ms else 0.0,
+        "approx_ms_p50": float(np.percentile(approx_ms, 50)) if approx_ms else 0.0,
+        "approx_ms_p95": float(np.percentile(approx_ms, 95)) if approx_ms else 0.0
+    }
+    log(
+        f"📏 ANN recall@{k}: {stats['recall']:.3f} over {stats['queries']} queries "
+        f"({stats['tables']} tables × {stats['bits']} bits, "
+        f"~{stats['avg_candidates']:.0f} candidates of {stats['users']})"
+    )
+    log(
+        f"⏱️ exact p50 {stats['exact_ms_p50']:.2f} ms | "
+        f"approx p50 {stats['approx_ms_p50']:.2f} ms, p95 {stats['approx_ms_p95']:.2f} ms"
+    )
+    return stats
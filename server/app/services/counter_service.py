@@ -0,0 +1,76 @@
+from sqlalchemy import func, select
+from app.extensions import db
+from app.models.user import User
+from app.models.post import Post
+from app.models.associations import friendships
+
+# -------------------------------------------------
+# Denormalized profile counters (User.friend_count / User.post_count)
+# -------------------------------------------------
+# Profiles are viewed far more often than friendships or posts change, so
+# the counts are stored on the user row instead of counted per view.
+# Writers adjust them with a relative UPDATE (count = count + delta) in the
+# same transaction as the row they insert/delete, so concurrent writers
+# never overwrite each other. reconcile() recomputes from the source tables.
+#
+# Both counters are part of the cached profile, so every adjustment also
+# bumps profile_version (same UPDATE, see app.services.profile_cache).
+
+
+def adjust_friend_count(user_ids, delta):
+    """friend_count += delta for each id. Caller commits."""
+    db.session.query(User).filter(User.id.in_(list(user_ids))).update(
+        {User.friend_count: User.friend_count + delta,
+         User.profile_version: User.profile_version + 1},
+        synchronize_session=False
+    )
+
+
+def adjust_post_count(user_id, delta):
+    """post_count += delta. Caller commits."""
+    db.session.query(User).filter(User.id == user_id).update(
+        {User.post_count: User.post_count + delta,
+         User.profile_version: User.profile_version + 1},
+        synchronize_session=False
+    )
+
+
+# -------------------------------------------------
+# Reconciliation (flask counters reconcile)
+# -------------------------------------------------
+def _actual_friend_count():
+    # One row per pair: count both halves, each branch uses its own index
+    as_low = select(func.count()).where(friendships.c.user_id == User.id).scalar_subquery()
+    as_high = select(func.count()).where(friendships.c.friend_id == User.id).scalar_subquery()
+    return as_low + as_high
+
+
+def _actual_post_count():
+    return select(func.count(Post.id)).where(Post.user_id == User.id).scalar_subquery()
+
+
+def reconcile(dry_run=False, log=print):
+    """
+    Recompute both counters from friendships / post and fix rows that
+    drifted. Returns {"friend_count": n, "post_count": n} rows changed.
+    """
+    fixed = {}
+    for column, actual in (
+        (User.friend_count, _actual_friend_count()),
+        (User.post_count, _actual_post_count())
+    ):
+        drifted = db.session.query(User).filter(column != actual)
+        if dry_run:
+            fixed[column.key] = drifted.count()
+        else:
+            fixed[column.key] = drifted.update(
+                {column: actual, User.profile_version: User.profile_version + 1},
+                synchronize_session=False
+            )
+        log(f"🔢 {column.key}: {fixed[column.key]} user(s) {'drifted' if dry_run else 'fixed'}")
+
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    return fixed
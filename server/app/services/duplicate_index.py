@@ -0,0 +1,261 @@
+import re
+import threading
+import mmh3
+import numpy as np
+from app.extensions import db
+from app.models.help_request import HelpRequest
+from app.services.job_runner import run_in_background
+from app.services.skill_service import parse_list
+from app.services.version_service import bump_version, get_version, remember_version
+
+# -------------------------------------------------
+# Near-duplicate help requests (MinHash LSH, per worker)
+# -------------------------------------------------
+# Every OPEN request is reduced to a MinHash signature over its word
+# 3-shingles (title + description) and its canonical tags. Signatures are
+# split into BANDS bands of ROWS values; two requests sharing any band land
+# in the same bucket. A new request only compares itself with requests in its
+# buckets, so a check costs one signature (~0.1 ms) plus a handful of
+# comparisons, independent of how many requests are open.
+#
+# With 16 bands × 4 rows, pairs above ~0.5 Jaccard similarity are almost
+# always candidates, pairs below ~0.2 almost never.
+#
+# Each worker loads the index in the background on its first request
+# (init_app); until it is ready, checks simply report no duplicates.
+#
+# Freshness works like friend_graph: writers bump DUPLICATES_VERSION_KEY in
+# their transaction and call add_request() / remove_request() after
+# committing. Other workers see the new version and catch up in the
+# background: one id-only scan of the open requests, then only the newly
+# opened ones are fetched and hashed and the closed ones dropped.
+
+DUPLICATES_VERSION_KEY = "help_duplicates"
+NUM_PERM = 64
+BANDS, ROWS = 16, 4
+SHINGLE_SIZE = 3
+MAX_WORDS = 400               # long pasted stack traces add little signal
+DUPLICATE_THRESHOLD = 0.5     # estimated Jaccard to report a duplicate
+MAX_DUPLICATES = 3
+SEED = 42
+LOAD_BATCH = 500              # ids per IN (...) when fetching new requests
+
+_rng = np.random.default_rng(SEED)
+# Multiply-shift hash family: h_i(x) = (a_i * x + b_i) >> 32 on uint64
+_A = (_rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)).reshape(-1, 1)
+_B = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64).reshape(-1, 1)
+_WORD = re.compile(r"\w+")
+
+_signatures = None   # request_id -> (signature, title)
+_buckets = {}        # (band, band bytes) -> set(request_id)
+_version = None
+_rebuilding = False
+_warming = False
+_lock = threading.RLock()
+
+
+# -------------------------------------------------
+# Signatures
+# -------------------------------------------------
+def _shingles(title, description, tags):
+    words = _WORD.findall(f"{title or ''} {description or ''}".lower())[:MAX_WORDS]
+    if len(words) < SHINGLE_SIZE:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    shingles.update(f"#{name}" for name, _ in parse_list(tags))
+    return shingles
+
+
+def signature(title, description, tags):
+    """uint32[NUM_PERM] MinHash signature, or None for an empty text."""
+    shingles = _shingles(title, description, tags)
+    if not shingles:
+        return None
+    hashes = np.fromiter(
+        (mmh3.hash(s, SEED, signed=False) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    with np.errstate(over="ignore"):
+        permuted = (_A * hashes + _B) >> np.uint64(32)
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def _band_keys(sig):
+    return [(band, sig[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+
+# -------------------------------------------------
+# Loading
+# -------------------------------------------------
+def _index(signatures, buckets, request_id, sig, title):
+    signatures[request_id] = (sig, title)
+    for key in _band_keys(sig):
+        buckets.setdefault(key, set()).add(request_id)
+
+
+def _unindex(signatures, buckets, request_id):
+    entry = signatures.pop(request_id, None)
+    if entry is None:
+        return
+    for key in _band_keys(entry[0]):
+        bucket = buckets.get(key)
+        if bucket is not None:
+            bucket.discard(request_id)
+            if not bucket:
+                del buckets[key]
+
+
+def _signed(query):
+    """{request_id: (signature, title)} for the open requests in `query`."""
+    found = {}
+    rows = query.with_entities(
+        HelpRequest.id, HelpRequest.title, HelpRequest.description, HelpRequest.tags
+    ).filter(HelpRequest.status == 'open').yield_per(1000)
+    for request_id, title, description, tags in rows:
+        sig = signature(title, description, tags)
+        if sig is not None:
+            found[request_id] = (sig, title)
+    return found
+
+
+def rebuild():
+    """Load the index from every open request (first use in this worker)."""
+    global _signatures, _buckets, _version, _warming
+    try:
+        # Read the version first: a write landing mid-load triggers a catch-up
+        version = get_version(DUPLICATES_VERSION_KEY, max_age=0)
+        signatures, buckets = {}, {}
+        for request_id, (sig, title) in _signed(HelpRequest.query).items():
+            _index(signatures, buckets, request_id, sig, title)
+        with _lock:
+            _signatures, _buckets, _version = signatures, buckets, version
+        print(f"🧬 Duplicate index loaded: {len(signatures)} open requests (v{version})")
+    finally:
+        _warming = False
+
+
+def catch_up():
+    """Apply what other workers changed since our version (no full reload)."""
+    global _version, _rebuilding
+    try:
+        version = get_version(DUPLICATES_VERSION_KEY, max_age=0)
+        open_ids = {
+            request_id for (request_id,) in
+            db.session.query(HelpRequest.id).filter(HelpRequest.status == 'open')
+        }
+        with _lock:
+            indexed = set(_signatures)
+
+        new_ids = sorted(open_ids - indexed)
+        added = {}
+        for start in range(0, len(new_ids), LOAD_BATCH):
+            batch = new_ids[start:start + LOAD_BATCH]
+            added.update(_signed(HelpRequest.query.filter(HelpRequest.id.in_(batch))))
+
+        closed = indexed - open_ids
+        with _lock:
+            for request_id in closed:
+                _unindex(_signatures, _buckets, request_id)
+            for request_id, (sig, title) in added.items():
+                _index(_signatures, _buckets, request_id, sig, title)
+            _version = version
+        print(f"🧬 Duplicate index caught up: +{len(added)} -{len(closed)} (v{version})")
+    finally:
+        _rebuilding = False
+
+
+def warm():
+    """Start loading this worker's index in the background (idempotent)."""
+    global _warming
+    if _signatures is not None or _warming:
+        return
+    _warming = True
+    if not run_in_background(("duplicate_index_rebuild",), rebuild):
+        _warming = False
+
+
+def _check_fresh():
+    global _rebuilding
+    if _signatures is None:
+        warm()
+        return False
+
+    if get_version(DUPLICATES_VERSION_KEY) != _version and not _rebuilding:
+        _rebuilding = True
+        if not run_in_background(("duplicate_index_catch_up",), catch_up):
+            _rebuilding = False
+    return True
+
+
+# -------------------------------------------------
+# Reads
+# -------------------------------------------------
+def find_duplicates(sig, exclude_id=None, limit=MAX_DUPLICATES, threshold=DUPLICATE_THRESHOLD):
+    """[(request_id, title, similarity)] most similar first."""
+    if sig is None or not _check_fresh():
+        return []
+
+    with _lock:
+        candidates = set()
+        for key in _band_keys(sig):
+            candidates |= _buckets.get(key, set())
+        candidates.discard(exclude_id)
+
+        matches = []
+        for request_id in candidates:
+            other, title = _signatures[request_id]
+            similarity = float(np.count_nonzero(other == sig)) / NUM_PERM
+            if similarity >= threshold:
+                matches.append((request_id, title, round(similarity, 2)))
+
+    matches.sort(key=lambda m: m[2], reverse=True)
+    return matches[:limit]
+
+
+# -------------------------------------------------
+# Writes
+# -------------------------------------------------
+def bump():
+    """Mark the index as changed. Call inside the write transaction."""
+    return bump_version(DUPLICATES_VERSION_KEY)
+
+
+def _apply(version, mutate):
+    global _version
+    with _lock:
+        if _signatures is None:
+            return
+        if _version is None or version != _version + 1:
+            # Someone else wrote in between; catch up on next read
+            _version = None
+            return
+        mutate()
+        _version = version
+        remember_version(DUPLICATES_VERSION_KEY, version)
+
+
+def add_request(request_id, title, sig, version):
+    """Index a committed, newly opened request."""
+    def mutate():
+        if sig is not None:
+            _index(_signatures, _buckets, request_id, sig, title)
+    _apply(version, mutate)
+
+
+def remove_request(request_id, version):
+    """Drop a committed solved / closed request."""
+    def mutate():
+        _unindex(_signatures, _buckets, request_id)
+    _apply(version, mutate)
+
+
+# -------------------------------------------------
+# Startup
+# -------------------------------------------------
+def init_app(app):
+    # First request of each worker kicks off the load (not create_app: that
+    # also runs for `flask db upgrade` and in a pre-fork master)
+    @app.before_request
+    def _warm_duplicate_index():
+        if _signatures is None:
+            warm()
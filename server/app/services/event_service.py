@@ -0,0 +1,79 @@
+import queue
+import threading
+from app.extensions import db
+from app.models.cache_version import CacheVersion
+from app.services.version_service import bump_version
+
+# -------------------------------------------------
+# Per-user event channels (in-process pub/sub)
+# -------------------------------------------------
+# Every open push stream owns a small queue. Publishers only drop a tiny
+# event into the queues of the target user, so a write costs nothing when
+# that user has no stream open.
+#
+# ⚠️ Channels live inside one worker process. The cross-worker signal is
+# the user's unread marker: writers call mark_unread_changed() inside their
+# transaction, which bumps a per-user row in `cache_version`. Polls answer
+# 304 while it is unchanged, and open streams re-read it every few seconds
+# (one primary-key lookup) to pick up events published on other workers.
+
+MAX_PENDING_EVENTS = 50
+UNREAD_KEY_PREFIX = "unread:"
+
+_subscribers = {}  # user_id -> set of queue.Queue
+_lock = threading.Lock()
+
+
+def subscribe(user_id):
+    """Open a channel for user_id and return the queue events arrive on."""
+    channel = queue.Queue(maxsize=MAX_PENDING_EVENTS)
+    with _lock:
+        _subscribers.setdefault(user_id, set()).add(channel)
+    return channel
+
+
+def unsubscribe(user_id, channel):
+    with _lock:
+        channels = _subscribers.get(user_id)
+        if not channels:
+            return
+        channels.discard(channel)
+        if not channels:
+            del _subscribers[user_id]
+
+
+def publish(user_id, event, data=None):
+    """
+    Push an event to every open channel of user_id.
+    Never blocks: a full queue means the stream is already behind and will
+    recount on its next wake-up anyway, so the event is simply dropped.
+    """
+    with _lock:
+        channels = list(_subscribers.get(user_id, ()))
+
+    for channel in channels:
+        try:
+            channel.put_nowait({"event": event, "data": data})
+        except queue.Full:
+            pass
+
+    return len(channels)
+
+
+def mark_unread_changed(user_id):
+    """Bump user_id's unread marker. Call inside the write transaction."""
+    return bump_version(f"{UNREAD_KEY_PREFIX}{user_id}")
+
+
+def unread_marker(user_id):
+    """
+    Current unread marker of user_id (0 if it never changed). Read directly,
+    not through get_version(): one cached entry per user would never shrink.
+    """
+    return db.session.query(CacheVersion.version) \
+        .filter_by(key=f"{UNREAD_KEY_PREFIX}{user_id}").scalar() or 0
+
+
+def subscriber_count():
+    with _lock:
+        return sum(len(c) for c in _subscribers.values())
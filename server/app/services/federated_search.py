@@ -0,0 +1,264 @@
+import re
+import time
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from sqlalchemy import case, column, false, or_, text
+from app.extensions import db
+from app.models.post import Post
+from app.models.team import Team
+from app.models.help_request import HelpRequest
+from app.services.user_search import search_users, fts_query
+from app.utils import io_pool
+
+# -------------------------------------------------
+# Federated search (/api/search/all)
+# -------------------------------------------------
+# One query per entity type. Each section is ranked by its own index
+# (user_search for people, title-first matching for the rest), then every
+# hit gets a lexical score in [0, 1] so results of different types can be
+# merged into one "top" list.
+#
+# Posts, teams and help requests are filtered through their search indexes
+# (migration a4e7c9f2d153): pg_trgm GIN indexes serve the ILIKE on
+# PostgreSQL, the post_search / team_search / help_search FTS5 tables on
+# SQLite. Without the migration it falls back to plain ILIKE.
+#
+# Sections run in PARALLEL_LANES lanes: the request thread runs one lane
+# itself and the rest go to the shared I/O pool, so a search holds at most
+# one extra DB connection (the pool is only 3 + 2 overflow). Every lane
+# shares one deadline; sections that didn't finish in time report "timeout".
+#
+# Cursors are per section (an offset into that section's ranking), so the
+# client can page people without re-running posts, teams and help requests.
+
+SECTIONS = ("users", "posts", "teams", "help")
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+TOP_LIMIT = 8
+SEARCH_TIMEOUT_SECONDS = 3   # for the whole search, not per section
+PARALLEL_LANES = 2           # request thread + one I/O pool task
+SNIPPET_LENGTH = 160
+
+# table -> FTS5 table (SQLite only, rowid = primary key)
+FTS_TABLES = {"post": "post_search", "team": "team_search", "help_request": "help_search"}
+
+_fts_available = None
+_lock = threading.Lock()
+
+
+def _escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def lexical_score(term, primary, secondary=None):
+    """
+    1.0 exact, 0.85 prefix, 0.7 word prefix, 0.5 substring of the primary
+    field; 0.3 if only the secondary field matches.
+    """
+    term = term.lower()
+    primary = (primary or "").lower()
+    if primary == term:
+        return 1.0
+    if primary.startswith(term):
+        return 0.85
+    if re.search(r"\b" + re.escape(term), primary):
+        return 0.7
+    if term in primary:
+        return 0.5
+    if secondary and term in secondary.lower():
+        return 0.3
+    return 0.1
+
+
+def _snippet(text):
+    if not text:
+        return None
+    return text if len(text) <= SNIPPET_LENGTH else text[:SNIPPET_LENGTH].rstrip() + "…"
+
+
+def _use_fts():
+    global _fts_available
+    if _fts_available is None:
+        with _lock:
+            if _fts_available is None:
+                _fts_available = db.session.get_bind().dialect.name == "sqlite" and all(
+                    db.session.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                        {"name": name}
+                    ).scalar()
+                    for name in FTS_TABLES.values()
+                )
+    return _fts_available
+
+
+def _title_first(query, model, term, title_column, other_columns):
+    """Filter on any column, rank title prefix > title substring > other."""
+    pattern = f"%{_escape_like(term)}%"
+    prefix = f"{_escape_like(term)}%"
+    if _use_fts():
+        match = fts_query(term, [title_column.key] + [c.key for c in other_columns])
+        if match is None:
+            return query.filter(false())
+        fts = FTS_TABLES[model.__table__.name]
+        query = query.filter(model.id.in_(
+            text(f"SELECT rowid FROM {fts} WHERE {fts} MATCH :match")
+            .bindparams(match=match).columns(column("rowid"))
+        ))
+    else:
+        query = query.filter(or_(
+            title_column.ilike(pattern, escape="\\"),
+            *[c.ilike(pattern, escape="\\") for c in other_columns]
+        ))
+    return query.order_by(case(
+        (title_column.ilike(prefix, escape="\\"), 0),
+        (title_column.ilike(pattern, escape="\\"), 1),
+        else_=2
+    ))
+
+
+# -------------------------------------------------
+# Sections (run by _run_lane, on the request thread or the I/O pool)
+# -------------------------------------------------
+def _search_users(term, offset, limit, viewer_id):
+    users = search_users(term, fields=("full_name", "email", "skills"), limit=limit + 1,
+                         exclude_id=viewer_id, offset=offset)
+    return [
+        {
+            "type": "user",
+            "id": u.id,
+            "full_name": u.full_name,
+            "profile_pic_url": getattr(u, "profile_pic", None),
+            "location": u.location,
+            "score": lexical_score(term, u.full_name, u.skills)
+        }
+        for u in users
+    ]
+
+
+def _search_posts(term, offset, limit, viewer_id):
+    query = _title_first(Post.query, Post, term, Post.title, [Post.description])
+    posts = query.order_by(Post.timestamp.desc(), Post.id.desc()).offset(offset).limit(limit + 1).all()
+    return [
+        {
+            "type": "post",
+            "id": p.id,
+            "title": p.title,
+            "snippet": _snippet(p.description),
+            "author_id": p.user_id,
+            "timestamp": p.timestamp.isoformat() if p.timestamp else None,
+            "score": lexical_score(term, p.title, p.description)
+        }
+        for p in posts
+    ]
+
+
+def _search_teams(term, offset, limit, viewer_id):
+    query = _title_first(Team.query.filter(Team.privacy == "public"), Team, term,
+                         Team.name, [Team.hiring_requirements])
+    teams = query.order_by(Team.is_hiring.desc(), Team.id.desc()).offset(offset).limit(limit + 1).all()
+    return [
+        {
+            "type": "team",
+            "id": t.id,
+            "name": t.name,
+            "profile_pic": t.profile_pic,
+            "is_hiring": t.is_hiring,
+            "hiring_requirements": _snippet(t.hiring_requirements),
+            "score": lexical_score(term, t.name, t.hiring_requirements)
+        }
+        for t in teams
+    ]
+
+
+def _search_help(term, offset, limit, viewer_id):
+    query = _title_first(HelpRequest.query.filter(HelpRequest.status == "open"), HelpRequest, term,
+                         HelpRequest.title, [HelpRequest.tags])
+    requests = query.order_by(HelpRequest.created_at.desc(), HelpRequest.id.desc()) \
+        .offset(offset).limit(limit + 1).all()
+    return [
+        {
+            "type": "help",
+            "id": r.id,
+            "title": r.title,
+            "tags": [t.strip() for t in (r.tags or "").split(",") if t.strip()],
+            "status": r.status,
+            "created_at": r.created_at.isoformat() if r.created_at else None,
+            "score": lexical_score(term, r.title, r.tags)
+        }
+        for r in requests
+    ]
+
+
+_SEARCHERS = {
+    "users": _search_users,
+    "posts": _search_posts,
+    "teams": _search_teams,
+    "help": _search_help
+}
+
+
+def _run_lane(names, term, cursors, limit, viewer_id, deadline, found):
+    """Run `names` one after another into `found` (items or the exception)."""
+    for name in names:
+        if time.monotonic() >= deadline:
+            return
+        try:
+            found[name] = _SEARCHERS[name](term, cursors.get(name, 0), limit, viewer_id)
+        except Exception as e:
+            print(f"❌ Search[{name}]: {e}")
+            db.session.rollback()   # a failed statement must not poison the next section
+            found[name] = e
+
+
+def search_all(term, viewer_id, sections=SECTIONS, cursors=None, limit=DEFAULT_LIMIT):
+    """
+    {"sections": {name: {"items", "next_cursor", "has_more"}}, "top": [...]}
+    cursors: {section: offset} from a previous response.
+    """
+    cursors = cursors or {}
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    deadline = time.monotonic() + SEARCH_TIMEOUT_SECONDS
+    sections = list(sections)
+    lanes = [sections[i::PARALLEL_LANES] for i in range(PARALLEL_LANES)]
+    found = {}
+
+    futures = [
+        io_pool.submit(_run_lane, lane, term, cursors, limit, viewer_id, deadline, found)
+        for lane in lanes[1:] if lane
+    ]
+    _run_lane(lanes[0], term, cursors, limit, viewer_id, deadline, found)
+    for future in futures:
+        try:
+            future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeout:
+            pass
+
+    results = {}
+    for name in sections:
+        offset = cursors.get(name, 0)
+        items = found.get(name)
+        if items is None:
+            print(f"⚠️ Search[{name}]: timed out")
+            results[name] = {"items": [], "next_cursor": None, "has_more": False, "error": "timeout"}
+            continue
+        if isinstance(items, Exception):
+            results[name] = {"items": [], "next_cursor": None, "has_more": False, "error": "failed"}
+            continue
+
+        has_more = len(items) > limit
+        results[name] = {
+            "items": items[:limit],
+            "next_cursor": offset + limit if has_more else None,
+            "has_more": has_more
+        }
+
+    # Best hits across every type (first pages only)
+    top = sorted(
+        (item for name, section in results.items() if not cursors.get(name)
+         for item in section["items"]),
+        key=lambda item: item["score"],
+        reverse=True
+    )[:TOP_LIMIT]
+
+    return {"sections": results, "top": top}
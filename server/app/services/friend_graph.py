@@ -0,0 +1,184 @@
+import sys
+import heapq
+from collections import Counter
+import threading
+from app.extensions import db
+from app.models.associations import friendships, ordered_pair
+from app.services.version_service import bump_version, get_version, remember_version
+from app.services.counter_service import adjust_friend_count
+
+# -------------------------------------------------
+# In-memory friendship graph (per worker)
+# -------------------------------------------------
+# "Are A and B friends?" used to be a SQL query in every controller. The whole
+# adjacency list is small (ids only), so each worker loads it once and answers
+# membership / count / id-list questions from memory.
+#
+# Freshness: writers call bump() inside their transaction and link()/unlink()
+# after committing. Other workers notice the new version within
+# VERSION_CHECK_SECONDS and rebuild lazily on their next read.
+#
+# That lag is fine for listing and ranking, not for deciding who may do
+# what: authorization and write paths use are_friends_now() instead.
+
+GRAPH_VERSION_KEY = "friend_graph"
+
+_adjacency = None   # user_id -> set of friend ids
+_version = None
+_lock = threading.RLock()
+
+_EMPTY = frozenset()
+
+
+def _load():
+    # One row per pair (user_id < friend_id): add both directions here
+    adjacency = {}
+    rows = db.session.query(friendships.c.user_id, friendships.c.friend_id).yield_per(5000)
+    for user_id, friend_id in rows:
+        # Intern ids so both directions share one string object
+        user_id, friend_id = sys.intern(user_id), sys.intern(friend_id)
+        adjacency.setdefault(user_id, set()).add(friend_id)
+        adjacency.setdefault(friend_id, set()).add(user_id)
+    return adjacency
+
+
+def _graph():
+    global _adjacency, _version
+
+    current = get_version(GRAPH_VERSION_KEY)
+    if _adjacency is not None and current == _version:
+        return _adjacency
+
+    with _lock:
+        if _adjacency is None or current != _version:
+            # Read the version first: a write landing mid-load bumps it again
+            # and triggers another rebuild instead of being lost.
+            _adjacency = _load()
+            _version = current
+            print(f"🕸️ Friend graph loaded: {len(_adjacency)} users (v{current})")
+    return _adjacency
+
+
+# -------------------------------------------------
+# Reads
+# -------------------------------------------------
+def are_friends(user_id, other_id):
+    """Cached answer (may lag other workers by a few seconds): listing / ranking only."""
+    return other_id in _graph().get(user_id, _EMPTY)
+
+
+def are_friends_now(user_id, other_id):
+    """Authoritative answer: one primary-key lookup on `friendships`."""
+    low, high = ordered_pair(user_id, other_id)
+    return db.session.query(friendships.c.user_id).filter(
+        friendships.c.user_id == low,
+        friendships.c.friend_id == high
+    ).first() is not None
+
+
+def friend_ids(user_id):
+    """Friend ids of user_id as a frozenset (safe to keep / iterate)."""
+    return frozenset(_graph().get(user_id, _EMPTY))
+
+
+def friend_count(user_id):
+    return len(_graph().get(user_id, _EMPTY))
+
+
+def mutual_count(user_id, other_id):
+    graph = _graph()
+    return len(graph.get(user_id, _EMPTY) & graph.get(other_id, _EMPTY))
+
+
+def most_connected(limit):
+    """[(user_id, friend_count), ...] for the `limit` users with most friends."""
+    graph = _graph()
+    return heapq.nlargest(limit, ((u, len(f)) for u, f in graph.items()), key=lambda x: x[1])
+
+
+def friends_of_friends(user_id, limit=None):
+    """
+    [(candidate_id, mutual_count), ...] for users 2 hops away, most mutual
+    friends first. Existing friends and the user themself are excluded.
+    """
+    return friends_of_friends_in(_graph(), user_id, limit)
+
+
+def friends_of_friends_in(graph, user_id, limit=None):
+    """friends_of_friends() over any {user_id: set of friend ids} adjacency."""
+    friends = graph.get(user_id, _EMPTY)
+    counts = Counter()
+    for friend in friends:
+        counts.update(graph.get(friend, _EMPTY))
+
+    for excluded in friends:
+        counts.pop(excluded, None)
+    counts.pop(user_id, None)
+    return counts.most_common(limit)
+
+
+# -------------------------------------------------
+# Writes (called by the friend controller)
+# -------------------------------------------------
+def bump():
+    """Mark the graph as changed. Call inside the write transaction."""
+    return bump_version(GRAPH_VERSION_KEY)
+
+
+def add_friendship(user_id, other_id):
+    """
+    Store the pair (once), count it on both users and bump the graph
+    version. The caller commits, then calls link() with the returned version.
+    """
+    low, high = ordered_pair(user_id, other_id)
+    exists = db.session.query(friendships.c.user_id).filter(
+        friendships.c.user_id == low,
+        friendships.c.friend_id == high
+    ).first()
+    if not exists:
+        db.session.execute(friendships.insert().values(user_id=low, friend_id=high))
+        adjust_friend_count((low, high), 1)
+    return bump()
+
+
+def remove_friendship(user_id, other_id):
+    """Delete the pair, uncount it and bump the graph version. The caller commits."""
+    low, high = ordered_pair(user_id, other_id)
+    result = db.session.execute(friendships.delete().where(
+        friendships.c.user_id == low,
+        friendships.c.friend_id == high
+    ))
+    if result.rowcount:
+        adjust_friend_count((low, high), -1)
+    return bump()
+
+
+def _apply(version, mutate):
+    global _version
+    with _lock:
+        if _adjacency is None:
+            return
+        if _version is not None and version == _version + 1:
+            mutate(_adjacency)
+            _version = version
+            remember_version(GRAPH_VERSION_KEY, version)
+        else:
+            # Someone else wrote in between; rebuild on next read
+            _version = None
+
+
+def link(user_id, other_id, version):
+    """Apply a committed friendship to the local graph."""
+    def mutate(graph):
+        a, b = sys.intern(user_id), sys.intern(other_id)
+        graph.setdefault(a, set()).add(b)
+        graph.setdefault(b, set()).add(a)
+    _apply(version, mutate)
+
+
+def unlink(user_id, other_id, version):
+    """Apply a committed unfriend to the local graph."""
+    def mutate(graph):
+        graph.get(user_id, set()).discard(other_id)
+        graph.get(other_id, set()).discard(user_id)
+    _apply(version, mutate)
@@ -0,0 +1,90 @@
+from sqlalchemy import select, exists, func
+from app.extensions import db
+from app.models.user import User
+from app.models.friend_request import FriendRequest
+from app.models.associations import friendships, ordered_pair
+
+
+def get_relationship_status(viewer_id, target_id):
+    """
+    Friendship + pending request flags between two users in ONE round trip
+    (a FROM-less SELECT of three scalar subqueries).
+    """
+    status = {
+        "is_friend": False,
+        "request_sent": False,
+        "request_received": False,
+        "request_id": None
+    }
+    if not viewer_id or viewer_id == target_id:
+        return status
+
+    low, high = ordered_pair(viewer_id, target_id)
+    is_friend = exists().where(
+        friendships.c.user_id == low,
+        friendships.c.friend_id == high
+    )
+    sent_id = select(FriendRequest.id).where(
+        FriendRequest.sender_id == viewer_id,
+        FriendRequest.receiver_id == target_id,
+        FriendRequest.status == 'pending'
+    ).limit(1).scalar_subquery()
+    received_id = select(FriendRequest.id).where(
+        FriendRequest.sender_id == target_id,
+        FriendRequest.receiver_id == viewer_id,
+        FriendRequest.status == 'pending'
+    ).limit(1).scalar_subquery()
+
+    row = db.session.execute(
+        select(is_friend.label("is_friend"), sent_id.label("sent_id"), received_id.label("received_id"))
+    ).one()
+
+    status.update({
+        "is_friend": bool(row.is_friend),
+        "request_sent": row.sent_id is not None,
+        "request_received": row.received_id is not None,
+        "request_id": row.received_id
+    })
+    return status
+
+
+def pending_requests(user_id, limit=None, before_id=None):
+    """
+    Pending requests received by user_id, newest first, with the sender's
+    card fields joined in (no per-row User lookup). Requests whose sender was
+    deleted drop out through the inner join.
+    """
+    query = (
+        db.session.query(
+            FriendRequest.id,
+            FriendRequest.status,
+            User.id.label("sender_id"),
+            User.full_name,
+            User.profile_pic
+        )
+        .join(User, User.id == FriendRequest.sender_id)
+        .filter(FriendRequest.receiver_id == user_id, FriendRequest.status == 'pending')
+        .order_by(FriendRequest.id.desc())
+    )
+    if before_id:
+        query = query.filter(FriendRequest.id < before_id)
+    if limit:
+        query = query.limit(limit)
+
+    return [
+        {
+            "id": row.id,
+            "sender_id": row.sender_id,
+            "sender_name": row.full_name,
+            "sender_profile": row.profile_pic,
+            "status": row.status
+        }
+        for row in query
+    ]
+
+
+def pending_count(user_id):
+    return db.session.query(func.count(FriendRequest.id)).filter(
+        FriendRequest.receiver_id == user_id,
+        FriendRequest.status == 'pending'
+    ).scalar()
@@ -0,0 +1,77 @@
+from sqlalchemy import func, select
+from app.extensions import db
+from app.models.user import User
+from app.models.help_request import HelpRequest
+from app.models.help_match import help_matches
+from app.models.skill import user_skills, help_request_tags
+
+# -------------------------------------------------
+# Rescue radar: help request -> matching experts
+# -------------------------------------------------
+# When a request is posted we store, once, every user whose skills overlap
+# its tags (score = number of shared skills). The personalized feed is then
+# a single indexed range scan on (user_id, score, created_at) joined to the
+# request and its author, instead of matching tags per view.
+#
+# Kept current by: request created (index_request), request solved
+# (unindex_request), user skills edited (reindex_user). All run inside the
+# caller's transaction; the caller commits.
+
+FEED_LIMIT = 20
+
+
+def _overlap(request_ids=None, user_id=None):
+    """SELECT user_id, help_request_id, score, created_at for open requests."""
+    query = (
+        select(
+            user_skills.c.user_id,
+            help_request_tags.c.help_request_id,
+            func.count().label("score"),
+            HelpRequest.created_at
+        )
+        .join(help_request_tags, help_request_tags.c.skill_id == user_skills.c.skill_id)
+        .join(HelpRequest, HelpRequest.id == help_request_tags.c.help_request_id)
+        .where(HelpRequest.status == 'open', HelpRequest.user_id != user_skills.c.user_id,
+               HelpRequest.created_at.isnot(None))
+        .group_by(user_skills.c.user_id, help_request_tags.c.help_request_id, HelpRequest.created_at)
+    )
+    if request_ids is not None:
+        query = query.where(help_request_tags.c.help_request_id.in_(request_ids))
+    if user_id is not None:
+        query = query.where(user_skills.c.user_id == user_id)
+    return query
+
+
+def _insert_matches(query):
+    db.session.execute(
+        help_matches.insert().from_select(["user_id", "help_request_id", "score", "created_at"], query)
+    )
+
+
+def index_request(help_request):
+    """Match a new (flushed, tagged) request against every user's skills."""
+    _insert_matches(_overlap(request_ids=[help_request.id]))
+
+
+def unindex_request(request_id):
+    """Request solved/closed: nobody needs to see it any more."""
+    db.session.execute(help_matches.delete().where(help_matches.c.help_request_id == request_id))
+
+
+def reindex_user(user_id):
+    """User's skills changed: recompute their matches over open requests."""
+    db.session.execute(help_matches.delete().where(help_matches.c.user_id == user_id))
+    _insert_matches(_overlap(user_id=user_id))
+
+
+def feed_for(user_id, limit=FEED_LIMIT):
+    """[(HelpRequest, author User)] best matches first, newest first within a score."""
+    return (
+        db.session.query(HelpRequest, User)
+        .join(help_matches, help_matches.c.help_request_id == HelpRequest.id)
+        .join(User, User.id == HelpRequest.user_id)
+        .filter(help_matches.c.user_id == user_id, HelpRequest.status == 'open')
+        .order_by(help_matches.c.score.desc(), help_matches.c.created_at.desc())
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,169 @@
+import atexit
+import queue
+import threading
+import time
+from flask import current_app
+
+# -------------------------------------------------
+# Bounded background job runner
+# -------------------------------------------------
+# Replaces "one new threading.Thread per trigger". A fixed number of worker
+# threads pull keys from a queue; each key has at most ONE pending job, so a
+# user saving their profile five times in a row queues a single recompute
+# (the latest arguments win). The queue itself is bounded so a burst can't
+# pile up unbounded work or DB connections.
+
+DEFAULT_WORKERS = 2        # DB pool is 3 + 2 overflow; leave room for requests
+DEFAULT_MAX_PENDING = 1000
+SHUTDOWN_TIMEOUT_SECONDS = 10
+
+_STOP = object()
+
+
+class JobRunner:
+    def __init__(self, name, max_workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._queue = queue.Queue()
+        self._pending = {}          # key -> (fn, args)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stopping = False
+
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "running": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+            "last_seconds": 0.0
+        }
+
+    # ---------------------------------------------
+    # Public API
+    # ---------------------------------------------
+    def submit(self, key, fn, *args):
+        """
+        Queue fn(*args) under `key`. Returns False if the job was rejected
+        (runner stopping or queue full), True otherwise - including when it
+        was absorbed by an already pending job with the same key.
+        """
+        with self._lock:
+            if self._stopping:
+                self._stats["rejected"] += 1
+                return False
+
+            if key in self._pending:
+                self._pending[key] = (fn, args)
+                self._stats["coalesced"] += 1
+                return True
+
+            if len(self._pending) >= self.max_pending:
+                self._stats["rejected"] += 1
+                print(f"⚠️ Jobs[{self.name}]: queue full ({self.max_pending}), dropping {key!r}")
+                return False
+
+            self._pending[key] = (fn, args)
+            self._stats["submitted"] += 1
+            self._start_workers()
+
+        self._queue.put(key)
+        return True
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["queue_depth"] = len(self._pending)
+            stats["workers"] = len(self._threads)
+        done = stats["completed"] + stats["failed"]
+        stats["avg_seconds"] = stats["total_seconds"] / done if done else 0.0
+        return stats
+
+    def shutdown(self, timeout=SHUTDOWN_TIMEOUT_SECONDS):
+        """Stop accepting jobs, let workers drain the queue, wait up to `timeout`."""
+        with self._lock:
+            if self._stopping:
+                return
+            self._stopping = True
+            threads = list(self._threads)
+
+        for _ in threads:
+            self._queue.put(_STOP)
+
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        leftover = self.stats()["queue_depth"]
+        if leftover:
+            print(f"⚠️ Jobs[{self.name}]: shutdown timed out, {leftover} job(s) dropped")
+
+    # ---------------------------------------------
+    # Internals
+    # ---------------------------------------------
+    def _start_workers(self):
+        # Started lazily (caller holds the lock) so threads are created in the
+        # serving process, not in a pre-fork master.
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._work,
+                name=f"{self.name}-worker-{len(self._threads) + 1}",
+                daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self):
+        while True:
+            key = self._queue.get()
+            if key is _STOP:
+                return
+
+            with self._lock:
+                job = self._pending.pop(key, None)
+                if job is None:
+                    continue
+                self._stats["running"] += 1
+
+            fn, args = job
+            started = time.perf_counter()
+            failed = False
+            try:
+                fn(*args)
+            except Exception as e:
+                failed = True
+                print(f"❌ Jobs[{self.name}]: {key!r} failed: {e}")
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self._stats["running"] -= 1
+                    self._stats["failed" if failed else "completed"] += 1
+                    self._stats["total_seconds"] += elapsed
+                    self._stats["last_seconds"] = elapsed
+                    self._stats["max_seconds"] = max(self._stats["max_seconds"], elapsed)
+
+
+# Shared runner for fire-and-forget work (ML updates, index warm-ups...)
+background_jobs = JobRunner("background")
+
+
+def _run_with_app_context(app, fn, args):
+    with app.app_context():
+        fn(*args)
+
+
+def run_in_background(key, fn, *args):
+    """Queue fn(*args) inside an app context; jobs with the same key coalesce."""
+    app = current_app._get_current_object()
+    return background_jobs.submit(key, _run_with_app_context, app, fn, args)
+
+
+def init_app(app):
+    background_jobs.max_workers = app.config.get("BACKGROUND_JOB_WORKERS", DEFAULT_WORKERS)
+    background_jobs.max_pending = app.config.get("BACKGROUND_JOB_MAX_PENDING", DEFAULT_MAX_PENDING)
+    atexit.register(background_jobs.shutdown)
@@ -0,0 +1,229 @@
+import threading
+from datetime import datetime, timedelta
+from cachetools import LRUCache
+from sortedcontainers import SortedList
+from sqlalchemy import func
+from app.extensions import db
+from app.models.user import User
+from app.models.reputation_event import ReputationEvent
+from app.models.skill import help_request_tags
+from app.services.job_runner import run_in_background
+from app.services.version_service import bump_version, get_version, remember_version
+
+# -------------------------------------------------
+# Reputation leaderboard (per worker)
+# -------------------------------------------------
+# Each board is a SortedList of (-points, user_id) plus a points dict, so
+# "top N", "page M" and "what is my rank?" are O(log n) instead of sorting
+# the user table.
+#
+#   all-time   built from User.reputation_points (indexed, > 0 only)
+#   weekly     built from reputation_event since Monday 00:00 UTC
+#   per-skill  built from reputation_event joined to the request's tags
+#
+# Weekly and per-skill boards are built on first use and kept in a small LRU.
+# Freshness works like friend_graph: award() bumps LEADERBOARD_VERSION_KEY
+# in the write transaction and apply() adds the points to every cached board
+# after commit. Other workers see the new version and rebuild in the
+# background while the old boards keep answering.
+
+LEADERBOARD_VERSION_KEY = "leaderboard"
+MAX_CACHED_BOARDS = 256
+
+WINDOW_ALL = "all"
+WINDOW_WEEK = "week"
+WINDOWS = (WINDOW_ALL, WINDOW_WEEK)
+
+_global = None                                  # all-time board
+_boards = LRUCache(maxsize=MAX_CACHED_BOARDS)   # (since, skill_id) -> _Board
+_version = None
+_rebuilding = False
+_lock = threading.RLock()
+
+
+class _Board:
+    def __init__(self, points):
+        self._points = {user_id: p for user_id, p in points if p and p > 0}
+        self._order = SortedList((-p, user_id) for user_id, p in self._points.items())
+
+    def __len__(self):
+        return len(self._order)
+
+    def add(self, user_id, delta):
+        old = self._points.pop(user_id, 0)
+        if old:
+            self._order.remove((-old, user_id))
+        new = old + delta
+        if new > 0:
+            self._points[user_id] = new
+            self._order.add((-new, user_id))
+
+    def points(self, user_id):
+        return self._points.get(user_id, 0)
+
+    def rank(self, user_id):
+        """1-based rank (ties share a rank), None if the user has no points here."""
+        points = self._points.get(user_id)
+        if not points:
+            return None
+        # (-points,) sorts before every (-points, user_id): counts strictly higher
+        return self._order.bisect_left((-points,)) + 1
+
+    def page(self, offset, limit):
+        """[(rank, user_id, points)] for positions offset .. offset+limit."""
+        return [
+            (self._order.bisect_left((neg,)) + 1, user_id, -neg)
+            for neg, user_id in self._order[offset:offset + limit]
+        ]
+
+
+def week_start(now=None):
+    """Monday 00:00 (UTC) of the current week."""
+    now = now or datetime.utcnow()
+    return datetime(now.year, now.month, now.day) - timedelta(days=now.weekday())
+
+
+# -------------------------------------------------
+# Loading
+# -------------------------------------------------
+def _load_global():
+    rows = db.session.query(User.id, User.reputation_points) \
+        .filter(User.reputation_points > 0).yield_per(5000)
+    return _Board(rows)
+
+
+def _load_board(since, skill_id):
+    query = db.session.query(ReputationEvent.user_id, func.sum(ReputationEvent.points))
+    if skill_id is not None:
+        query = query.join(
+            help_request_tags, help_request_tags.c.help_request_id == ReputationEvent.help_request_id
+        ).filter(help_request_tags.c.skill_id == skill_id)
+    if since is not None:
+        query = query.filter(ReputationEvent.created_at >= since)
+    return _Board(query.group_by(ReputationEvent.user_id).all())
+
+
+def rebuild():
+    """Reload the all-time board and drop the lazily built ones."""
+    global _global, _boards, _version, _rebuilding
+    try:
+        # Read the version first: an award landing mid-load triggers another rebuild
+        version = get_version(LEADERBOARD_VERSION_KEY, max_age=0)
+        board = _load_global()
+        with _lock:
+            _global, _boards, _version = board, LRUCache(maxsize=MAX_CACHED_BOARDS), version
+        print(f"🏆 Leaderboard loaded: {len(board)} ranked users (v{version})")
+    finally:
+        _rebuilding = False
+
+
+def _check_fresh():
+    global _rebuilding
+    if _global is None:
+        with _lock:
+            if _global is None:
+                rebuild()
+        return
+
+    if get_version(LEADERBOARD_VERSION_KEY) != _version and not _rebuilding:
+        _rebuilding = True
+        if not run_in_background(("leaderboard_rebuild",), rebuild):
+            _rebuilding = False
+
+
+def _board(window, skill_id):
+    _check_fresh()
+    since = week_start() if window == WINDOW_WEEK else None
+    if since is None and skill_id is None:
+        return _global
+
+    key = (since, skill_id)
+    with _lock:
+        board = _boards.get(key)
+        version = _version
+    if board is not None:
+        return board
+
+    board = _load_board(since, skill_id)
+    with _lock:
+        # Only cache it if no award was applied while we were loading
+        if _version == version:
+            _boards[key] = board
+    return board
+
+
+# -------------------------------------------------
+# Reads
+# -------------------------------------------------
+def standings(user_id, window=WINDOW_ALL, skill_id=None, offset=0, limit=20):
+    """
+    {"leaders": [(rank, user_id, points)], "total": ranked users,
+     "me": {"rank", "points"}} for one board.
+    """
+    board = _board(window, skill_id)
+    with _lock:
+        return {
+            "leaders": board.page(offset, limit),
+            "total": len(board),
+            "me": {"rank": board.rank(user_id), "points": board.points(user_id)}
+        }
+
+
+# -------------------------------------------------
+# Writes
+# -------------------------------------------------
+def award(user_id, points, reason, help_request_id=None):
+    """
+    Add points to the user's total and log the event. Call inside the write
+    transaction; after committing, pass the returned dict to apply().
+    """
+    db.session.query(User).filter(User.id == user_id).update(
+        {User.reputation_points: func.coalesce(User.reputation_points, 0) + points},
+        synchronize_session=False
+    )
+    event = ReputationEvent(
+        user_id=user_id,
+        points=points,
+        reason=reason,
+        help_request_id=help_request_id,
+        created_at=datetime.utcnow()
+    )
+    db.session.add(event)
+
+    skill_ids = []
+    if help_request_id is not None:
+        skill_ids = [
+            skill_id for (skill_id,) in db.session.query(help_request_tags.c.skill_id)
+            .filter(help_request_tags.c.help_request_id == help_request_id)
+        ]
+
+    return {
+        "user_id": user_id,
+        "points": points,
+        "skill_ids": set(skill_ids),
+        "created_at": event.created_at,
+        "version": bump_version(LEADERBOARD_VERSION_KEY)
+    }
+
+
+def apply(update):
+    """Add a committed award to this worker's boards (O(log n) per board)."""
+    global _version
+    with _lock:
+        if _global is None:
+            return
+        if _version is None or update["version"] != _version + 1:
+            # Someone else wrote in between; rebuild on next read
+            _version = None
+            return
+
+        _global.add(update["user_id"], update["points"])
+        for (since, skill_id), board in _boards.items():
+            if since is not None and update["created_at"] < since:
+                continue
+            if skill_id is not None and skill_id not in update["skill_ids"]:
+                continue
+            board.add(update["user_id"], update["points"])
+
+        _version = update["version"]
+        remember_version(LEADERBOARD_VERSION_KEY, _version)
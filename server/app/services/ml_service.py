@@ -1,77 +1,81 @@
-import threading
-from flask import current_app
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from app.extensions import db
 from app.models.user import User
-from app.models.recommendation import UserRecommendation
+from app.services import friend_graph, recommendation_model, skill_service
+from app.services.social_graph_service import blend_score, SKILL_THRESHOLD, TOP_N
+from app.services.job_runner import run_in_background
+from app.services.recommendation_writer import replace_recommendations
 
-def _run_ml_logic(app, user_id):
-    """The actual heavy math function running in the background."""
-    with app.app_context():
-        try:
-            target_user = User.query.get(user_id)
-            if not target_user or not target_user.skills:
-                return # No skills to compare
+def _run_ml_logic(user_id):
+    """The actual heavy math function (runs on the background job runner)."""
+    try:
+        target_user = User.query.get(user_id)
+        skill_names = skill_service.user_skill_names(user_id) if target_user else []
+        if not skill_names:
+            return # No skills to compare
 
-            # 1. Get all other users
-            friend_ids = [f.id for f in target_user.friends]
-            excluded_ids = set(friend_ids + [target_user.id])
-            potential_users = User.query.filter(User.id.notin_(excluded_ids)).all()
+        # 1. Persisted model (vocabulary + IDF + user matrix, memory-mapped)
+        model = recommendation_model.get_model()
+        if model is None:
+            return
 
-            if not potential_users:
-                return
+        # 2. Re-vectorise ONLY this user with the frozen vocabulary
+        vector = model.update_user(target_user.id, skill_names, target_user.location)
 
-            # 2. Prepare Data
-            target_text = f"{target_user.skills or ''} {target_user.location or ''}"
-            corpus = [f"{u.skills or ''} {u.location or ''}" for u in potential_users]
-            user_ids = [u.id for u in potential_users]
+        # 3. Top-k neighbours: LSH candidates scored exactly (full scan on small builds)
+        excluded_ids = set(friend_graph.friend_ids(target_user.id)) | {target_user.id}
+        neighbours = model.top_k(
+            vector,
+            k=TOP_N * 3,
+            exclude_ids=excluded_ids,
+            threshold=SKILL_THRESHOLD
+        )
 
-            # 3. TF-IDF & Math
-            vectorizer = TfidfVectorizer(stop_words="english")
-            all_text = [target_text] + corpus
-            tfidf_matrix = vectorizer.fit_transform(all_text)
-            
-            similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
+        # 4. Skill Matches (Threshold > 30% match)
+        skill_scores = dict(neighbours)
 
-            # 4. Filter Top 10 Matches (Threshold > 30% match)
-            suggestions = []
-            for i, score in enumerate(similarities):
-                if score >= 0.30: 
-                    suggestions.append({"id": user_ids[i], "score": float(score)})
+        # 5. Blend with friends-of-friends (mutual counts from the in-memory graph)
+        mutual_counts = dict(friend_graph.friends_of_friends(user_id, limit=TOP_N * 3))
+        candidates = set(skill_scores) | set(mutual_counts)
 
-            # Sort by highest score and keep top 10
-            suggestions.sort(key=lambda x: x["score"], reverse=True)
-            top_10 = suggestions[:10]
+        suggestions = [
+            {
+                "id": c,
+                "score": blend_score(skill_scores.get(c), mutual_counts.get(c, 0)),
+                "skill_score": skill_scores.get(c),
+                "mutual_count": mutual_counts.get(c, 0)
+            }
+            for c in candidates
+        ]
 
-            if not top_10:
-                return
+        # Sort by highest score and keep top 10
+        suggestions.sort(key=lambda x: x["score"], reverse=True)
+        top_10 = suggestions[:TOP_N]
 
-            # 5. Database Transaction (Atomic replacement)
-            # Delete old recommendations
-            UserRecommendation.query.filter_by(user_id=user_id).delete()
-            
-            # Insert new ones
-            for rec in top_10:
-                new_rec = UserRecommendation(
-                    user_id=user_id,
-                    recommended_user_id=rec["id"],
-                    score=rec["score"]
-                )
-                db.session.add(new_rec)
-            
-            db.session.commit()
-            print(f"✅ ML Engine: Updated {len(top_10)} recommendations for {target_user.full_name}")
+        if not top_10:
+            return
 
-        except Exception as e:
-            db.session.rollback()
-            print(f"❌ ML Engine Error: {str(e)}")
+        # 6. Database Transaction (Atomic replacement: upsert + drop stale rows)
+        replace_recommendations([user_id], [
+            {
+                "user_id": user_id,
+                "recommended_user_id": rec["id"],
+                "score": rec["score"],
+                "skill_score": rec["skill_score"],
+                "mutual_count": rec["mutual_count"]
+            }
+            for rec in top_10
+        ])
+        db.session.commit()
+        print(f"✅ ML Engine: Updated {len(top_10)} recommendations for {target_user.full_name}")
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ ML Engine Error: {str(e)}")
 
 def trigger_ml_update_for_user(user_id):
     """
-    Spins up a silent background thread so the API response isn't delayed.
-    This bypasses Render's timeout limits.
+    Queues the recompute on the shared bounded job runner so the API
+    response isn't delayed. Repeated saves while a job is still pending
+    collapse into that single job.
     """
-    app = current_app._get_current_object()
-    thread = threading.Thread(target=_run_ml_logic, args=(app, user_id))
-    thread.start()
\ No newline at end of file
+    run_in_background(("ml_update", user_id), _run_ml_logic, user_id)
@@ -1,6 +1,7 @@
 from datetime import datetime
 from app.extensions import db
 from app.models.notification import Notification
+from app.services.event_service import publish, mark_unread_changed
 
 def notify(user_or_id, message, link):
     """
@@ -26,7 +27,11 @@ def notify(user_or_id, message, link):
         )
         
         db.session.add(new_notification)
+        mark_unread_changed(user_id)
         db.session.commit()
+
+        # 🔔 Wake up any open push stream of this user (no-op if none)
+        publish(user_id, "notification", {"id": new_notification.id})
         return True
         
     except Exception as e:
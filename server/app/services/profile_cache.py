@@ -0,0 +1,46 @@
+from app.extensions import db
+from app.models.user import User
+from app.utils.ttl_cache import LoadingCache
+
+# -------------------------------------------------
+# Versioned profile cache (per worker)
+# -------------------------------------------------
+# The viewer-independent part of a profile (fields, counters, active help
+# request) is cached under (user_id, user.profile_version). Every write that
+# changes what a profile shows bumps profile_version in its own transaction,
+# so the next view misses and rebuilds: no cross-worker invalidation needed,
+# and the version is read from the User row the view loads anyway.
+#
+# Bumped by: profile edits, post create/delete and friend add/remove (via
+# counter_service), help request create / accept (owner and solver).
+# Viewer-specific flags (friendship, privacy) are never cached.
+
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_MAX_ENTRIES = 4096
+
+profile_cache = LoadingCache("profile", maxsize=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS)
+
+
+def bump(*user_ids):
+    """profile_version += 1 for each user. Call inside the write transaction."""
+    db.session.query(User).filter(User.id.in_(user_ids)).update(
+        {User.profile_version: User.profile_version + 1},
+        synchronize_session=False
+    )
+
+
+def get_profile(user, loader):
+    """
+    Cached loader(user) for the user's current profile_version.
+    Entries are shared: callers must copy before adding per-viewer keys.
+    """
+    return profile_cache.get_or_load((user.id, user.profile_version or 0), lambda: loader(user))
+
+
+def init_app(app):
+    global profile_cache
+    profile_cache = LoadingCache(
+        "profile",
+        maxsize=app.config.get("PROFILE_CACHE_SIZE", DEFAULT_MAX_ENTRIES),
+        ttl=app.config.get("PROFILE_CACHE_TTL", DEFAULT_TTL_SECONDS)
+    )
@@ -0,0 +1,175 @@
+import random
+import time
+import tracemalloc
+import numpy as np
+from app.extensions import db
+from app.models.associations import friendships
+from app.services.ann_index import LSHIndex
+from app.services.friend_graph import friends_of_friends_in
+from app.services.recommendation_model import iter_user_docs, fit_matrix
+from app.services.social_graph_service import blend_score, SKILL_THRESHOLD, TOP_N
+
+# -------------------------------------------------
+# Offline evaluation of the recommender
+# -------------------------------------------------
+# Link prediction on the current data: hide a random fraction of the
+# friendships, rebuild every signal from what is left, and check how many
+# hidden friends each scorer puts in its top k.
+#
+#   tfidf        skill similarity only, exact scan (production threshold)
+#   ann          skill similarity over the LSH candidates only
+#   mutual       friends-of-friends count only
+#   blended      what ml_service writes for small builds (exact tfidf + mutual)
+#   ann_blended  what ml_service writes once the build has an LSH index
+#
+# The LSH index is always built here, whatever RECOMMENDER_ANN_MIN_USERS
+# says, so both paths can be compared on any dataset. Nothing is written to
+# the database or the model directory.
+
+SCORERS = ("tfidf", "ann", "mutual", "blended", "ann_blended")
+
+
+def _split_friendships(hide_fraction, rng):
+    pairs = list(db.session.query(friendships.c.user_id, friendships.c.friend_id))
+    rng.shuffle(pairs)
+    cut = int(len(pairs) * hide_fraction)
+
+    train, hidden = {}, {}
+    for i, (a, b) in enumerate(pairs):
+        target = hidden if i < cut else train
+        target.setdefault(a, set()).add(b)
+        target.setdefault(b, set()).add(a)
+    return train, hidden, len(pairs)
+
+
+def _skill_candidates(user_ids, rows, scores, limit):
+    """{user_id: score} for the best `limit` of `scores` (aligned with `rows`)."""
+    if not len(rows):
+        return {}
+    limit = min(limit, len(rows))
+    best = np.argpartition(-scores, limit - 1)[:limit]
+    return {user_ids[rows[i]]: float(scores[i]) for i in best if scores[i] >= SKILL_THRESHOLD}
+
+
+def _ranked(scores, k):
+    return [c for c, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]]
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def evaluate(hide_fraction=0.2, k=10, sample=500, seed=42, log=print):
+    """Precision@k / recall@k per scorer plus build time, latency and peak memory."""
+    rng = random.Random(seed)
+    train, hidden, total_pairs = _split_friendships(hide_fraction, rng)
+
+    # Build (same fit as production, kept in memory)
+    tracemalloc.start()
+    started = time.perf_counter()
+    user_ids, docs = [], []
+    for user_id, doc in iter_user_docs():
+        user_ids.append(user_id)
+        docs.append(doc)
+    try:
+        vectorizer, matrix = fit_matrix(docs)
+    except ValueError:
+        tracemalloc.stop()
+        log("⚠️ Evaluation: empty vocabulary, nothing to evaluate")
+        return None
+    build_seconds = time.perf_counter() - started
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    started = time.perf_counter()
+    index = LSHIndex.build(matrix, seed=seed)
+    index_seconds = time.perf_counter() - started
+
+    row_of = {uid: i for i, uid in enumerate(user_ids)}
+    eval_users = [u for u in hidden if u in row_of]
+    rng.shuffle(eval_users)
+    eval_users = eval_users[:sample]
+
+    hits = {name: [] for name in SCORERS}
+    recalls = {name: [] for name in SCORERS}
+    latency_ms, ann_latency_ms = [], []
+
+    for user_id in eval_users:
+        row = row_of[user_id]
+        known = train.get(user_id, set())
+        excluded = [row] + [row_of[other] for other in known if other in row_of]
+        truth = hidden[user_id]
+
+        started = time.perf_counter()
+        # Same work as a single-user update: re-vectorise, score, blend
+        vector = vectorizer.transform([docs[row]]).tocsr()
+        scores = np.asarray((matrix @ vector.T).todense(), dtype=np.float32).ravel()
+        scores[excluded] = -1.0
+        skill = _skill_candidates(user_ids, np.arange(len(scores)), scores, TOP_N * 3)
+        mutual = dict(friends_of_friends_in(train, user_id, TOP_N * 3))
+        blended = {
+            c: blend_score(skill.get(c), mutual.get(c, 0))
+            for c in set(skill) | set(mutual)
+        }
+        latency_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        # Same again, scoring only the LSH candidates
+        vector = vectorizer.transform([docs[row]]).tocsr()
+        rows = index.candidates(vector)
+        ann_scores = np.asarray((matrix[rows] @ vector.T).todense(), dtype=np.float32).ravel()
+        ann_scores[np.isin(rows, excluded)] = -1.0
+        ann = _skill_candidates(user_ids, rows, ann_scores, TOP_N * 3)
+        ann_blended = {
+            c: blend_score(ann.get(c), mutual.get(c, 0))
+            for c in set(ann) | set(mutual)
+        }
+        ann_latency_ms.append((time.perf_counter() - started) * 1000)
+
+        for name, candidate_scores in (
+            ("tfidf", skill), ("ann", ann), ("mutual", mutual),
+            ("blended", blended), ("ann_blended", ann_blended)
+        ):
+            top = _ranked(candidate_scores, k)
+            found = sum(1 for c in top if c in truth)
+            hits[name].append(found / k)
+            recalls[name].append(found / len(truth))
+
+    _, eval_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    report = {
+        "friendships": total_pairs,
+        "hidden": sum(len(v) for v in hidden.values()) // 2,
+        "users": len(user_ids),
+        "evaluated": len(eval_users),
+        "k": k,
+        "build_seconds": build_seconds,
+        "build_peak_mb": build_peak / 2 ** 20,
+        "index_seconds": index_seconds,
+        "index_bits": index.bits,
+        "eval_peak_mb": eval_peak / 2 ** 20,
+        "update_ms_p50": _percentile(latency_ms, 50),
+        "update_ms_p95": _percentile(latency_ms, 95),
+        "ann_update_ms_p50": _percentile(ann_latency_ms, 50),
+        "ann_update_ms_p95": _percentile(ann_latency_ms, 95),
+        "scorers": {
+            name: {
+                "precision": float(np.mean(hits[name])) if hits[name] else 0.0,
+                "recall": float(np.mean(recalls[name])) if recalls[name] else 0.0
+            }
+            for name in SCORERS
+        }
+    }
+
+    log(f"📊 {report['evaluated']} users evaluated, {report['hidden']}/{report['friendships']} "
+        f"friendships hidden, {report['users']} users in the model")
+    for name in SCORERS:
+        m = report["scorers"][name]
+        log(f"   {name:<12} precision@{k} {m['precision']:.3f}   recall@{k} {m['recall']:.3f}")
+    log(f"⏱️ build {report['build_seconds']:.2f}s (peak {report['build_peak_mb']:.1f} MB) | "
+        f"update p50 {report['update_ms_p50']:.2f} ms, p95 {report['update_ms_p95']:.2f} ms "
+        f"(peak {report['eval_peak_mb']:.1f} MB)")
+    log(f"🧭 LSH {index.tables}×{index.bits} bits built in {report['index_seconds']:.2f}s | "
+        f"update p50 {report['ann_update_ms_p50']:.2f} ms, p95 {report['ann_update_ms_p95']:.2f} ms")
+    return report
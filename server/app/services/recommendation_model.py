@@ -0,0 +1,403 @@
+import os
+import json
+import time
+import shutil
+import threading
+from collections import OrderedDict
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from flask import current_app
+from sklearn.feature_extraction.text import TfidfVectorizer
+from app.extensions import db
+from app.models.user import User
+from app.services.ann_index import LSHIndex, MIN_USERS
+from app.services.job_runner import run_in_background
+from app.services.skill_service import skill_names_by_user, skill_token
+
+# -------------------------------------------------
+# Persistent TF-IDF recommendation model
+# -------------------------------------------------
+# A refit streams every user once, fits the vocabulary + IDF and stores the
+# L2-normalised user×term matrix as raw .npy arrays (CSR parts), which every
+# worker memory-maps instead of holding its own copy:
+#
+#   <RECOMMENDER_MODEL_DIR>/
+#       current.json            -> {"build_id": ..., "built_at": ...}
+#       <build_id>/vectorizer.joblib, data.npy, indices.npy, indptr.npy, user_ids.npy
+#       <build_id>/lsh_*.npy    (ANN index, see ann_index.py)
+#
+# A profile save only transforms ONE row with the frozen vocabulary and scores
+# it against the LSH candidates (or the whole matrix for small builds). Vocabulary drift and new
+# users are picked up by the next refit.
+#
+# Refits never run inside a request. When a worker finds no build (fresh
+# deploy), an old-format one, or one older than RECOMMENDER_REFIT_HOURS, it
+# queues ONE fit on the background job runner; the refit.lock file in the
+# model directory keeps the other workers from starting their own. Set
+# RECOMMENDER_AUTO_REFIT=0 to leave refits to `flask recommend refit` (cron).
+
+POINTER_FILE = "current.json"
+REFIT_LOCK_FILE = "refit.lock"
+REFIT_LOCK_SECONDS = 900     # a lock this old is abandoned (crash) or a failed fit's cool-down
+MODEL_FORMAT = 2             # 2: documents built from normalized skill tokens
+RELOAD_CHECK_SECONDS = 30
+KEEP_BUILDS = 2
+MAX_FRESH_ROWS = 5000        # re-vectorised users kept per worker until the next build
+
+_model = None
+_checked_at = 0.0
+_refit_queued = False
+_lock = threading.RLock()
+
+
+def user_text(skill_names, location):
+    """
+    The document we vectorize for a user: one token per normalized skill
+    (so "machine learning" / "node.js" stay whole) plus the location words.
+    """
+    return " ".join([skill_token(name) for name in skill_names or ()] + [location or ""])
+
+
+def _model_dir():
+    return current_app.config.get("RECOMMENDER_MODEL_DIR") or os.path.join(
+        current_app.instance_path, "recommender"
+    )
+
+
+class RecommendationModel:
+    def __init__(self, build_id, built_at, vectorizer, matrix, user_ids, build_dir=None, index=None):
+        self.build_id = build_id
+        self.build_dir = build_dir    # where the .npy parts live (for batch jobs)
+        self.built_at = built_at
+        self.vectorizer = vectorizer
+        self.matrix = matrix          # CSR, rows L2-normalised, memory-mapped
+        self.user_ids = user_ids      # row -> user id (memory-mapped 'U36')
+        self.index = index            # LSHIndex or None (small builds)
+        self.row_of = {str(uid): i for i, uid in enumerate(user_ids)}
+        # Rows re-vectorised since the build (this worker only, oldest evicted
+        # first: an evicted user falls back to their row in the build)
+        self._fresh_rows = OrderedDict()
+        self._fresh = None            # stacked (matrix rows, CSR, LSH codes), rebuilt lazily
+
+    @property
+    def size(self):
+        return self.matrix.shape[0]
+
+    def vectorize(self, skill_names, location):
+        return self.vectorizer.transform([user_text(skill_names, location)]).tocsr()
+
+    def update_user(self, user_id, skill_names, location):
+        """Re-vectorise one user with the frozen vocabulary."""
+        vector = self.vectorize(skill_names, location)
+        self._fresh_rows.pop(user_id, None)
+        self._fresh_rows[user_id] = vector
+        while len(self._fresh_rows) > MAX_FRESH_ROWS:
+            self._fresh_rows.popitem(last=False)
+        self._fresh = None
+        return vector
+
+    def _fresh_block(self):
+        """
+        (sorted matrix rows, CSR of their fresh vectors, LSH codes or None) for
+        the re-vectorised users that have a row in this build, or None.
+        Stacked once per change so a query scores them with one product.
+        """
+        fresh = self._fresh
+        if fresh is None:
+            pairs = sorted(
+                (self.row_of[u], v) for u, v in list(self._fresh_rows.items()) if u in self.row_of
+            )
+            if not pairs:
+                fresh = ()
+            else:
+                rows = np.array([row for row, _ in pairs], dtype=np.int64)
+                stacked = sp.vstack([v for _, v in pairs], format="csr")
+                codes = self.index.hash(stacked) if self.index is not None else None
+                fresh = (rows, stacked, codes)
+            self._fresh = fresh
+        return fresh or None
+
+    def row_vector(self, user_id):
+        if user_id in self._fresh_rows:
+            return self._fresh_rows[user_id]
+        row = self.row_of.get(user_id)
+        return None if row is None else self.matrix[row]
+
+    def scores(self, vector, rows=None):
+        """Cosine similarity of `vector` with every user, or only `rows` (float32)."""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        scores = np.asarray((matrix @ vector.T).todense(), dtype=np.float32).ravel()
+
+        # Patch in rows this worker re-vectorised after the build (one product)
+        fresh = self._fresh_block()
+        if fresh is None or not len(scores):
+            return scores
+        fresh_rows, stacked, _ = fresh
+        fresh_scores = np.asarray((stacked @ vector.T).todense(), dtype=np.float32).ravel()
+        if rows is None:
+            scores[fresh_rows] = fresh_scores
+        else:
+            # `rows` is sorted: locate the fresh rows that are part of it
+            at = np.minimum(np.searchsorted(rows, fresh_rows), len(rows) - 1)
+            present = rows[at] == fresh_rows
+            scores[at[present]] = fresh_scores[present]
+        return scores
+
+    def top_k(self, vector, k, exclude_ids=(), threshold=0.0, exact=False):
+        """
+        [(user_id, score), ...] best first, score >= threshold. Uses the LSH
+        index when the build has one (exact=True forces a full scan).
+        """
+        if vector.nnz == 0 or self.size == 0:
+            return []
+
+        if exact or self.index is None:
+            rows = np.arange(self.size)
+            scores = self.scores(vector)
+        else:
+            # Candidates from the index + re-vectorised rows whose NEW vector
+            # lands in one of the probed buckets
+            keys = self.index.probe_keys(vector)
+            rows = self.index.candidates(vector, keys=keys).astype(np.int64)
+            fresh = self._fresh_block()
+            if fresh is not None:
+                fresh_rows, _, codes = fresh
+                rows = np.union1d(rows, fresh_rows[self.index.matches(codes, keys)])
+            if not len(rows):
+                return []
+            scores = self.scores(vector, rows)
+
+        excluded = [self.row_of[u] for u in exclude_ids if u in self.row_of]
+        if excluded:
+            scores[np.isin(rows, excluded)] = -1.0
+
+        k = min(k, len(rows))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            (str(self.user_ids[rows[i]]), float(scores[i]))
+            for i in best
+            if scores[i] >= threshold and scores[i] > 0
+        ]
+
+
+# -------------------------------------------------
+# Build / persist
+# -------------------------------------------------
+def iter_user_docs(batch_size=5000):
+    skills = skill_names_by_user()
+    query = db.session.query(User.id, User.location).order_by(User.id).yield_per(batch_size)
+    for user_id, location in query:
+        yield user_id, user_text(skills.get(user_id), location)
+
+
+def fit_matrix(docs):
+    """
+    Fit vocabulary + IDF on `docs`. Returns (vectorizer, CSR matrix with
+    L2-normalised rows). Raises ValueError if the vocabulary is empty.
+    """
+    # Skills arrive as curated single tokens: keep one-letter ones ("c", "r")
+    # and don't stop-word them ("go")
+    vectorizer = TfidfVectorizer(token_pattern=r"(?u)\b\w+\b", dtype=np.float32)
+    matrix = vectorizer.fit_transform(docs).tocsr()
+    return vectorizer, matrix
+
+
+def fit_model(model_dir=None, log=print):
+    """Full refit over every user. Returns the new RecommendationModel."""
+    model_dir = model_dir or _model_dir()
+    started = time.perf_counter()
+
+    user_ids, docs = [], []
+    for user_id, doc in iter_user_docs():
+        user_ids.append(user_id)
+        docs.append(doc)
+
+    if not docs:
+        log("⚠️ Recommender: no users to fit")
+        return None
+
+    try:
+        vectorizer, matrix = fit_matrix(docs)
+    except ValueError:
+        # Every document was empty / stop words only
+        log("⚠️ Recommender: empty vocabulary, skipping fit")
+        return None
+    del docs
+
+    build_id = f"{int(time.time())}-{os.getpid()}"
+    build_dir = os.path.join(model_dir, build_id)
+    os.makedirs(build_dir, exist_ok=True)
+
+    joblib.dump(vectorizer, os.path.join(build_dir, "vectorizer.joblib"))
+    np.save(os.path.join(build_dir, "data.npy"), matrix.data)
+    np.save(os.path.join(build_dir, "indices.npy"), matrix.indices)
+    np.save(os.path.join(build_dir, "indptr.npy"), matrix.indptr)
+    np.save(os.path.join(build_dir, "user_ids.npy"), np.array(user_ids, dtype="U36"))
+
+    if matrix.shape[0] >= current_app.config.get("RECOMMENDER_ANN_MIN_USERS", MIN_USERS):
+        index_started = time.perf_counter()
+        index = LSHIndex.build(matrix)
+        index.save(build_dir)
+        log(f"🧭 Recommender: LSH index {index.tables}×{index.bits} bits "
+            f"in {time.perf_counter() - index_started:.1f}s")
+        del index
+
+    built_at = time.time()
+    _write_pointer(model_dir, {
+        "build_id": build_id,
+        "format": MODEL_FORMAT,
+        "built_at": built_at,
+        "users": len(user_ids),
+        "terms": len(vectorizer.vocabulary_),
+        "shape": list(matrix.shape)
+    })
+    _cleanup_old_builds(model_dir, keep=build_id)
+
+    log(f"✅ Recommender: fitted {matrix.shape[0]} users × {matrix.shape[1]} terms "
+        f"in {time.perf_counter() - started:.1f}s")
+
+    model = _load_build(model_dir, build_id, built_at, tuple(matrix.shape))
+    _set_current(model)
+    return model
+
+
+def _write_pointer(model_dir, meta):
+    tmp_path = os.path.join(model_dir, POINTER_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(model_dir, POINTER_FILE))  # atomic switch
+
+
+def _cleanup_old_builds(model_dir, keep):
+    builds = sorted(
+        (d for d in os.listdir(model_dir) if os.path.isdir(os.path.join(model_dir, d))),
+        key=lambda d: os.path.getmtime(os.path.join(model_dir, d)),
+        reverse=True
+    )
+    # Keep the previous build too: other workers may still have it mapped
+    for old in [d for d in builds if d != keep][KEEP_BUILDS - 1:]:
+        shutil.rmtree(os.path.join(model_dir, old), ignore_errors=True)
+
+
+def _load_build(model_dir, build_id, built_at, shape):
+    build_dir = os.path.join(model_dir, build_id)
+    vectorizer = joblib.load(os.path.join(build_dir, "vectorizer.joblib"))
+    data = np.load(os.path.join(build_dir, "data.npy"), mmap_mode="r")
+    indices = np.load(os.path.join(build_dir, "indices.npy"), mmap_mode="r")
+    indptr = np.load(os.path.join(build_dir, "indptr.npy"), mmap_mode="r")
+    user_ids = np.load(os.path.join(build_dir, "user_ids.npy"), mmap_mode="r")
+
+    matrix = sp.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    index = LSHIndex.load(build_dir)
+    return RecommendationModel(build_id, built_at, vectorizer, matrix, user_ids, build_dir, index)
+
+
+def _read_pointer(model_dir):
+    try:
+        with open(os.path.join(model_dir, POINTER_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _set_current(model):
+    global _model, _checked_at
+    with _lock:
+        _model = model
+        _checked_at = time.monotonic()
+
+
+# -------------------------------------------------
+# Automatic refits (background job runner, one per host)
+# -------------------------------------------------
+def _claim_refit(model_dir):
+    """Create the refit lock; False while another process holds a recent one."""
+    path = os.path.join(model_dir, REFIT_LOCK_FILE)
+    os.makedirs(model_dir, exist_ok=True)
+    try:
+        if time.time() - os.path.getmtime(path) > REFIT_LOCK_SECONDS:
+            os.remove(path)
+    except OSError:
+        pass
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        return False
+
+
+def _background_refit(model_dir):
+    global _refit_queued
+    try:
+        if fit_model(model_dir) is not None:
+            # Failed / empty fits keep the lock: it doubles as a retry cool-down
+            os.remove(os.path.join(model_dir, REFIT_LOCK_FILE))
+    finally:
+        _refit_queued = False
+
+
+def request_refit(model_dir, reason):
+    """Queue a background refit unless one is already queued or running."""
+    global _refit_queued
+    if _refit_queued or not current_app.config.get("RECOMMENDER_AUTO_REFIT", True):
+        return False
+    try:
+        if not _claim_refit(model_dir):
+            return False
+    except OSError as e:
+        print(f"⚠️ Recommender: cannot lock {model_dir} for a refit: {e}")
+        return False
+
+    _refit_queued = True
+    if not run_in_background(("recommender_refit",), _background_refit, model_dir):
+        _refit_queued = False
+        os.remove(os.path.join(model_dir, REFIT_LOCK_FILE))
+        return False
+    print(f"🔁 Recommender: {reason}, refitting in the background")
+    return True
+
+
+# -------------------------------------------------
+# Access
+# -------------------------------------------------
+def get_model():
+    """
+    The current model for this worker, reloaded when another process
+    published a new build. Returns None if nothing usable has been fitted
+    yet; a missing or stale build queues a background refit.
+    """
+    global _model, _checked_at
+
+    now = time.monotonic()
+    if _model is not None and now - _checked_at < RELOAD_CHECK_SECONDS:
+        return _model
+
+    with _lock:
+        model_dir = _model_dir()
+        meta = _read_pointer(model_dir)
+        _checked_at = now
+
+        if meta is None:
+            request_refit(model_dir, "no build yet")
+            return _model
+        if meta.get("format") != MODEL_FORMAT:
+            # Documents were built differently: vectors would not be comparable
+            request_refit(model_dir, f"build {meta['build_id']} has an old format")
+            _model = None
+            return None
+
+        max_age = current_app.config.get("RECOMMENDER_REFIT_HOURS", 24) * 3600
+        age = time.time() - meta["built_at"]
+        if age > max_age:
+            request_refit(model_dir, f"build {meta['build_id']} is {age / 3600:.0f}h old")
+
+        if _model is None or _model.build_id != meta["build_id"]:
+            try:
+                _model = _load_build(model_dir, meta["build_id"], meta["built_at"], tuple(meta["shape"]))
+            except OSError as e:
+                print(f"⚠️ Recommender: could not load build {meta['build_id']}: {e}")
+                return _model
+
+        return _model
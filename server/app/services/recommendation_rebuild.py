@@ -0,0 +1,203 @@
+import os
+import time
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import scipy.sparse as sp
+from app.extensions import db
+from app.models.associations import friendships
+from app.services.recommendation_model import fit_model
+from app.services.recommendation_writer import replace_recommendations
+from app.services.social_graph_service import (
+    blend_score, top_mutual, SKILL_THRESHOLD, TOP_N
+)
+
+# -------------------------------------------------
+# Nightly full refresh of UserRecommendation
+# -------------------------------------------------
+# 1. Refit the TF-IDF model once (users are streamed, vectorised once and the
+#    matrix M is written to disk as memory-mappable .npy parts).
+# 2. Write the friendship matrix F (same row order) next to it.
+# 3. A process pool maps both files and scores blocks of rows:
+#       skills  = M[block] · Mᵀ   (cosine, rows are L2-normalised)
+#       mutual  = F[block] · F    (friends-of-friends counts)
+#    Block height comes from a memory budget, so peak RAM per process is fixed.
+# 4. The parent blends, keeps the top 10 and upserts rows in batches.
+
+CANDIDATES_PER_SIGNAL = TOP_N * 3
+WRITE_BATCH = 1000
+
+# Worker-process globals (set by _init_worker)
+_M = None
+_MT = None
+_F = None
+
+
+def _save_csr(directory, matrix, prefix=""):
+    for part in ("data", "indices", "indptr"):
+        np.save(os.path.join(directory, f"{prefix}{part}.npy"), getattr(matrix, part))
+
+
+def _load_csr(directory, shape, prefix=""):
+    """Memory-map CSR parts saved as <prefix>data.npy, indices.npy, indptr.npy."""
+    parts = [
+        np.load(os.path.join(directory, f"{prefix}{part}.npy"), mmap_mode="r")
+        for part in ("data", "indices", "indptr")
+    ]
+    return sp.csr_matrix(tuple(parts), shape=shape, copy=False)
+
+
+def _friend_matrix(row_of, n):
+    """Symmetric 0/1 friendship CSR in the model's row order."""
+    rows, cols = [], []
+    query = db.session.query(friendships.c.user_id, friendships.c.friend_id).yield_per(10000)
+    for user_id, friend_id in query:
+        i, j = row_of.get(user_id), row_of.get(friend_id)
+        if i is None or j is None:
+            continue
+        rows.append(i)
+        cols.append(j)
+
+    rows = np.asarray(rows, dtype=np.int32)
+    cols = np.asarray(cols, dtype=np.int32)
+    data = np.ones(2 * len(rows), dtype=np.int32)
+    F = sp.coo_matrix(
+        (data, (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(n, n)
+    ).tocsr()
+    F.data[:] = 1
+    return F
+
+
+# -------------------------------------------------
+# Worker side
+# -------------------------------------------------
+def _init_worker(model_dir, friends_dir, shape):
+    global _M, _MT, _F
+    _M = _load_csr(model_dir, shape)
+    _MT = _M.T.tocsr()  # one private copy per process, reused for every block
+    _F = _load_csr(friends_dir, (shape[0], shape[0]), prefix="friends_")
+
+
+def _score_block(bounds):
+    """Top skill + mutual candidates for rows [start, end) as compact arrays."""
+    start, end = bounds
+    sims = (_M[start:end] @ _MT).toarray()
+    mutual = (_F[start:end] @ _F).tocsr()
+
+    results = []
+    for offset in range(end - start):
+        row = start + offset
+
+        scores = sims[offset]
+        scores[row] = -1.0
+        scores[_F.indices[_F.indptr[row]:_F.indptr[row + 1]]] = -1.0
+
+        skill_rows = np.flatnonzero(scores >= SKILL_THRESHOLD)
+        if len(skill_rows) > CANDIDATES_PER_SIGNAL:
+            best = np.argpartition(-scores[skill_rows], CANDIDATES_PER_SIGNAL - 1)[:CANDIDATES_PER_SIGNAL]
+            skill_rows = skill_rows[best]
+        skill = (skill_rows.astype(np.int32), scores[skill_rows].astype(np.float32))
+
+        social = top_mutual(mutual, offset, row, _F, CANDIDATES_PER_SIGNAL)
+        results.append((row, skill, social))
+    return results
+
+
+# -------------------------------------------------
+# Parent side
+# -------------------------------------------------
+def _blocks(n, rows_per_block):
+    for start in range(0, n, rows_per_block):
+        yield start, min(n, start + rows_per_block)
+
+
+def _replace_batch(user_ids, rows):
+    replace_recommendations(user_ids, rows)
+    db.session.commit()
+
+
+def _blend(user_id, skill, social, user_ids):
+    skill_scores = {str(user_ids[c]): float(s) for c, s in zip(*skill)}
+    mutual_counts = {str(user_ids[c]): int(m) for c, m in zip(*social)} if social else {}
+
+    ranked = sorted(
+        (
+            (blend_score(skill_scores.get(c), mutual_counts.get(c, 0)), c)
+            for c in set(skill_scores) | set(mutual_counts)
+        ),
+        reverse=True
+    )[:TOP_N]
+
+    return [
+        {
+            "user_id": user_id,
+            "recommended_user_id": c,
+            "score": float(score),
+            "skill_score": skill_scores.get(c),
+            "mutual_count": mutual_counts.get(c, 0)
+        }
+        for score, c in ranked
+    ]
+
+
+def rebuild_all(processes=None, memory_mb=256, log=print):
+    """Full recompute for every user. Returns a stats dict."""
+    started = time.perf_counter()
+
+    model = fit_model(log=log)
+    if model is None:
+        return {"users": 0, "rows": 0, "seconds": 0.0}
+
+    n = model.size
+    user_ids = model.user_ids
+    F = _friend_matrix(model.row_of, n)
+    log(f"🕸️ Friend matrix: {F.nnz // 2} friendships")
+
+    processes = processes or max(1, (os.cpu_count() or 2) - 1)
+    # Dense similarity block: rows × n float32 (+ a temporary of the same size)
+    rows_per_block = max(1, min(n, (memory_mb * 1024 * 1024) // (n * 4 * 2)))
+
+    users_done, rows_written = 0, 0
+    pending_ids, pending_rows = [], []
+    compute_started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="acadlinker-rebuild-") as friends_dir:
+        _save_csr(friends_dir, F, prefix="friends_")
+        del F
+
+        ctx = multiprocessing.get_context("fork" if os.name == "posix" else "spawn")
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(model.build_dir, friends_dir, model.matrix.shape)
+        ) as pool:
+            for results in pool.map(_score_block, _blocks(n, rows_per_block)):
+                for row, skill, social in results:
+                    user_id = str(user_ids[row])
+                    pending_ids.append(user_id)
+                    pending_rows.extend(_blend(user_id, skill, social, user_ids))
+
+                if len(pending_ids) >= WRITE_BATCH:
+                    _replace_batch(pending_ids, pending_rows)
+                    users_done += len(pending_ids)
+                    rows_written += len(pending_rows)
+                    pending_ids, pending_rows = [], []
+
+                    rate = users_done / (time.perf_counter() - compute_started)
+                    log(f"   … {users_done}/{n} users ({rate:.0f} users/s)")
+
+    if pending_ids:
+        _replace_batch(pending_ids, pending_rows)
+        users_done += len(pending_ids)
+        rows_written += len(pending_rows)
+
+    return {
+        "users": users_done,
+        "rows": rows_written,
+        "processes": processes,
+        "rows_per_block": rows_per_block,
+        "seconds": time.perf_counter() - started
+    }
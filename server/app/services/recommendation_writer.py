@@ -0,0 +1,110 @@
+import time
+from datetime import datetime
+from sqlalchemy import tuple_
+from app.extensions import db
+from app.models.user import User
+from app.models.recommendation import UserRecommendation
+from app.utils.bulk_upsert import upsert
+
+# -------------------------------------------------
+# Single write path for UserRecommendation
+# -------------------------------------------------
+# Every writer (ml_service, the mutual-friend job, the nightly rebuild)
+# replaces a user's whole list. New rows are upserted on
+# (user_id, recommended_user_id), then every other row of those users is
+# deleted by key (not by timestamp: two writers overlapping on the same user
+# must not delete each other's fresh rows). Both statements run in the
+# caller's transaction, so readers see either the old or the new list.
+
+CONFLICT_COLUMNS = ("user_id", "recommended_user_id")
+DELETE_BATCH_USERS = 500     # users per stale-row DELETE (keeps the NOT IN list bounded)
+
+
+def replace_recommendations(user_ids, rows):
+    """
+    Swap the recommendations of every user in `user_ids` for `rows`
+    (dicts with user_id, recommended_user_id, score, skill_score,
+    mutual_count). Users without rows end up with an empty list.
+    The caller commits.
+    """
+    if not user_ids:
+        return 0
+
+    stamp = datetime.utcnow()
+    for row in rows:
+        row["updated_at"] = stamp
+
+    upsert(UserRecommendation, rows, CONFLICT_COLUMNS)
+
+    keep = {}
+    for row in rows:
+        keep.setdefault(row["user_id"], []).append((row["user_id"], row["recommended_user_id"]))
+
+    user_ids = list(user_ids)
+    key = tuple_(UserRecommendation.user_id, UserRecommendation.recommended_user_id)
+    for start in range(0, len(user_ids), DELETE_BATCH_USERS):
+        batch = user_ids[start:start + DELETE_BATCH_USERS]
+        keys = [k for user_id in batch for k in keep.get(user_id, ())]
+        query = UserRecommendation.query.filter(UserRecommendation.user_id.in_(batch))
+        if keys:
+            query = query.filter(~key.in_(keys))
+        query.delete(synchronize_session=False)
+    return len(rows)
+
+
+# -------------------------------------------------
+# Benchmark (flask recommend write-bench)
+# -------------------------------------------------
+def _synthetic_rows(user_ids, per_user):
+    rows = []
+    n = len(user_ids)
+    for i, user_id in enumerate(user_ids):
+        for step in range(1, min(per_user, n - 1) + 1):
+            rows.append({
+                "user_id": user_id,
+                "recommended_user_id": user_ids[(i + step) % n],
+                "score": 1.0 / step,
+                "skill_score": 1.0 / step,
+                "mutual_count": step
+            })
+    return rows
+
+
+def benchmark(users=1000, per_user=10, log=print):
+    """
+    Rows/sec of the old ORM delete + add loop versus replace_recommendations
+    on real user ids. Every run is rolled back.
+    """
+    user_ids = [uid for (uid,) in db.session.query(User.id).limit(users)]
+    if len(user_ids) < 2:
+        log("⚠️ Need at least two users to benchmark")
+        return None
+
+    rows = _synthetic_rows(user_ids, per_user)
+    results = {}
+
+    # Old path: per-user DELETE, one ORM object per row, flush
+    started = time.perf_counter()
+    try:
+        for user_id in user_ids:
+            UserRecommendation.query.filter_by(user_id=user_id).delete()
+        for row in rows:
+            db.session.add(UserRecommendation(**row))
+        db.session.flush()
+        results["orm"] = len(rows) / (time.perf_counter() - started)
+    finally:
+        db.session.rollback()
+
+    # New path: one upsert + one stale-row delete for the whole set
+    started = time.perf_counter()
+    try:
+        replace_recommendations(user_ids, [dict(r) for r in rows])
+        db.session.flush()
+        results["upsert"] = len(rows) / (time.perf_counter() - started)
+    finally:
+        db.session.rollback()
+
+    log(f"🏁 {len(rows)} rows for {len(user_ids)} users: "
+        f"ORM {results['orm']:.0f} rows/s | upsert {results['upsert']:.0f} rows/s "
+        f"({results['upsert'] / results['orm']:.1f}×)")
+    return results
@@ -0,0 +1,43 @@
+import unicodedata
+from app.utils.ttl_cache import LoadingCache
+
+# -------------------------------------------------
+# Short-TTL search result cache (per worker)
+# -------------------------------------------------
+# Popular queries ("react", "python") are typed by many students at once.
+# Results are cached per (scope, normalized query) for a few seconds in a
+# LoadingCache (LRU eviction, concurrent misses wait for ONE loader).
+#
+# Entries are shared by every user: loaders must return plain data (dicts,
+# not ORM objects) WITHOUT per-user filtering; callers drop the viewer
+# afterwards (see exclude_viewer).
+
+DEFAULT_TTL_SECONDS = 30
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def normalize_query(text):
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.lower().split())
+
+
+search_cache = LoadingCache("search")
+
+
+def cached_search(scope, query, loader):
+    """Result of loader() for (scope, normalized query), shared across users."""
+    return search_cache.get_or_load((scope, normalize_query(query)), loader)
+
+
+def exclude_viewer(rows, viewer_id, limit, key="id"):
+    """Drop the viewer from shared results and trim to `limit`."""
+    return [row for row in rows if row[key] != viewer_id][:limit]
+
+
+def init_app(app):
+    global search_cache
+    search_cache = LoadingCache(
+        "search",
+        maxsize=app.config.get("SEARCH_CACHE_SIZE", DEFAULT_MAX_ENTRIES),
+        ttl=app.config.get("SEARCH_CACHE_TTL", DEFAULT_TTL_SECONDS)
+    )
@@ -0,0 +1,256 @@
+import re
+import unicodedata
+from sqlalchemy import select, or_
+from app.extensions import db
+from app.models.skill import Skill, SkillAlias, user_skills, help_request_tags, team_skills
+from app.models.team import Team
+from app.utils.bulk_upsert import upsert
+
+# -------------------------------------------------
+# Normalized skills / tags
+# -------------------------------------------------
+# Users type skills ("ReactJS, Node, ML") and help-request tags as free
+# text. We keep that string for display, and store the parsed list as links
+# to one shared `skill` vocabulary:
+#   canonical() -> lowercase, accent/space/punctuation-normalized form
+#   skill_alias -> alternative spellings ("reactjs" -> "react")
+# Feed, search, matching and the recommender read the links. Team texts are
+# prose ("Need a React dev"), so they are only linked to skills that already
+# exist, matched as whole words / phrases (never "go" inside "good"). A skill
+# created later relinks the teams that already mention it (resolve()); new
+# aliases are picked up by `flask skills relink-teams`.
+
+MAX_SKILL_LENGTH = 50
+MAX_SKILLS = 30
+MAX_TEXT_WORDS = 300         # words of team text scanned for skill mentions
+MAX_PHRASE_WORDS = 3         # "natural language processing"
+
+_SPLIT = re.compile(r"[,;\n|]+")
+_WORD_SPLIT = re.compile(r"[\s,;|()\[\]{}\"'!?]+")
+# Keep the characters that carry meaning in tech names: c++, c#, .net, node.js
+_EDGE_PUNCTUATION = re.compile(r"^[^\w.#+]+|[^\w#+]+$")
+
+
+def canonical(raw):
+    """'  React.JS ' -> 'react.js'; returns '' for blanks."""
+    text = unicodedata.normalize("NFKC", raw or "").lower()
+    text = " ".join(text.split())
+    return _EDGE_PUNCTUATION.sub("", text)[:MAX_SKILL_LENGTH]
+
+
+def parse_list(raw):
+    """Comma/semicolon separated text -> [(canonical, display)] without duplicates."""
+    seen, parsed = set(), []
+    for part in _SPLIT.split(raw or ""):
+        name = canonical(part)
+        if name and name not in seen:
+            seen.add(name)
+            parsed.append((name, " ".join(part.split())[:MAX_SKILL_LENGTH]))
+    return parsed[:MAX_SKILLS]
+
+
+def skill_token(name):
+    """One TF-IDF token per skill: 'machine learning' -> 'machine_learning', 'c++' -> 'cplusplus'."""
+    name = name.replace("+", "plus").replace("#", "sharp")
+    return re.sub(r"\W+", "_", name).strip("_")
+
+
+# -------------------------------------------------
+# Resolve / create
+# -------------------------------------------------
+def resolve(parsed):
+    """
+    [(canonical, display)] from parse_list() -> {canonical: skill id}.
+    Aliases are honoured; unknown skills are created and linked to the
+    teams whose texts already mention them.
+    """
+    if not parsed:
+        return {}
+    display = dict(parsed)
+    wanted = list(display)
+
+    resolved = dict(
+        db.session.query(SkillAlias.alias, SkillAlias.skill_id)
+        .filter(SkillAlias.alias.in_(wanted))
+        .all()
+    )
+    missing = [n for n in wanted if n not in resolved]
+    if missing:
+        resolved.update(
+            db.session.query(Skill.name, Skill.id).filter(Skill.name.in_(missing)).all()
+        )
+    new = [n for n in missing if n not in resolved]
+    if new:
+        upsert(Skill, [{"name": n, "display_name": display[n]} for n in new], ("name",), update_columns=())
+        created = dict(db.session.query(Skill.name, Skill.id).filter(Skill.name.in_(new)).all())
+        resolved.update(created)
+        _link_teams_mentioning(created)
+    return resolved
+
+
+def find_skill_id(term):
+    """Skill id for a search term (exact canonical name or alias), or None."""
+    name = canonical(term)
+    if not name:
+        return None
+    skill_id = db.session.query(SkillAlias.skill_id).filter(SkillAlias.alias == name).scalar()
+    if skill_id is None:
+        skill_id = db.session.query(Skill.id).filter(Skill.name == name).scalar()
+    return skill_id
+
+
+def mentioned_names(text):
+    """Canonical 1-3 word phrases of free text: candidates for known skills."""
+    words = [canonical(w) for w in _WORD_SPLIT.split(text or "")[:MAX_TEXT_WORDS]]
+    words = [w for w in words if w]
+    return {
+        " ".join(words[i:i + n])
+        for n in range(1, MAX_PHRASE_WORDS + 1)
+        for i in range(len(words) - n + 1)
+    }
+
+
+def known_skill_ids(names):
+    """Skill ids of `names` that are existing skills or aliases (never creates)."""
+    names = list(names)
+    ids = set()
+    for start in range(0, len(names), 500):
+        batch = names[start:start + 500]
+        ids.update(skill_id for (skill_id,) in db.session.query(Skill.id).filter(Skill.name.in_(batch)))
+        ids.update(
+            skill_id for (skill_id,) in
+            db.session.query(SkillAlias.skill_id).filter(SkillAlias.alias.in_(batch))
+        )
+    return ids
+
+
+def _replace_links(table, owner_column, owner_id, skill_ids):
+    db.session.execute(table.delete().where(table.c[owner_column] == owner_id))
+    if skill_ids:
+        db.session.execute(
+            table.insert(),
+            [{owner_column: owner_id, "skill_id": skill_id} for skill_id in set(skill_ids)]
+        )
+
+
+def set_user_skills(user, raw):
+    """Store the display string and replace the user's skill links. Caller commits."""
+    user.skills = raw
+    resolved = resolve(parse_list(raw))
+    _replace_links(user_skills, "user_id", user.id, list(resolved.values()))
+
+
+def set_request_tags(help_request, raw):
+    """Same for a help request (must be flushed so it has an id). Caller commits."""
+    help_request.tags = raw
+    resolved = resolve(parse_list(raw))
+    _replace_links(help_request_tags, "help_request_id", help_request.id, list(resolved.values()))
+
+
+def _team_text(requirements, description):
+    return f"{requirements or ''}\n{description or ''}"
+
+
+def set_team_skills(team):
+    """Relink a team (must have an id) to the known skills its texts mention. Caller commits."""
+    names = mentioned_names(_team_text(team.hiring_requirements, team.description))
+    _replace_links(team_skills, "team_id", team.id, list(known_skill_ids(names)))
+
+
+def _escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _link_teams_mentioning(skill_ids):
+    """
+    {canonical name: skill id} of just-created skills -> add team_skill links
+    for every team that already mentions one of them. A substring ILIKE on
+    each name's first word narrows the scan; mentioned_names() decides.
+    """
+    if not skill_ids:
+        return
+    first_words = {name.split(" ")[0] for name in skill_ids}
+    prefilter = or_(*(
+        column.ilike(f"%{_escape_like(word)}%", escape="\\")
+        for word in first_words
+        for column in (Team.hiring_requirements, Team.description)
+    ))
+    rows = db.session.execute(
+        select(Team.id, Team.hiring_requirements, Team.description).where(prefilter)
+        .execution_options(yield_per=1000)
+    )
+    links = [
+        {"team_id": team_id, "skill_id": skill_ids[name]}
+        for team_id, requirements, description in rows
+        for name in mentioned_names(_team_text(requirements, description)) & skill_ids.keys()
+    ]
+    upsert(team_skills, links, ("team_id", "skill_id"), update_columns=())
+
+
+def relink_all_teams(dry_run=False, log=print):
+    """
+    Re-run the team_skill backfill for every team (after adding aliases or
+    editing the vocabulary by hand). Returns the number of teams changed.
+    """
+    current = {}
+    for team_id, skill_id in db.session.query(team_skills.c.team_id, team_skills.c.skill_id):
+        current.setdefault(team_id, set()).add(skill_id)
+
+    changed = 0
+    teams = db.session.query(Team.id, Team.hiring_requirements, Team.description).all()
+    for team_id, requirements, description in teams:
+        wanted = known_skill_ids(mentioned_names(_team_text(requirements, description)))
+        if wanted != current.get(team_id, set()):
+            changed += 1
+            if not dry_run:
+                _replace_links(team_skills, "team_id", team_id, list(wanted))
+    log(f"🏷️ team skills: {changed} of {len(teams)} team(s) {'drifted' if dry_run else 'relinked'}")
+
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    return changed
+
+
+# -------------------------------------------------
+# Reads
+# -------------------------------------------------
+def user_skill_names(user_id):
+    """Canonical skill names of one user (one indexed join)."""
+    return [
+        name for (name,) in db.session.query(Skill.name)
+        .join(user_skills, user_skills.c.skill_id == Skill.id)
+        .filter(user_skills.c.user_id == user_id)
+        .order_by(Skill.name)
+    ]
+
+
+def user_skill_ids(user_id):
+    return [
+        skill_id for (skill_id,) in db.session.query(user_skills.c.skill_id)
+        .filter(user_skills.c.user_id == user_id)
+    ]
+
+
+def skill_names_by_user():
+    """user_id -> [canonical names] for every user (batch jobs)."""
+    names = {}
+    rows = db.session.execute(
+        select(user_skills.c.user_id, Skill.name)
+        .join(Skill, Skill.id == user_skills.c.skill_id)
+        .execution_options(yield_per=10000)
+    )
+    for user_id, name in rows:
+        names.setdefault(user_id, []).append(name)
+    return names
+
+
+def users_with_skill(skill_id):
+    """Select of user ids linked to `skill_id` (for IN / joins)."""
+    return select(user_skills.c.user_id).where(user_skills.c.skill_id == skill_id)
+
+
+def teams_with_skill(skill_id):
+    """Select of team ids linked to `skill_id` (for IN / joins)."""
+    return select(team_skills.c.team_id).where(team_skills.c.skill_id == skill_id)
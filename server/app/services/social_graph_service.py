@@ -0,0 +1,225 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from app.extensions import db
+from app.models.associations import friendships
+from app.models.recommendation import UserRecommendation
+from app.services.recommendation_writer import replace_recommendations
+
+# -------------------------------------------------
+# Friends-of-friends recommendations (batch job)
+# -------------------------------------------------
+# A is the symmetric 0/1 adjacency matrix of the friendship graph. Row i of
+# A·A counts the paths of length 2 from user i, i.e. mutual friends with
+# every other user. We compute it a block of rows at a time so memory stays
+# bounded no matter how many users we have, drop existing friends + self,
+# and blend the mutual count with the TF-IDF skill score.
+
+SKILL_WEIGHT = 0.7
+SOCIAL_WEIGHT = 0.3
+MUTUAL_HALF_SATURATION = 3   # 3 mutual friends = half of the social score
+SKILL_THRESHOLD = 0.30       # same cut-off as ml_service
+TOP_N = 10
+
+BYTES_PER_NNZ = 16           # int32 index + int32 data + scipy temporaries
+WRITE_BATCH = 500            # users per upsert round trip
+
+
+def blend_score(skill_score, mutual_count):
+    """Single ranking score from skill similarity (0..1) + mutual friends."""
+    social = mutual_count / (mutual_count + MUTUAL_HALF_SATURATION) if mutual_count else 0.0
+    return SKILL_WEIGHT * (skill_score or 0.0) + SOCIAL_WEIGHT * social
+
+
+def build_adjacency():
+    """
+    Stream the friendships table into a symmetric CSR matrix.
+    Returns (A, user_ids) where user_ids[i] is the id of row/column i.
+    """
+    index = {}
+    rows, cols = [], []
+
+    query = db.session.query(friendships.c.user_id, friendships.c.friend_id).yield_per(10000)
+    for user_id, friend_id in query:
+        i = index.setdefault(user_id, len(index))
+        j = index.setdefault(friend_id, len(index))
+        rows.append(i)
+        cols.append(j)
+
+    n = len(index)
+    user_ids = np.empty(n, dtype=object)
+    for user_id, i in index.items():
+        user_ids[i] = user_id
+
+    rows = np.asarray(rows, dtype=np.int32)
+    cols = np.asarray(cols, dtype=np.int32)
+    data = np.ones(len(rows), dtype=np.int32)
+
+    # Pairs are stored once (user_id < friend_id): mirror them into both halves
+    A = sp.coo_matrix(
+        (np.concatenate([data, data]), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(n, n)
+    ).tocsr()
+    A.data[:] = 1
+    return A, user_ids
+
+
+def _row_chunks(A, max_nnz):
+    """
+    Split rows into blocks whose A·A product holds at most ~max_nnz entries.
+    The number of 2-hop paths from a row is an upper bound on its nnz.
+    """
+    degree = np.diff(A.indptr).astype(np.int64)
+    paths = A @ degree  # paths[i] = sum of degrees of i's friends
+
+    start, acc = 0, 0
+    for i, cost in enumerate(paths):
+        if acc and acc + cost > max_nnz:
+            yield start, i
+            start, acc = i, 0
+        acc += cost
+    if start < A.shape[0]:
+        yield start, A.shape[0]
+
+
+def top_mutual(product, offset, row, A, top_n):
+    """
+    Best friends-of-friends of `row` from one row (`offset`) of a block of
+    A·A, with existing friends and self masked out. Returns (cols, counts)
+    best first, or None.
+    """
+    lo, hi = product.indptr[offset], product.indptr[offset + 1]
+    if lo == hi:
+        return None
+
+    cols = product.indices[lo:hi]
+    counts = product.data[lo:hi]
+
+    # Mask existing friends and self
+    friends = A.indices[A.indptr[row]:A.indptr[row + 1]]
+    keep = ~np.isin(cols, friends, assume_unique=True) & (cols != row)
+    cols, counts = cols[keep], counts[keep]
+    if not len(cols):
+        return None
+
+    if len(cols) > top_n:
+        best = np.argpartition(-counts, top_n)[:top_n]
+        cols, counts = cols[best], counts[best]
+
+    order = np.argsort(-counts, kind="stable")
+    return cols[order], counts[order]
+
+
+def iter_mutual_counts(A, top_n=TOP_N * 3, memory_mb=256):
+    """
+    Yield (row, candidate_rows, mutual_counts) for every user with at least
+    one friend-of-friend, best candidates first.
+    """
+    max_nnz = max(1, (memory_mb * 1024 * 1024) // BYTES_PER_NNZ)
+
+    for start, end in _row_chunks(A, max_nnz):
+        product = (A[start:end] @ A).tocsr()
+
+        for offset in range(end - start):
+            row = start + offset
+            best = top_mutual(product, offset, row, A, top_n)
+            if best is not None:
+                yield row, best[0], best[1]
+
+
+def _existing_skill_scores(user_ids):
+    """user_id -> {recommended_user_id: skill_score} from the last ML run."""
+    scores = {}
+    rows = db.session.query(
+        UserRecommendation.user_id,
+        UserRecommendation.recommended_user_id,
+        UserRecommendation.skill_score,
+        UserRecommendation.score,
+        UserRecommendation.mutual_count
+    ).filter(UserRecommendation.user_id.in_(user_ids))
+
+    for user_id, rec_id, skill_score, score, mutual_count in rows:
+        if skill_score is None:
+            # Legacy row written before skill_score existed: pure skill score
+            skill_score = score if not mutual_count else 0.0
+        if skill_score >= SKILL_THRESHOLD:
+            scores.setdefault(user_id, {})[rec_id] = skill_score
+    return scores
+
+
+def _users_with_mutual_rows():
+    """Users whose current recommendations include mutual-friend candidates."""
+    return {
+        user_id for (user_id,) in db.session.query(UserRecommendation.user_id)
+        .filter(UserRecommendation.mutual_count > 0)
+        .distinct()
+    }
+
+
+def _write_batch(batch):
+    """Replace the recommendations of every user in `batch` (user_id -> mutual dict)."""
+    user_ids = list(batch.keys())
+    skill_scores = _existing_skill_scores(user_ids)
+
+    new_rows = []
+    for user_id, mutual in batch.items():
+        skills = skill_scores.get(user_id, {})
+        candidates = set(mutual) | set(skills)
+        ranked = sorted(
+            (
+                (blend_score(skills.get(c), mutual.get(c, 0)), c)
+                for c in candidates
+            ),
+            reverse=True
+        )[:TOP_N]
+        new_rows.extend(
+            {
+                "user_id": user_id,
+                "recommended_user_id": c,
+                "score": float(score),
+                "skill_score": skills.get(c),
+                "mutual_count": int(mutual.get(c, 0))
+            }
+            for score, c in ranked
+        )
+
+    replace_recommendations(user_ids, new_rows)
+    db.session.commit()
+    return len(new_rows)
+
+
+def rebuild_social_recommendations(memory_mb=256, log=print):
+    """
+    Recompute mutual-friend candidates for every user and blend them into
+    UserRecommendation. Returns a small stats dict.
+    """
+    started = time.perf_counter()
+    # Read before the graph: anyone left over lost all friends-of-friends
+    stale = _users_with_mutual_rows()
+    A, user_ids = build_adjacency()
+    log(f"🕸️ Adjacency: {A.shape[0]} users, {A.nnz // 2} friendships "
+        f"({time.perf_counter() - started:.1f}s)")
+
+    batch, users_done, rows_written = {}, 0, 0
+    for row, cols, counts in iter_mutual_counts(A, memory_mb=memory_mb):
+        batch[user_ids[row]] = {user_ids[c]: int(n) for c, n in zip(cols, counts)}
+        stale.discard(user_ids[row])
+        if len(batch) >= WRITE_BATCH:
+            rows_written += _write_batch(batch)
+            users_done += len(batch)
+            batch = {}
+
+    # No friends-of-friends any more (e.g. after an unfriend): keep only the
+    # skill candidates so stale "N mutual friends" rows disappear
+    for user_id in stale:
+        batch[user_id] = {}
+        if len(batch) >= WRITE_BATCH:
+            rows_written += _write_batch(batch)
+            users_done += len(batch)
+            batch = {}
+    if batch:
+        rows_written += _write_batch(batch)
+        users_done += len(batch)
+
+    elapsed = time.perf_counter() - started
+    return {"users": users_done, "rows": rows_written, "seconds": elapsed}
@@ -0,0 +1,144 @@
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from app.extensions import db
+from app.models.user import User
+from app.models.post import Post
+from app.services import friend_graph
+from app.services.job_runner import run_in_background
+
+# -------------------------------------------------
+# Fallback suggestion pool (per worker)
+# -------------------------------------------------
+# Users with few ML recommendations get "trending" users instead. Rather than
+# sorting the whole user table with ORDER BY random() on every request, each
+# worker keeps a pool of the most active / best connected users (with the
+# fields the suggestion card needs) and samples it in memory. The pool is
+# refreshed in the background every POOL_TTL_SECONDS; the old pool keeps
+# serving until the new one is ready.
+
+POOL_SIZE = 500
+POOL_TTL_SECONDS = 600
+ACTIVE_DAYS = 30
+SAMPLE_ATTEMPTS = 4          # random draws per requested user before scanning
+
+_pool = ()                   # tuple of dicts, best first
+_built_at = None             # monotonic time of the last build (None: never built)
+_refreshing = False
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def _serialize(user):
+    return {
+        "id": user.id,
+        "name": user.full_name,
+        "email": user.email,
+        "skills": user.skills,
+        "location": user.location,
+        "profile_image": getattr(user, "profile_pic", None)
+    }
+
+
+def _build_pool():
+    since = datetime.utcnow() - timedelta(days=ACTIVE_DAYS)
+    recent_posts = dict(
+        db.session.query(Post.user_id, func.count(Post.id))
+        .filter(Post.timestamp >= since)
+        .group_by(Post.user_id)
+        .order_by(func.count(Post.id).desc())
+        .limit(POOL_SIZE)
+        .all()
+    )
+    friend_counts = dict(friend_graph.most_connected(POOL_SIZE))
+    reputation = dict(
+        db.session.query(User.id, User.reputation_points)
+        .filter(User.reputation_points > 0)
+        .order_by(User.reputation_points.desc())
+        .limit(POOL_SIZE)
+        .all()
+    )
+
+    candidate_ids = set(recent_posts) | set(friend_counts) | set(reputation)
+    users = []
+    ids = list(candidate_ids)
+    for start in range(0, len(ids), 500):
+        users.extend(User.query.filter(User.id.in_(ids[start:start + 500])).all())
+
+    # Small / quiet networks: pad with the newest accounts
+    if len(users) < POOL_SIZE:
+        newest = User.query.order_by(User.created_at.desc()).limit(POOL_SIZE + len(users)).all()
+        users.extend(u for u in newest if u.id not in candidate_ids)
+
+    def activity(user):
+        return (
+            friend_graph.friend_count(user.id)
+            + 2 * recent_posts.get(user.id, 0)
+            + (user.reputation_points or 0) / 10
+        )
+
+    users.sort(key=activity, reverse=True)
+    return tuple(_serialize(u) for u in users[:POOL_SIZE])
+
+
+def refresh_pool():
+    """Rebuild the pool now (runs on the background job runner)."""
+    global _pool, _built_at, _refreshing
+    try:
+        pool = _build_pool()
+        with _lock:
+            _pool, _built_at = pool, time.monotonic()
+        print(f"🎲 Suggestion pool refreshed: {len(pool)} users")
+    finally:
+        _refreshing = False
+
+
+def _current_pool():
+    global _refreshing
+    # First use in this worker: build once synchronously. An EMPTY pool
+    # (fresh database) still counts as built and waits for the TTL.
+    if _built_at is None:
+        with _build_lock:
+            if _built_at is None:
+                refresh_pool()
+        return _pool
+
+    if time.monotonic() - _built_at > POOL_TTL_SECONDS and not _refreshing:
+        _refreshing = True
+        if not run_in_background(("suggestion_pool",), refresh_pool):
+            _refreshing = False
+    return _pool
+
+
+def sample_fallbacks(count, exclude_ids):
+    """
+    Up to `count` pool entries (dicts) not in `exclude_ids`, chosen at random.
+    Cost depends on `count` and the pool size, not on the user table.
+    """
+    pool = _current_pool()
+    if count <= 0 or not pool:
+        return []
+
+    picked, seen = [], set()
+    for _ in range(count * SAMPLE_ATTEMPTS):
+        entry = pool[random.randrange(len(pool))]
+        if entry["id"] in exclude_ids or entry["id"] in seen:
+            continue
+        seen.add(entry["id"])
+        picked.append(entry)
+        if len(picked) == count:
+            return picked
+
+    # Heavily excluded pool: walk it from a random offset instead
+    offset = random.randrange(len(pool))
+    for i in range(len(pool)):
+        entry = pool[(offset + i) % len(pool)]
+        if entry["id"] in exclude_ids or entry["id"] in seen:
+            continue
+        seen.add(entry["id"])
+        picked.append(entry)
+        if len(picked) == count:
+            break
+    return picked
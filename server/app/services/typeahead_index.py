@@ -0,0 +1,147 @@
+import threading
+import unicodedata
+from itertools import islice
+from sortedcontainers import SortedList
+from app.extensions import db
+from app.models.user import User
+from app.services.job_runner import run_in_background
+from app.services.version_service import bump_version, get_version, remember_version
+
+# -------------------------------------------------
+# Typeahead prefix index (per worker)
+# -------------------------------------------------
+# A SortedList of (normalized key, kind, user_id) tuples: the full name,
+# the username and every later word of the name. A lookup is one bisect
+# plus a short scan of the keys that start with the query, so suggestions
+# never touch the database.
+#
+# Freshness works like friend_graph: writers bump TYPEAHEAD_VERSION_KEY in
+# their transaction and call add_user() after committing, which swaps the
+# user's few keys in O(log n) each. Other workers see the new version and
+# rebuild in the background while the old index keeps answering.
+
+TYPEAHEAD_VERSION_KEY = "typeahead"
+SUGGEST_LIMIT = 10
+SCAN_LIMIT = 200             # prefix entries inspected per query
+
+KIND_NAME, KIND_USERNAME, KIND_WORD = 0, 1, 2
+
+_entries = None   # SortedList[(key, kind, user_id)]
+_users = {}       # user_id -> (full_name, username, profile_pic)
+_version = None
+_rebuilding = False
+_lock = threading.RLock()
+
+
+def normalize(text):
+    """Lowercase, strip accents, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.lower().split())
+
+
+def _keys_for(full_name, username):
+    name = normalize(full_name)
+    keys = []
+    if name:
+        keys.append((name, KIND_NAME))
+        keys.extend((word, KIND_WORD) for word in name.split(" ")[1:])
+    if username:
+        keys.append((normalize(username), KIND_USERNAME))
+    return keys
+
+
+def _load():
+    entries, users = [], {}
+    rows = db.session.query(User.id, User.full_name, User.username, User.profile_pic).yield_per(5000)
+    for user_id, full_name, username, profile_pic in rows:
+        users[user_id] = (full_name, username, profile_pic)
+        entries.extend((key, kind, user_id) for key, kind in _keys_for(full_name, username))
+    return SortedList(entries), users
+
+
+def rebuild():
+    """Reload the whole index (startup / another worker changed it)."""
+    global _entries, _users, _version, _rebuilding
+    try:
+        # Read the version first: a write landing mid-load triggers another rebuild
+        version = get_version(TYPEAHEAD_VERSION_KEY, max_age=0)
+        entries, users = _load()
+        with _lock:
+            _entries, _users, _version = entries, users, version
+        print(f"🔤 Typeahead index loaded: {len(users)} users, {len(entries)} keys (v{version})")
+    finally:
+        _rebuilding = False
+
+
+def _snapshot():
+    global _rebuilding
+    if _entries is None:
+        with _lock:
+            if _entries is None:
+                rebuild()
+        return _entries, _users
+
+    if get_version(TYPEAHEAD_VERSION_KEY) != _version and not _rebuilding:
+        _rebuilding = True
+        if not run_in_background(("typeahead_rebuild",), rebuild):
+            _rebuilding = False
+    return _entries, _users
+
+
+# -------------------------------------------------
+# Reads
+# -------------------------------------------------
+def suggest(query, limit=SUGGEST_LIMIT, exclude_id=None):
+    """[(user_id, full_name, username, profile_pic), ...] best prefix matches first."""
+    prefix = normalize(query)
+    if not prefix:
+        return []
+
+    entries, users = _snapshot()
+    best = {}  # user_id -> best (lowest) kind
+    # add_user() edits the list in place: scan under the lock
+    with _lock:
+        for key, kind, user_id in islice(entries.irange((prefix,)), SCAN_LIMIT):
+            if not key.startswith(prefix):
+                break
+            if user_id != exclude_id and kind < best.get(user_id, 3):
+                best[user_id] = kind
+        found = {user_id: users[user_id] for user_id in best}
+
+    ranked = sorted(
+        best.items(),
+        key=lambda item: (item[1], len(found[item[0]][0] or ""), found[item[0]][0] or "")
+    )[:limit]
+    return [(user_id, *found[user_id]) for user_id, _ in ranked]
+
+
+# -------------------------------------------------
+# Writes
+# -------------------------------------------------
+def bump():
+    """Mark the index as changed. Call inside the write transaction."""
+    return bump_version(TYPEAHEAD_VERSION_KEY)
+
+
+def add_user(user, version):
+    """Apply a committed create / rename to the local index (O(log n) per key)."""
+    global _version
+    with _lock:
+        if _entries is None:
+            return
+        if _version is None or version != _version + 1:
+            # Someone else wrote in between; rebuild on next read
+            _version = None
+            return
+
+        old = _users.get(user.id)
+        if old is not None:
+            for key, kind in _keys_for(old[0], old[1]):
+                _entries.discard((key, kind, user.id))
+        for key, kind in _keys_for(user.full_name, user.username):
+            _entries.add((key, kind, user.id))
+        _users[user.id] = (user.full_name, user.username, user.profile_pic)
+
+        _version = version
+        remember_version(TYPEAHEAD_VERSION_KEY, version)
@@ -0,0 +1,140 @@
+import re
+import threading
+from sqlalchemy import case, func, or_, text
+from app.extensions import db
+from app.models.user import User
+
+# -------------------------------------------------
+# Ranked user search
+# -------------------------------------------------
+# PostgreSQL: pg_trgm GIN indexes on the searchable columns (migration
+#   d5e1f7a3b920). ILIKE '%term%' and the similarity operator both use
+#   them; results are ordered by prefix match, then trigram similarity.
+# SQLite: the `user_search` FTS5 table, kept in sync by triggers (the update
+#   one only fires for the searchable columns, migration f5d2a8c1e036);
+#   prefix queries ranked with bm25().
+# Anything else (or a database without the migration): plain ILIKE.
+
+SEARCHABLE = ("full_name", "email", "skills", "username")
+MAX_TERMS = 8
+
+_backend = None
+_lock = threading.Lock()
+
+
+def _detect_backend():
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        has_trgm = db.session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).scalar()
+        return "trigram" if has_trgm else "ilike"
+    if dialect == "sqlite":
+        has_fts = db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_search'")
+        ).scalar()
+        return "fts5" if has_fts else "ilike"
+    return "ilike"
+
+
+def _get_backend():
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = _detect_backend()
+    return _backend
+
+
+def _columns(fields):
+    unknown = set(fields) - set(SEARCHABLE)
+    if unknown:
+        raise ValueError(f"Not searchable: {', '.join(sorted(unknown))}")
+    return [getattr(User, f) for f in fields]
+
+
+def _escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# -------------------------------------------------
+# Backends
+# -------------------------------------------------
+def _search_trigram(term, fields, limit, offset, exclude_id):
+    columns = _columns(fields)
+    pattern = f"%{_escape_like(term)}%"
+
+    similarity = func.greatest(*[func.similarity(func.coalesce(c, ""), term) for c in columns])
+    prefix_hit = or_(*[c.ilike(f"{_escape_like(term)}%", escape="\\") for c in columns])
+
+    query = User.query.filter(
+        or_(*[c.ilike(pattern, escape="\\") for c in columns],
+            *[c.op("%")(term) for c in columns])
+    )
+    if exclude_id:
+        query = query.filter(User.id != exclude_id)
+
+    return (
+        query.order_by(
+            case((prefix_hit, 0), else_=1),
+            similarity.desc(),
+            User.id
+        )
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+
+def fts_query(term, fields):
+    # Quote every token so user input can't inject FTS5 syntax
+    tokens = re.findall(r"\w+", term.lower())[:MAX_TERMS]
+    if not tokens:
+        return None
+    match = " AND ".join(f'"{t}"*' for t in tokens)
+    return f"{{{' '.join(fields)}}} : ({match})"
+
+
+def _search_fts5(term, fields, limit, offset, exclude_id):
+    _columns(fields)
+    match = fts_query(term, fields)
+    if match is None:
+        return []
+
+    sql = "SELECT user_id FROM user_search WHERE user_search MATCH :match"
+    params = {"match": match, "limit": limit, "offset": offset}
+    if exclude_id:
+        sql += " AND user_id != :exclude_id"
+        params["exclude_id"] = exclude_id
+    sql += " ORDER BY bm25(user_search) LIMIT :limit OFFSET :offset"
+
+    ids = [row[0] for row in db.session.execute(text(sql), params)]
+    if not ids:
+        return []
+
+    users = {u.id: u for u in User.query.filter(User.id.in_(ids)).all()}
+    return [users[i] for i in ids if i in users]
+
+
+def _search_ilike(term, fields, limit, offset, exclude_id):
+    columns = _columns(fields)
+    pattern = f"%{_escape_like(term)}%"
+    query = User.query.filter(or_(*[c.ilike(pattern, escape="\\") for c in columns]))
+    if exclude_id:
+        query = query.filter(User.id != exclude_id)
+    return query.order_by(User.full_name, User.id).offset(offset).limit(limit).all()
+
+
+_BACKENDS = {
+    "trigram": _search_trigram,
+    "fts5": _search_fts5,
+    "ilike": _search_ilike
+}
+
+
+def search_users(term, fields=("full_name", "email"), limit=25, exclude_id=None, offset=0):
+    """Users matching `term` in any of `fields`, most relevant first."""
+    term = (term or "").strip()
+    if not term:
+        return []
+    return _BACKENDS[_get_backend()](term, tuple(fields), limit, offset, exclude_id)
@@ -0,0 +1,59 @@
+import time
+import threading
+from app.extensions import db
+from app.models.cache_version import CacheVersion
+
+# -------------------------------------------------
+# Cross-worker cache invalidation
+# -------------------------------------------------
+# Each gunicorn worker keeps its own in-memory indexes. Writers bump a
+# counter in the `cache_version` table inside their own transaction; readers
+# compare it with the version their local copy was built from. Reads are
+# throttled so a hot path costs at most one PK lookup every few seconds.
+
+VERSION_CHECK_SECONDS = 2.0
+
+_last_seen = {}  # key -> (version, monotonic timestamp)
+_lock = threading.Lock()
+
+
+def bump_version(key):
+    """
+    Increment the counter for `key` inside the caller's transaction and
+    return the new value. The caller is responsible for committing.
+    """
+    updated = CacheVersion.query.filter_by(key=key).update(
+        {CacheVersion.version: CacheVersion.version + 1},
+        synchronize_session=False
+    )
+    if not updated:
+        db.session.add(CacheVersion(key=key, version=1))
+        db.session.flush()
+
+    # Not cached locally: the transaction may still roll back
+    return db.session.query(CacheVersion.version).filter_by(key=key).scalar()
+
+
+def get_version(key, max_age=VERSION_CHECK_SECONDS):
+    """
+    Current version of `key` as seen by this worker, re-read from the
+    database at most once every `max_age` seconds.
+    """
+    now = time.monotonic()
+    with _lock:
+        cached = _last_seen.get(key)
+    if cached and now - cached[1] < max_age:
+        return cached[0]
+
+    version = db.session.query(CacheVersion.version).filter_by(key=key).scalar() or 0
+    with _lock:
+        _last_seen[key] = (version, now)
+    return version
+
+
+def remember_version(key, version):
+    """Record a version this worker just committed (skips a re-read)."""
+    with _lock:
+        cached = _last_seen.get(key)
+        if not cached or cached[0] < version:
+            _last_seen[key] = (version, time.monotonic())
@@ -0,0 +1,63 @@
+from sqlalchemy import insert, select, tuple_
+from app.extensions import db
+
+# -------------------------------------------------
+# Dialect-aware bulk upsert
+# -------------------------------------------------
+# INSERT ... ON CONFLICT (...) DO UPDATE on PostgreSQL and SQLite, sent as
+# one executemany (SQLAlchemy batches the VALUES lists for us). Other
+# dialects fall back to DELETE matching keys + plain INSERT (or, for
+# DO NOTHING, inserting only the keys that are missing).
+
+
+def _dialect_insert(dialect):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert
+    return None
+
+
+def upsert(model, rows, conflict_columns, update_columns=None):
+    """
+    Insert `rows` (list of dicts) into `model`'s table, updating
+    `update_columns` (default: every other column present in the rows) when
+    a row with the same `conflict_columns` already exists. An empty
+    `update_columns` keeps the existing row (DO NOTHING). Does not commit.
+    """
+    if not rows:
+        return 0
+
+    table = getattr(model, "__table__", model)
+    if update_columns is None:
+        update_columns = [c for c in rows[0] if c not in conflict_columns]
+
+    dialect_insert = _dialect_insert(db.session.get_bind().dialect.name)
+    if dialect_insert is None:
+        keys = [tuple(row[c] for c in conflict_columns) for row in rows]
+        key_expr = tuple_(*(table.c[c] for c in conflict_columns))
+        if not update_columns:
+            existing = set(db.session.execute(
+                select(*(table.c[c] for c in conflict_columns)).where(key_expr.in_(keys))
+            ).all())
+            rows = [row for row, key in zip(rows, keys) if key not in existing]
+            if rows:
+                db.session.execute(insert(table), rows)
+            return len(rows)
+        db.session.execute(table.delete().where(key_expr.in_(keys)))
+        db.session.execute(insert(table), rows)
+        return len(rows)
+
+    stmt = dialect_insert(table)
+    if not update_columns:
+        db.session.execute(stmt.on_conflict_do_nothing(index_elements=[table.c[c] for c in conflict_columns]), rows)
+        return len(rows)
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[c] for c in conflict_columns],
+        set_={c: stmt.excluded[c] for c in update_columns}
+    )
+    db.session.execute(stmt, rows)
+    return len(rows)
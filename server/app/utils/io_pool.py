@@ -0,0 +1,56 @@
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+# -------------------------------------------------
+# Shared I/O thread pool
+# -------------------------------------------------
+# For fan-out work a request waits on (parallel search queries, uploads to
+# Cloudinary). Unlike job_runner, callers block on the results. Each task
+# runs in its own app context, so DB work gets its own session, which is
+# returned to the pool when the context ends.
+#
+# Keep IO_POOL_WORKERS at or below the DB pool size: every task that
+# queries holds one connection while it runs.
+
+DEFAULT_WORKERS = 4
+
+_executor = None
+_max_workers = DEFAULT_WORKERS
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                # Created lazily so threads start in the serving process
+                _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="io")
+    return _executor
+
+
+def _run_with_app_context(app, fn, args, kwargs):
+    with app.app_context():
+        return fn(*args, **kwargs)
+
+
+def submit(fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) on the pool inside an app context. Returns a Future."""
+    app = current_app._get_current_object()
+    return _get_executor().submit(_run_with_app_context, app, fn, args, kwargs)
+
+
+def shutdown():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def init_app(app):
+    global _max_workers
+    _max_workers = app.config.get("IO_POOL_WORKERS", DEFAULT_WORKERS)
+    atexit.register(shutdown)
@@ -0,0 +1,73 @@
+import threading
+from cachetools import TTLCache
+
+# -------------------------------------------------
+# Short-TTL cache with single-flight loading (per worker)
+# -------------------------------------------------
+# Entries expire after `ttl` seconds with LRU eviction beyond `maxsize`, and
+# concurrent misses for the same key wait for ONE loader instead of each
+# running it. Used by search results, profiles and the team browser.
+
+DEFAULT_TTL_SECONDS = 30
+DEFAULT_MAX_ENTRIES = 1024
+LOAD_WAIT_SECONDS = 5
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class LoadingCache:
+    def __init__(self, name, maxsize=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS):
+        self.name = name
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "shared": 0}
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            try:
+                value = self._cache[key]
+                self._stats["hits"] += 1
+                return value
+            except KeyError:
+                pass
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if not leader:
+            if flight.done.wait(LOAD_WAIT_SECONDS) and flight.error is None:
+                return flight.result
+            # Leader failed or is stuck: load for ourselves
+            return loader()
+
+        try:
+            flight.result = loader()
+            with self._lock:
+                self._cache[key] = flight.result
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._cache))
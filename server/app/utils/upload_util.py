@@ -1,7 +1,10 @@
 import os
 import secrets
+from concurrent.futures import wait
 import cloudinary.uploader
 from flask import current_app
+from app.extensions import db
+from app.utils import io_pool
 
 def upload_file(file, folder_name="acadlinker/general"):
     """
@@ -31,4 +34,29 @@ def upload_file(file, folder_name="acadlinker/general"):
     os.makedirs(upload_folder, exist_ok=True)
     
     file.save(os.path.join(upload_folder, filename))
-    return filename
\ No newline at end of file
+    return filename
+
+
+def upload_many(uploads):
+    """
+    Run several uploads at the same time on the shared I/O pool.
+    uploads: {key: (upload_fn, file, *args)} -> {key: result}
+
+    Call it BEFORE changing any rows: it ends the request's (read-only)
+    transaction so no pooled DB connection is held while we wait on the
+    network. Loaded objects are expired and reload on next access.
+    Returns once the slowest upload is done; re-raises the first error.
+    """
+    uploads = {key: job for key, job in uploads.items() if job[1] and job[1].filename}
+    if not uploads:
+        return {}
+
+    db.session.rollback()
+
+    if len(uploads) == 1:
+        (key, (fn, *args)), = uploads.items()
+        return {key: fn(*args)}
+
+    futures = {key: io_pool.submit(fn, *args) for key, (fn, *args) in uploads.items()}
+    wait(futures.values())
+    return {key: future.result() for key, future in futures.items()}
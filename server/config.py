@@ -62,6 +62,45 @@ class Config:
     CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY")
     CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET")
 
+    # 6️⃣ RECOMMENDER MODEL (TF-IDF files, memory-mapped by every worker)
+    # Defaults to <instance>/recommender when unset
+    RECOMMENDER_MODEL_DIR = os.getenv("RECOMMENDER_MODEL_DIR")
+    # Builds older than this are refitted in the background (vocabulary drift,
+    # new users). RECOMMENDER_AUTO_REFIT=0 leaves refits to a scheduler
+    # running `flask recommend refit` instead.
+    RECOMMENDER_REFIT_HOURS = int(os.getenv("RECOMMENDER_REFIT_HOURS", 24))
+    RECOMMENDER_AUTO_REFIT = os.getenv("RECOMMENDER_AUTO_REFIT", "1") == "1"
+    # Builds with at least this many users get an LSH index (smaller: exact scan)
+    RECOMMENDER_ANN_MIN_USERS = int(os.getenv("RECOMMENDER_ANN_MIN_USERS", 2000))
+
+    # 7️⃣ BACKGROUND JOBS (per worker; keep below the DB pool size)
+    BACKGROUND_JOB_WORKERS = int(os.getenv("BACKGROUND_JOB_WORKERS", 2))
+    BACKGROUND_JOB_MAX_PENDING = int(os.getenv("BACKGROUND_JOB_MAX_PENDING", 1000))
+
+    # 8️⃣ SHARED I/O POOL (parallel queries / uploads inside one request)
+    IO_POOL_WORKERS = int(os.getenv("IO_POOL_WORKERS", 4))
+
+    # 9️⃣ SEARCH RESULT CACHE (per worker, shared by all users)
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 30))
+    SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 1024))
+
+    # 🔟 PROFILE CACHE (per worker, keyed by User.profile_version)
+    PROFILE_CACHE_TTL = int(os.getenv("PROFILE_CACHE_TTL", 600))
+    PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", 4096))
+
+    # 1️⃣1️⃣ LIVE UNREAD COUNTS (/api/notifications/stream)
+    # Seconds one stream may stay open. Keep 0 with gunicorn's default SYNC
+    # workers: every open stream pins a whole worker. Raise it (e.g. 600) only
+    # when serving with threaded / async workers, e.g.
+    #   gunicorn -k gthread --threads 16 run:app   or   gunicorn -k gevent run:app
+    # With 0 the endpoint answers the current counts at once and tells the
+    # client to come back after NOTIFICATION_POLL_SECONDS; polls answer 304
+    # without counting while the user's unread marker is unchanged.
+    # Streams learn about events from other workers by re-reading that marker
+    # (cache_version row) every few seconds: no extra message bus needed.
+    NOTIFICATION_STREAM_SECONDS = int(os.getenv("NOTIFICATION_STREAM_SECONDS", 0))
+    NOTIFICATION_POLL_SECONDS = int(os.getenv("NOTIFICATION_POLL_SECONDS", 30))
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
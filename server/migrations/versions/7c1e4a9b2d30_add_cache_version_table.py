@@ -0,0 +1,28 @@
+"""Add cache_version table
+
+Revision ID: 7c1e4a9b2d30
+Revises: f1b02052688d
+Create Date: 2026-10-19 10:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4a9b2d30'
+down_revision = 'f1b02052688d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cache_version',
+    sa.Column('key', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade():
+    op.drop_table('cache_version')
@@ -0,0 +1,31 @@
+"""Add skill_score and mutual_count to user_recommendation
+
+Revision ID: a3f95c0e6b17
+Revises: 7c1e4a9b2d30
+Create Date: 2026-10-19 11:03:27.915342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f95c0e6b17'
+down_revision = '7c1e4a9b2d30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_recommendation', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('skill_score', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('mutual_count', sa.Integer(), nullable=True))
+
+    # Every existing row came from the TF-IDF job: its score is the skill score
+    op.execute("UPDATE user_recommendation SET skill_score = score, mutual_count = 0")
+
+
+def downgrade():
+    with op.batch_alter_table('user_recommendation', schema=None) as batch_op:
+        batch_op.drop_column('mutual_count')
+        batch_op.drop_column('skill_score')
@@ -0,0 +1,75 @@
+"""Add post / team / help request search indexes (pg_trgm on Postgres, FTS5 on SQLite)
+
+Revision ID: a4e7c9f2d153
+Revises: f5d2a8c1e036
+Create Date: 2026-10-19 19:58:03.640271
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e7c9f2d153'
+down_revision = 'f5d2a8c1e036'
+branch_labels = None
+depends_on = None
+
+# table -> (FTS5 table, searchable columns); same columns federated_search filters on
+SEARCH_TABLES = {
+    'post': ('post_search', ('title', 'description')),
+    'team': ('team_search', ('name', 'hiring_requirements')),
+    'help_request': ('help_search', ('title', 'tags')),
+}
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for table, (_, columns) in SEARCH_TABLES.items():
+            for column in columns:
+                op.execute(
+                    f'CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm '
+                    f'ON {table} USING gin ({column} gin_trgm_ops)'
+                )
+
+    elif dialect == 'sqlite':
+        # Integer primary keys: the FTS rowid is the row id itself
+        for table, (fts, columns) in SEARCH_TABLES.items():
+            names = ', '.join(columns)
+            new_values = ', '.join(f'new.{c}' for c in columns)
+            op.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{names}, tokenize = 'unicode61', prefix = '2 3')"
+            )
+            op.execute(f"INSERT INTO {fts} (rowid, {names}) SELECT id, {names} FROM {table}")
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts} (rowid, {names}) VALUES (new.id, {new_values}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN "
+                f"DELETE FROM {fts} WHERE rowid = old.id; "
+                f"INSERT INTO {fts} (rowid, {names}) VALUES (new.id, {new_values}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"DELETE FROM {fts} WHERE rowid = old.id; END"
+            )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        for table, (_, columns) in SEARCH_TABLES.items():
+            for column in columns:
+                op.execute(f'DROP INDEX IF EXISTS ix_{table}_{column}_trgm')
+
+    elif dialect == 'sqlite':
+        for fts, _ in SEARCH_TABLES.values():
+            for suffix in ('ai', 'au', 'ad'):
+                op.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            op.execute(f'DROP TABLE IF EXISTS {fts}')
@@ -0,0 +1,26 @@
+"""Add user.profile_version for the versioned profile cache
+
+Revision ID: a8d4e1f6c372
+Revises: f3a7c2e9b184
+Create Date: 2026-10-19 15:48:10.527306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d4e1f6c372'
+down_revision = 'f3a7c2e9b184'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('profile_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('profile_version')
@@ -0,0 +1,47 @@
+"""Add help_match (open help request -> matching users) and backfill it
+
+Revision ID: b3c8f0d2e514
+Revises: a8d4e1f6c372
+Create Date: 2026-10-19 16:30:52.804113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3c8f0d2e514'
+down_revision = 'a8d4e1f6c372'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('help_match',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('help_request_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['help_request_id'], ['help_request.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'help_request_id')
+    )
+    op.create_index('ix_help_match_user_rank', 'help_match', ['user_id', 'score', 'created_at'], unique=False)
+    op.create_index('ix_help_match_help_request_id', 'help_match', ['help_request_id'], unique=False)
+
+    # Backfill from the skill / tag links of currently open requests
+    op.execute(
+        'INSERT INTO help_match (user_id, help_request_id, score, created_at) '
+        'SELECT us.user_id, t.help_request_id, COUNT(*), hr.created_at '
+        'FROM user_skill us '
+        'JOIN help_request_tag t ON t.skill_id = us.skill_id '
+        'JOIN help_request hr ON hr.id = t.help_request_id '
+        "WHERE hr.status = 'open' AND hr.user_id <> us.user_id AND hr.created_at IS NOT NULL "
+        'GROUP BY us.user_id, t.help_request_id, hr.created_at'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_help_match_help_request_id', table_name='help_match')
+    op.drop_index('ix_help_match_user_rank', table_name='help_match')
+    op.drop_table('help_match')
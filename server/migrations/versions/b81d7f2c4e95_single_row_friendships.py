@@ -0,0 +1,52 @@
+"""Store each friendship once (user_id < friend_id)
+
+Revision ID: b81d7f2c4e95
+Revises: a3f95c0e6b17
+Create Date: 2026-10-19 11:48:02.337190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b81d7f2c4e95'
+down_revision = 'a3f95c0e6b17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 1. Self-friendships can't satisfy user_id < friend_id
+    op.execute("DELETE FROM friendships WHERE user_id = friend_id")
+
+    # 2. Drop the (high, low) copy of every mirrored pair
+    op.execute("""
+        DELETE FROM friendships
+        WHERE user_id > friend_id
+          AND EXISTS (
+              SELECT 1 FROM friendships f2
+              WHERE f2.user_id = friendships.friend_id
+                AND f2.friend_id = friendships.user_id
+          )
+    """)
+
+    # 3. One-directional leftovers (drifted rows): flip into (low, high) order
+    op.execute("""
+        UPDATE friendships
+        SET user_id = friend_id, friend_id = user_id
+        WHERE user_id > friend_id
+    """)
+
+    with op.batch_alter_table('friendships', schema=None) as batch_op:
+        batch_op.create_check_constraint('ck_friendships_ordered_pair', 'user_id < friend_id')
+        batch_op.create_index('ix_friendships_friend_id', ['friend_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('friendships', schema=None) as batch_op:
+        batch_op.drop_index('ix_friendships_friend_id')
+        batch_op.drop_constraint('ck_friendships_ordered_pair', type_='check')
+
+    # Restore the mirrored (friend_id, user_id) rows
+    op.execute("INSERT INTO friendships (user_id, friend_id) SELECT friend_id, user_id FROM friendships")
@@ -0,0 +1,66 @@
+"""Add team_skill links and backfill them from the team texts
+
+Revision ID: b9e3f1a7c450
+Revises: a4e7c9f2d153
+Create Date: 2026-10-19 20:24:51.093862
+
+"""
+import re
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9e3f1a7c450'
+down_revision = 'a4e7c9f2d153'
+branch_labels = None
+depends_on = None
+
+# Snapshot of app.services.skill_service.mentioned_names() at the time of writing
+_WORD_SPLIT = re.compile(r"[\s,;|()\[\]{}\"'!?]+")
+_EDGE_PUNCTUATION = re.compile(r"^[^\w.#+]+|[^\w#+]+$")
+
+
+def _canonical(raw):
+    text = unicodedata.normalize('NFKC', raw or '').lower()
+    text = ' '.join(text.split())
+    return _EDGE_PUNCTUATION.sub('', text)[:50]
+
+
+def _mentioned(text):
+    words = [_canonical(w) for w in _WORD_SPLIT.split(text or '')[:300]]
+    words = [w for w in words if w]
+    return {' '.join(words[i:i + n]) for n in range(1, 4) for i in range(len(words) - n + 1)}
+
+
+def upgrade():
+    op.create_table('team_skill',
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['team_id'], ['team.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('team_id', 'skill_id')
+    )
+    op.create_index('ix_team_skill_skill_id', 'team_skill', ['skill_id'], unique=False)
+
+    # ---- Backfill: known skills / aliases mentioned in each team ----
+    conn = op.get_bind()
+    vocabulary = dict(conn.execute(sa.text('SELECT name, id FROM skill')).fetchall())
+    vocabulary.update(conn.execute(sa.text('SELECT alias, skill_id FROM skill_alias')).fetchall())
+    teams = conn.execute(sa.text('SELECT id, hiring_requirements, description FROM team')).fetchall()
+
+    rows = {
+        (team_id, vocabulary[name])
+        for team_id, requirements, description in teams
+        for name in _mentioned(f"{requirements or ''}\n{description or ''}")
+        if name in vocabulary
+    }
+    if rows:
+        team_skill = sa.table('team_skill', sa.column('team_id', sa.Integer), sa.column('skill_id', sa.Integer))
+        op.bulk_insert(team_skill, [{'team_id': t, 'skill_id': s} for t, s in rows])
+
+
+def downgrade():
+    op.drop_index('ix_team_skill_skill_id', table_name='team_skill')
+    op.drop_table('team_skill')
@@ -0,0 +1,28 @@
+"""Add composite indexes to friend_request
+
+Revision ID: c4a0e8d1f263
+Revises: b81d7f2c4e95
+Create Date: 2026-10-19 12:20:55.481036
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a0e8d1f263'
+down_revision = 'b81d7f2c4e95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('friend_request', schema=None) as batch_op:
+        batch_op.create_index('ix_friend_request_receiver_status', ['receiver_id', 'status'], unique=False)
+        batch_op.create_index('ix_friend_request_pair_status', ['sender_id', 'receiver_id', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('friend_request', schema=None) as batch_op:
+        batch_op.drop_index('ix_friend_request_pair_status')
+        batch_op.drop_index('ix_friend_request_receiver_status')
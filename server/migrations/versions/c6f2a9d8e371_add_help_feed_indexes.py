@@ -0,0 +1,34 @@
+"""Add composite indexes for the paged help feed and details page
+
+Revision ID: c6f2a9d8e371
+Revises: b3c8f0d2e514
+Create Date: 2026-10-19 17:12:06.215498
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f2a9d8e371'
+down_revision = 'b3c8f0d2e514'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('help_request', schema=None) as batch_op:
+        batch_op.create_index('ix_help_request_status_created', ['status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_help_request_user_status', ['user_id', 'status'], unique=False)
+
+    with op.batch_alter_table('solution', schema=None) as batch_op:
+        batch_op.create_index('ix_solution_request_accepted', ['request_id', 'is_accepted'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('solution', schema=None) as batch_op:
+        batch_op.drop_index('ix_solution_request_accepted')
+
+    with op.batch_alter_table('help_request', schema=None) as batch_op:
+        batch_op.drop_index('ix_help_request_user_status')
+        batch_op.drop_index('ix_help_request_status_created')
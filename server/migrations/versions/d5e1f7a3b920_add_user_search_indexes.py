@@ -0,0 +1,70 @@
+"""Add user search indexes (pg_trgm on Postgres, FTS5 on SQLite)
+
+Revision ID: d5e1f7a3b920
+Revises: c4a0e8d1f263
+Create Date: 2026-10-19 13:05:12.804113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e1f7a3b920'
+down_revision = 'c4a0e8d1f263'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ('full_name', 'email', 'skills', 'username')
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in SEARCH_COLUMNS:
+            op.execute(
+                f'CREATE INDEX IF NOT EXISTS ix_user_{column}_trgm '
+                f'ON "user" USING gin ({column} gin_trgm_ops)'
+            )
+
+    elif dialect == 'sqlite':
+        # Standalone FTS5 table kept in sync by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS user_search USING fts5("
+            "user_id UNINDEXED, full_name, email, skills, username, "
+            "tokenize = 'unicode61', prefix = '2 3')"
+        )
+        op.execute(
+            "INSERT INTO user_search (user_id, full_name, email, skills, username) "
+            "SELECT id, full_name, email, skills, username FROM user"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS user_search_ai AFTER INSERT ON user BEGIN "
+            "INSERT INTO user_search (user_id, full_name, email, skills, username) "
+            "VALUES (new.id, new.full_name, new.email, new.skills, new.username); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS user_search_au AFTER UPDATE ON user BEGIN "
+            "DELETE FROM user_search WHERE user_id = old.id; "
+            "INSERT INTO user_search (user_id, full_name, email, skills, username) "
+            "VALUES (new.id, new.full_name, new.email, new.skills, new.username); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS user_search_ad AFTER DELETE ON user BEGIN "
+            "DELETE FROM user_search WHERE user_id = old.id; END"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        for column in SEARCH_COLUMNS:
+            op.execute(f'DROP INDEX IF EXISTS ix_user_{column}_trgm')
+
+    elif dialect == 'sqlite':
+        for trigger in ('user_search_ai', 'user_search_au', 'user_search_ad'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS user_search')
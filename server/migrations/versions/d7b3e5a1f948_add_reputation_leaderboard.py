@@ -0,0 +1,52 @@
+"""Add reputation_event and index user.reputation_points for the leaderboard
+
+Revision ID: d7b3e5a1f948
+Revises: c6f2a9d8e371
+Create Date: 2026-10-19 18:05:33.640271
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7b3e5a1f948'
+down_revision = 'c6f2a9d8e371'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index('ix_user_reputation_points', ['reputation_points'], unique=False)
+
+    op.create_table('reputation_event',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(length=30), nullable=False),
+        sa.Column('help_request_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['help_request_id'], ['help_request.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_reputation_event_created_at', 'reputation_event', ['created_at'], unique=False)
+    op.create_index('ix_reputation_event_help_request_id', 'reputation_event', ['help_request_id'], unique=False)
+
+    # Backfill: every accepted solution was worth +10 (acceptance time was
+    # never stored, so the solution's own timestamp stands in for it)
+    op.execute(
+        'INSERT INTO reputation_event (user_id, points, reason, help_request_id, created_at) '
+        "SELECT solver_id, 10, 'solution_accepted', request_id, COALESCE(created_at, CURRENT_TIMESTAMP) "
+        'FROM solution WHERE is_accepted = true'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_reputation_event_help_request_id', table_name='reputation_event')
+    op.drop_index('ix_reputation_event_created_at', table_name='reputation_event')
+    op.drop_table('reputation_event')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_reputation_points')
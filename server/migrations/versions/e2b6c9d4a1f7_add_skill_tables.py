@@ -0,0 +1,176 @@
+"""Add normalized skill / tag tables and backfill them
+
+Revision ID: e2b6c9d4a1f7
+Revises: d5e1f7a3b920
+Create Date: 2026-10-19 13:41:27.119502
+
+"""
+import re
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6c9d4a1f7'
+down_revision = 'd5e1f7a3b920'
+branch_labels = None
+depends_on = None
+
+# Snapshot of app.services.skill_service.canonical() at the time of writing
+_SPLIT = re.compile(r"[,;\n|]+")
+_EDGE_PUNCTUATION = re.compile(r"^[^\w.#+]+|[^\w#+]+$")
+
+# alias -> canonical skill
+SEED_ALIASES = {
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'react js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'node js': 'node.js',
+    'expressjs': 'express',
+    'express.js': 'express',
+    'nextjs': 'next.js',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'ai': 'artificial intelligence',
+    'nlp': 'natural language processing',
+    'cpp': 'c++',
+    'csharp': 'c#',
+    'c sharp': 'c#',
+    'dotnet': '.net',
+    'tf': 'tensorflow',
+    'sklearn': 'scikit-learn',
+    'scikit learn': 'scikit-learn',
+    'tailwindcss': 'tailwind',
+    'html5': 'html',
+    'css3': 'css',
+    'ux': 'ui/ux',
+    'ui': 'ui/ux',
+}
+
+
+def _canonical(raw):
+    text = unicodedata.normalize('NFKC', raw or '').lower()
+    text = ' '.join(text.split())
+    return _EDGE_PUNCTUATION.sub('', text)[:50]
+
+
+def _parse(raw):
+    seen, parsed = set(), []
+    for part in _SPLIT.split(raw or ''):
+        name = _canonical(part)
+        if name and name not in seen:
+            seen.add(name)
+            parsed.append((name, ' '.join(part.split())[:50]))
+    return parsed[:30]
+
+
+def upgrade():
+    op.create_table('skill',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('display_name', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_table('skill_alias',
+        sa.Column('alias', sa.String(length=50), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('alias')
+    )
+    op.create_index('ix_skill_alias_skill_id', 'skill_alias', ['skill_id'], unique=False)
+    op.create_table('user_skill',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'skill_id')
+    )
+    op.create_index('ix_user_skill_skill_id', 'user_skill', ['skill_id'], unique=False)
+    op.create_table('help_request_tag',
+        sa.Column('help_request_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['help_request_id'], ['help_request.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('help_request_id', 'skill_id')
+    )
+    op.create_index('ix_help_request_tag_skill_id', 'help_request_tag', ['skill_id'], unique=False)
+
+    # ---- Backfill from the comma-separated strings ----
+    conn = op.get_bind()
+    skill = sa.table('skill', sa.column('id', sa.Integer), sa.column('name', sa.String),
+                     sa.column('display_name', sa.String))
+    skill_alias = sa.table('skill_alias', sa.column('alias', sa.String), sa.column('skill_id', sa.Integer))
+    user_skill = sa.table('user_skill', sa.column('user_id', sa.String), sa.column('skill_id', sa.Integer))
+    help_request_tag = sa.table('help_request_tag', sa.column('help_request_id', sa.Integer),
+                                sa.column('skill_id', sa.Integer))
+
+    users = conn.execute(sa.text('SELECT id, skills FROM "user" WHERE skills IS NOT NULL')).fetchall()
+    requests = conn.execute(sa.text('SELECT id, tags FROM help_request WHERE tags IS NOT NULL')).fetchall()
+
+    parsed_users = [(uid, _parse(raw)) for uid, raw in users]
+    parsed_requests = [(rid, _parse(raw)) for rid, raw in requests]
+
+    # Vocabulary: seed targets + everything in use that isn't an alias
+    display = {}
+    for target in SEED_ALIASES.values():
+        display.setdefault(target, target)
+    for _, items in parsed_users + parsed_requests:
+        for name, shown in items:
+            if name not in SEED_ALIASES:
+                display.setdefault(name, shown)
+
+    if display:
+        op.bulk_insert(skill, [{'name': n, 'display_name': d} for n, d in display.items()])
+    ids = dict(conn.execute(sa.select(skill.c.name, skill.c.id)).fetchall())
+
+    op.bulk_insert(skill_alias, [
+        {'alias': alias, 'skill_id': ids[target]}
+        for alias, target in SEED_ALIASES.items()
+        if target in ids
+    ])
+
+    def resolve(name):
+        return ids.get(SEED_ALIASES.get(name, name))
+
+    user_rows = {
+        (uid, resolve(name))
+        for uid, items in parsed_users for name, _ in items
+        if resolve(name) is not None
+    }
+    if user_rows:
+        op.bulk_insert(user_skill, [{'user_id': u, 'skill_id': s} for u, s in user_rows])
+
+    tag_rows = {
+        (rid, resolve(name))
+        for rid, items in parsed_requests for name, _ in items
+        if resolve(name) is not None
+    }
+    if tag_rows:
+        op.bulk_insert(help_request_tag, [{'help_request_id': r, 'skill_id': s} for r, s in tag_rows])
+
+
+def downgrade():
+    op.drop_index('ix_help_request_tag_skill_id', table_name='help_request_tag')
+    op.drop_table('help_request_tag')
+    op.drop_index('ix_user_skill_skill_id', table_name='user_skill')
+    op.drop_table('user_skill')
+    op.drop_index('ix_skill_alias_skill_id', table_name='skill_alias')
+    op.drop_table('skill_alias')
+    op.drop_table('skill')
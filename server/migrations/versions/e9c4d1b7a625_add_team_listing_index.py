@@ -0,0 +1,26 @@
+"""Add (privacy, id) index for the paged public team listing
+
+Revision ID: e9c4d1b7a625
+Revises: d7b3e5a1f948
+Create Date: 2026-10-19 18:47:19.902755
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9c4d1b7a625'
+down_revision = 'd7b3e5a1f948'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('team', schema=None) as batch_op:
+        batch_op.create_index('ix_team_privacy_id', ['privacy', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('team', schema=None) as batch_op:
+        batch_op.drop_index('ix_team_privacy_id')
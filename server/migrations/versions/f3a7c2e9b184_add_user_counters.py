@@ -0,0 +1,39 @@
+"""Add denormalized friend_count / post_count to user
+
+Revision ID: f3a7c2e9b184
+Revises: e2b6c9d4a1f7
+Create Date: 2026-10-19 15:02:44.381920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7c2e9b184'
+down_revision = 'e2b6c9d4a1f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('friend_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('post_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill (friendships holds one row per pair: count both halves)
+    op.execute(
+        'UPDATE "user" SET friend_count = '
+        '(SELECT COUNT(*) FROM friendships WHERE friendships.user_id = "user".id) + '
+        '(SELECT COUNT(*) FROM friendships WHERE friendships.friend_id = "user".id)'
+    )
+    op.execute(
+        'UPDATE "user" SET post_count = '
+        '(SELECT COUNT(*) FROM post WHERE post.user_id = "user".id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('post_count')
+        batch_op.drop_column('friend_count')
@@ -0,0 +1,46 @@
+"""Only reindex user_search when a searchable column changes
+
+Revision ID: f5d2a8c1e036
+Revises: e9c4d1b7a625
+Create Date: 2026-10-19 19:32:41.517320
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5d2a8c1e036'
+down_revision = 'e9c4d1b7a625'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ('full_name', 'email', 'skills', 'username')
+
+
+def _create_update_trigger(update_of):
+    columns = ', '.join(SEARCH_COLUMNS)
+    new_values = ', '.join(f'new.{c}' for c in SEARCH_COLUMNS)
+    # Rows stay keyed by the UNINDEXED user_id: user.rowid is not stable
+    # (VACUUM may renumber it, the primary key is a string), so the delete
+    # scans user_search. Narrowing the trigger keeps that scan off the hot
+    # path: last_seen / counter / profile_version updates no longer fire it.
+    op.execute(
+        f"CREATE TRIGGER user_search_au AFTER {update_of} ON user BEGIN "
+        "DELETE FROM user_search WHERE user_id = old.id; "
+        f"INSERT INTO user_search (user_id, {columns}) "
+        f"VALUES (new.id, {new_values}); END"
+    )
+
+
+def upgrade():
+    # PostgreSQL keeps its pg_trgm indexes: nothing to do there
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS user_search_au')
+        _create_update_trigger(f"UPDATE OF {', '.join(SEARCH_COLUMNS)}")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS user_search_au')
+        _create_update_trigger('UPDATE')